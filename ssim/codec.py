@@ -0,0 +1,228 @@
+"""Encoding of messages exchanged between federates.
+
+Status messages (:py:class:`ssim.grid.StatusMessage`) and reliability
+events (:py:class:`ssim.reliability.Event`) are encoded as JSON by
+default. A federation can instead use a compact binary encoding by
+setting ``"message_codec": "binary"`` in the grid configuration.
+
+Each binary message starts with a one byte tag identifying the message
+type, followed by the fields of the message in a fixed layout. Names are
+encoded as an index into a table of names shared by all federates (built
+from the grid specification), or inline if they are not in the table.
+Since a JSON message always starts with "{", :py:meth:`MessageCodec.decode`
+accepts messages in either encoding.
+"""
+import json
+import struct
+from typing import Iterable, Union
+
+from ssim.grid import (
+    BusVoltageBatch,
+    BusVoltageStatus,
+    GeneratorStatus,
+    GridSpecification,
+    LoadStatus,
+    LoadStatusBatch,
+    PVStatus,
+    StatusMessage,
+    StorageStatus
+)
+from ssim.reliability import Event, EventType, Mode
+
+_TAG_STORAGE = 1
+_TAG_PV = 2
+_TAG_GENERATOR = 3
+_TAG_LOAD = 4
+_TAG_LOAD_BATCH = 5
+_TAG_BUS_VOLTAGE = 6
+_TAG_EVENT = 7
+_TAG_BUS_VOLTAGE_BATCH = 8
+
+_TAG = struct.Struct("<B")
+_NAME_INDEX = struct.Struct("<H")
+_COUNT = struct.Struct("<I")
+_EVENT = struct.Struct("<BB")
+_TIME = struct.Struct("<d")
+
+#: Tag and layout of the fields following the name for status messages
+#: that have a name and a fixed number of values.
+_LAYOUTS = {
+    StorageStatus: (_TAG_STORAGE, struct.Struct("<d"), ("soc",)),
+    PVStatus: (_TAG_PV, struct.Struct("<dd"), ("kw", "kvar")),
+    GeneratorStatus: (_TAG_GENERATOR, struct.Struct("<ddd?"),
+                      ("kw", "kvar", "operating_time", "online")),
+    LoadStatus: (_TAG_LOAD, struct.Struct("<dd"), ("kw", "kvar")),
+    BusVoltageStatus: (_TAG_BUS_VOLTAGE, struct.Struct("<dd"),
+                       ("voltage", "time")),
+}
+
+_TYPES = {tag: message_type
+          for message_type, (tag, _, _) in _LAYOUTS.items()}
+
+#: Name index indicating the name follows inline.
+_INLINE_NAME = 0xFFFF
+
+_EVENT_TYPES = list(EventType)
+_MODES = list(Mode)
+
+_JSON_START = ord("{")
+
+
+class MessageCodec:
+    """Encode and decode federate messages.
+
+    Parameters
+    ----------
+    names : Iterable[str], optional
+        Names that are encoded as an index into a table rather than as
+        strings by the binary codec. Every federate in a federation must
+        use the same names.
+    binary : bool, default False
+        If True messages are encoded in the binary format, otherwise they
+        are encoded as JSON.
+    """
+
+    def __init__(self, names: Iterable[str] = (), binary: bool = False):
+        self.names = sorted(set(names))[:_INLINE_NAME]
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self.binary = binary
+
+    @classmethod
+    def from_grid_spec(cls, grid_spec: GridSpecification) -> "MessageCodec":
+        """Return the codec selected in `grid_spec`.
+
+        The name table is built from the names of the storage devices, PV
+        systems, and busses in the grid specification.
+        """
+        names = set()
+        for device in grid_spec.storage_devices + grid_spec.pv_systems:
+            names.add(device.name)
+            names.add(device.bus)
+        names.update(bus["name"] for bus in grid_spec.busses_to_measure)
+        return cls(names, binary=grid_spec.message_codec == "binary")
+
+    def encode(self, message: Union[StatusMessage, Event]
+               ) -> Union[str, bytes]:
+        """Encode `message`.
+
+        Parameters
+        ----------
+        message : StatusMessage or Event
+            The message to encode.
+
+        Returns
+        -------
+        str or bytes
+            The JSON string, or the binary encoding of the message.
+        """
+        if not self.binary:
+            return message.to_json()
+        parts = []
+        layout = _LAYOUTS.get(type(message))
+        if layout is not None:
+            tag, values, fields = layout
+            parts.append(_TAG.pack(tag))
+            self._pack_name(parts, message.name)
+            parts.append(values.pack(
+                *(getattr(message, field) for field in fields)
+            ))
+        elif isinstance(message, Event):
+            parts.append(_TAG.pack(_TAG_EVENT))
+            parts.append(_EVENT.pack(_EVENT_TYPES.index(message.type),
+                                     _MODES.index(message.mode)))
+            self._pack_name(parts, message.element)
+            data = json.dumps(message.data).encode() if message.data else b""
+            parts.append(_COUNT.pack(len(data)))
+            parts.append(data)
+        elif isinstance(message, BusVoltageBatch):
+            count = len(message.voltage)
+            parts.append(_TAG.pack(_TAG_BUS_VOLTAGE_BATCH))
+            parts.append(_COUNT.pack(count))
+            parts.append(_TIME.pack(message.time))
+            parts.append(struct.pack(f"<{count}d", *message.voltage))
+        elif isinstance(message, LoadStatusBatch):
+            count = len(message.names)
+            parts.append(_TAG.pack(_TAG_LOAD_BATCH))
+            parts.append(_COUNT.pack(count))
+            for name in message.names:
+                self._pack_name(parts, name)
+            parts.append(struct.pack(f"<{count}d", *message.kw))
+            parts.append(struct.pack(f"<{count}d", *message.kvar))
+        else:
+            raise TypeError(
+                f"Cannot encode message of type {type(message).__name__}"
+            )
+        return b"".join(parts)
+
+    def decode(self, data: Union[str, bytes]) -> Union[StatusMessage, Event]:
+        """Decode a message encoded as JSON or in the binary format.
+
+        Parameters
+        ----------
+        data : str or bytes
+            The encoded message.
+
+        Returns
+        -------
+        StatusMessage or Event
+            The decoded message.
+        """
+        if isinstance(data, str) or data[0] == _JSON_START:
+            message = json.loads(data)
+            if "message_type" in message:
+                return StatusMessage.from_dict(message)
+            return Event.from_dict(message)
+        tag = data[0]
+        offset = _TAG.size
+        if tag == _TAG_EVENT:
+            event_type, mode = _EVENT.unpack_from(data, offset)
+            element, offset = self._unpack_name(data, offset + _EVENT.size)
+            (size,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            event_data = {}
+            if size > 0:
+                event_data = json.loads(data[offset:offset + size])
+            return Event(_EVENT_TYPES[event_type], _MODES[mode], element,
+                         event_data)
+        if tag == _TAG_LOAD_BATCH:
+            (count,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            names = []
+            for _ in range(count):
+                name, offset = self._unpack_name(data, offset)
+                names.append(name)
+            values = struct.unpack_from(f"<{2 * count}d", data, offset)
+            return LoadStatusBatch(names, list(values[:count]),
+                                   list(values[count:]))
+        if tag == _TAG_BUS_VOLTAGE_BATCH:
+            (count,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            (time,) = _TIME.unpack_from(data, offset)
+            voltage = struct.unpack_from(f"<{count}d", data,
+                                         offset + _TIME.size)
+            return BusVoltageBatch(list(voltage), time)
+        if tag not in _TYPES:
+            raise ValueError(f"Unknown message tag: {tag}")
+        message_type = _TYPES[tag]
+        _, values, _ = _LAYOUTS[message_type]
+        name, offset = self._unpack_name(data, offset)
+        return message_type(name, *values.unpack_from(data, offset))
+
+    def _pack_name(self, parts, name):
+        index = self._index.get(name)
+        if index is not None:
+            parts.append(_NAME_INDEX.pack(index))
+        else:
+            encoded = name.encode()
+            parts.append(_NAME_INDEX.pack(_INLINE_NAME))
+            parts.append(_COUNT.pack(len(encoded)))
+            parts.append(encoded)
+
+    def _unpack_name(self, data, offset):
+        (index,) = _NAME_INDEX.unpack_from(data, offset)
+        offset += _NAME_INDEX.size
+        if index != _INLINE_NAME:
+            return self.names[index], offset
+        (size,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        return bytes(data[offset:offset + size]).decode(), offset + size
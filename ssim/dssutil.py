@@ -1,8 +1,9 @@
 """Utilities for working with OpenDSSDirect."""
+import contextlib
 import warnings
 from collections import namedtuple
 from collections.abc import Iterable
-from typing import Optional
+from typing import List, Optional
 import hashlib
 import os
 from os import path
@@ -58,6 +59,85 @@ def make_opendss_params(params: dict):
     )
 
 
+#: Commands deferred by the active :py:func:`batch`, or None if there is no
+#: active batch.
+_batch: Optional[List[str]] = None
+
+
+@contextlib.contextmanager
+def batch():
+    """Defer all commands run with :py:func:`run_command` in this context.
+
+    The deferred commands are executed in a single call to OpenDSS when
+    the context exits. Commands must not depend on results from earlier
+    commands in the batch, since :py:func:`run_command` returns an empty
+    string immediately for each deferred command. Nested batches are
+    executed when the outermost batch exits.
+
+    Raises
+    ------
+    OpenDSSError
+        If any of the deferred commands fails. The error message names
+        the element that was being created or edited by the failing
+        command. Commands after the failing command are not executed.
+
+    Examples
+    --------
+    >>> with batch():
+    ...     run_command("New Storage.s1", {"bus1": "b1", "phases": 3})
+    ...     run_command("New Storage.s2", {"bus1": "b2", "phases": 3})
+    """
+    global _batch
+    if _batch is not None:
+        yield
+        return
+    _batch = []
+    try:
+        yield
+        commands = _batch
+    finally:
+        _batch = None
+    _run_commands(commands)
+
+
+def _command_target(command: str) -> str:
+    """Return the name of the element `command` acts on.
+
+    For commands that create a new element (for example "New Storage.s1
+    ...") this is the name of the element, otherwise it is the command
+    itself.
+    """
+    tokens = command.split(maxsplit=2)
+    if len(tokens) > 1 and tokens[0].lower() == "new":
+        return tokens[1]
+    return command
+
+
+def _run_commands(commands: List[str]):
+    """Run all `commands` with a single call to OpenDSS."""
+    if len(commands) == 0:
+        return
+    if not hasattr(dssdirect.Text, "Commands"):
+        # Older versions of OpenDSSDirect.py can only run one command at
+        # a time.
+        for command in commands:
+            try:
+                _check_result(dssdirect.run_command(command), False)
+            except OpenDSSError as e:
+                raise OpenDSSError(
+                    f"{_command_target(command)}: {e}") from e
+        return
+    try:
+        dssdirect.Text.Commands(commands)
+    except dssdirect.DSSException as e:
+        message = str(e)
+        for command in commands:
+            if command.strip() in message:
+                raise OpenDSSError(
+                    f"{_command_target(command)}: {message}") from e
+        raise OpenDSSError(message) from e
+
+
 def run_command(command: str,
                 extra_args: Optional[dict] = None,
                 warn: bool = False) -> str:
@@ -65,7 +145,8 @@ def run_command(command: str,
 
     Wrapper around the :py:func:`opendssdirect.run_command`
     function that provides error checking and transforms errors into
-    exceptions (or warnings).
+    exceptions (or warnings). If a :py:func:`batch` is active the command
+    is deferred until the batch exits and an empty string is returned.
 
     Parameters
     ----------
@@ -80,6 +161,9 @@ def run_command(command: str,
     """
     if extra_args is not None:
         command = f"{command} {make_opendss_params(extra_args)}"
+    if _batch is not None:
+        _batch.append(command)
+        return ""
     return _check_result(dssdirect.run_command(command), warn)
 
 
@@ -372,10 +456,12 @@ def fingerprint(model_path):
     model_path : str or pathlike
         Directory containing the opendss model files.
     """
-    # Get a list of the cannonical file names and read them in
+    # Get a list of the cannonical file names and read them in. The files
+    # are sorted so that the fingerprint does not depend on the order
+    # of the directory listing.
     h = hashlib.sha256()
     datafiles = set()
-    for dssfile in os.listdir(model_path):
+    for dssfile in sorted(os.listdir(model_path), key=str.lower):
         _, ext = path.splitext(dssfile)
         if ext.lower() != ".dss":
             continue
@@ -384,7 +470,7 @@ def fingerprint(model_path):
         with open(dssfile, 'rb') as f:
             h.update(f.read())
     # find the datafiles referenced by each file and hash the contents
-    for datafile in datafiles:
+    for datafile in sorted(datafiles):
         with open(path.join(model_path, datafile), 'rb') as f:
             h.update(f.read())
     # return the final complete hash.
@@ -20,13 +20,11 @@ manager classes to handle the data streams.
 import abc
 import json
 
-import opendssdirect as dssdirect
-
 import networkx as nx
 
 from ssim.grid import GridSpecification
-from ssim.opendss import DSSModel
-from ssim import dssutil, reliability
+from ssim.modelcache import ModelCache
+from ssim import reliability
 
 
 class GridModel:
@@ -38,22 +36,39 @@ class GridModel:
     names and edges or nodes in the grid as well as indexes to look up
     the node to which grid components are connected.
 
-    The network is initialized by loading the grid specification into
-    an OpenDSS model and iterating the power delivery and power conversion
-    elements in the OpenDSS model.
+    The network is initialized from the inventory of the power delivery and
+    power conversion elements in the OpenDSS model (see
+    :py:class:`~ssim.modelcache.ModelCache`), plus the storage devices and
+    PV systems in the grid specification.
+
+    The connected components of the network are tracked incrementally. Each
+    bus is mapped to the id of its component, and the map is only updated
+    when an edge is added or removed, so looking up the component of an
+    element does not require a search of the network.
 
     Parameters
     ----------
     gridspec : GridSpecification
         Specification of the grid and connected devices.
+    model_cache : ModelCache, optional
+        Cache to read the model inventory from. If not specified the
+        default cache is used.
     """
 
-    def __init__(self, gridspec):
-        self._model = DSSModel.from_grid_spec(gridspec)
+    def __init__(self, gridspec, model_cache=None):
+        if model_cache is None:
+            model_cache = ModelCache()
+        self._inventory = model_cache.inventory(gridspec.file)
         self._gridspec = gridspec
         self._network = nx.Graph()
         self._devices = {}
         self._edges = {}
+        # map from bus to component id, and from component id to the set of
+        # busses in the component
+        self._component_id = {}
+        self._components = {}
+        self._next_component_id = 0
+        self._topology_version = 0
         self._initialize_network()
 
     @classmethod
@@ -75,11 +90,14 @@ class GridModel:
         return cls(spec)
 
     def _initialize_devices_and_loads(self):
-        for element in dssdirect.Circuit.AllElementNames():
-            dssdirect.Circuit.SetActiveElement(element)
-            node = dssdirect.CktElement.BusNames()[0]
+        elements = dict(self._inventory.elements)
+        for storage in self._gridspec.storage_devices:
+            elements[f"storage.{storage.name.lower()}"] = storage.bus.lower()
+        for pvsystem in self._gridspec.pv_systems:
+            elements[f"pvsystem.{pvsystem.name.lower()}"] = \
+                pvsystem.bus.lower()
+        for element, node in elements.items():
             bus = _node_to_bus(node)
-            element = element.lower()
             element_type, name = element.split(".", maxsplit=1)
             element_set = self._network.nodes[bus].get(element_type, None)
             if element_set is not None:
@@ -89,20 +107,14 @@ class GridModel:
     def _initialize_network(self):
         self._edges = {
             f"line.{name}": tuple(map(_node_to_bus, nodes))
-            for name, nodes in dssutil.iterate_properties(
-                dssdirect.Lines, ("Bus1", "Bus2")
-            )
+            for name, nodes in self._inventory.lines.items()
         }
         # TODO Identify switches and do NOT add an edge if the switch is open
+        self._edges.update(
+            (f"transformer.{name}", tuple(map(_node_to_bus, nodes)))
+            for name, nodes in self._inventory.transformers.items()
+        )
         self._network.add_edges_from(self._edges.values())
-        transformer_number = dssdirect.Transformers.First()
-        while transformer_number > 0:
-            name = dssdirect.Transformers.Name()
-            bus1, bus2 = map(_node_to_bus, dssdirect.CktElement.BusNames())
-            # add the edge, removing node names
-            self._network.add_edge(bus1, bus2)
-            self._edges[f"transformer.{name}"] = (bus1, bus2)
-            transformer_number = dssdirect.Transformers.Next()
         # initialize the sets of connected devices at each node
         for node in self._network.nodes.values():
             node["storage"] = set()
@@ -111,6 +123,72 @@ class GridModel:
             node["failed_devices"] = set()
             node["load"] = set()
         self._initialize_devices_and_loads()
+        for component in nx.connected_components(self._network):
+            self._add_component(component)
+
+    def _add_component(self, busses):
+        component_id = self._next_component_id
+        self._next_component_id += 1
+        busses = frozenset(busses)
+        self._components[component_id] = busses
+        for bus in busses:
+            self._component_id[bus] = component_id
+        return component_id
+
+    def _merge_components(self, bus1, bus2):
+        """Merge the components containing `bus1` and `bus2`."""
+        id1 = self._component_id[bus1]
+        id2 = self._component_id[bus2]
+        if id1 == id2:
+            return
+        # relabel the smaller component
+        if len(self._components[id1]) < len(self._components[id2]):
+            id1, id2 = id2, id1
+        smaller = self._components.pop(id2)
+        for bus in smaller:
+            self._component_id[bus] = id1
+        self._components[id1] = self._components[id1] | smaller
+
+    def _split_component(self, bus1, bus2):
+        """Split the component containing `bus1` and `bus2` if removing the
+        edge between them disconnected it.
+
+        The network is searched from both busses at the same time, one node
+        at a time, until either search reaches a bus found by the other (the
+        component is still connected) or one search is exhausted (it has
+        found every bus in one of the new components). The cost is
+        proportional to the size of the smaller new component.
+        """
+        if bus1 == bus2:
+            return
+        searches = [({bus1}, [bus1]), ({bus2}, [bus2])]
+        while True:
+            for index, (seen, stack) in enumerate(searches):
+                if len(stack) == 0:
+                    self._separate(seen)
+                    return
+                other, _ = searches[1 - index]
+                for neighbor in self._network.adj[stack.pop()]:
+                    if neighbor in other:
+                        return
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        stack.append(neighbor)
+
+    def _separate(self, busses):
+        """Move `busses` out of their component into a new component."""
+        old_id = self._component_id[next(iter(busses))]
+        self._components[old_id] = self._components[old_id] - busses
+        self._add_component(busses)
+
+    @property
+    def topology_version(self):
+        """Number of times the connectivity of the network has changed.
+
+        Can be used to detect that the connected components have not
+        changed since they were last read.
+        """
+        return self._topology_version
 
     def node(self, element):
         """Return the name of the node that `element` is associated with.
@@ -132,18 +210,35 @@ class GridModel:
     @property
     def num_components(self):
         """Return the number of distinct connected components."""
-        return nx.number_connected_components(self._network)
+        return len(self._components)
 
     def components(self):
         """Return an iterator over the connected components.
 
         Return
         ------
-        Iterable of set
+        Iterable of frozenset
             Each component is represented by a set of busses that are
             connected to that component.
         """
-        return nx.connected_components(self._network)
+        return iter(list(self._components.values()))
+
+    def component_id(self, element):
+        """Return the id of the connected component that contains `element`.
+
+        Ids identify a component until the next change in the topology of
+        the network.
+
+        Parameters
+        ----------
+        element : str
+            Name of the element.
+
+        Returns
+        -------
+        int
+        """
+        return self._component_id[self.node(element)]
 
     def component_from_element(self, element):
         """Return the connected component that contains element.
@@ -155,13 +250,10 @@ class GridModel:
 
         Returns
         -------
-        set
+        frozenset
             Set of nodes in the component tha includes `element`
         """
-        return nx.node_connected_component(
-            self._network,
-            self.node(element)
-        )
+        return self._components[self.component_id(element)]
 
     def _connected_elements(self, component, element_type):
         for node_name in component:
@@ -246,11 +338,18 @@ class GridModel:
 
     def connect(self, bus1, bus2):
         """Connect `bus1` to `bus2`."""
+        for bus in (bus1, bus2):
+            if bus not in self._component_id:
+                self._add_component({bus})
         self._network.add_edge(bus1, bus2)
+        self._merge_components(bus1, bus2)
+        self._topology_version += 1
 
     def disconnect(self, bus1, bus2):
         """Remove the direct connection between `bus1` and `bus2`"""
         self._network.remove_edge(bus1, bus2)
+        self._split_component(bus1, bus2)
+        self._topology_version += 1
 
     def is_edge(self, name):
         """Return true if `name` is the name of an edge in the network.
@@ -7,7 +7,8 @@ from helics import (
 )
 
 from ssim import reliability
-from ssim.grid import GridSpecification, StatusMessage
+from ssim.codec import MessageCodec
+from ssim.grid import GridSpecification
 from ssim.ems import GridModel, EMS
 from ssim.heuristicems import CompositeHeuristicEMS
 from ssim.federates import timing
@@ -28,13 +29,18 @@ class EMSFederate:
         self._ems = EMS(grid,
                         dispatcher=CompositeHeuristicEMS(grid))
         self.federate = federate
+        self._codec = MessageCodec.from_grid_spec(grid_spec)
         self.control_endpoint = federate.get_endpoint_by_name("control")
         self.reliability_endpoint = federate.get_endpoint_by_name(
             "reliability"
         )
+        self._replay = None
+        if grid_spec.reliability_events is not None:
+            self._replay = reliability.EventTimeline.load(
+                grid_spec.reliability_events
+            )
 
-    @staticmethod
-    def _parse_control_message(message):
+    def _parse_control_message(self, message):
         """Parse a message received on the control endpoint.
 
         Accepts the following messages:
@@ -64,7 +70,7 @@ class EMSFederate:
             The parsed status message.
 
         """
-        return StatusMessage.from_json(message.data)
+        return self._codec.decode(message.raw_data)
 
     def pending_control_messages(self):
         """Iterator over messages received on the control endpoint."""
@@ -76,11 +82,15 @@ class EMSFederate:
     def pending_reliability_messages(self):
         """Iterator over messages received on the reliability endpoint."""
         while self.reliability_endpoint.has_message():
-            yield reliability.Event.from_json(
-                self.reliability_endpoint.get_message().data
+            yield self._codec.decode(
+                self.reliability_endpoint.get_message().raw_data
             )
 
-    def _update_reliability(self):
+    def _update_reliability(self, time):
+        if self._replay is not None:
+            self._ems.grid.apply_reliability_events(
+                self._replay.events(time)
+            )
         self._ems.grid.apply_reliability_events(
             self.pending_reliability_messages()
         )
@@ -106,7 +116,7 @@ class EMSFederate:
         time : float
             Time to advance to in seconds.
         """
-        self._update_reliability()
+        self._update_reliability(time)
         self._ems.update(time, self.pending_control_messages(), None)
         self._send_control_messages()
 
@@ -136,6 +146,24 @@ def _create_ems(grid_spec):
                      " Valid EMS types are: 'composite-heuristic'.")
 
 
+def run_federate(federate, grid_spec, hours):
+    """Run an EMS federate as `federate`.
+
+    Parameters
+    ----------
+    federate : HelicsMessageFederate
+        HELICS federate handle.
+    grid_spec : GridSpecification
+        Specification of the grid managed by the EMS.
+    hours : float
+        How many hours to run for.
+    """
+    ems_federate = EMSFederate(federate, grid_spec)
+    federate.enter_executing_mode()
+    ems_federate.run(hours)
+    federate.disconnect()
+
+
 def run():
     """Run the EMS federate."""
     parser = argparse.ArgumentParser()
@@ -161,11 +189,8 @@ def run():
         f"created federate with endpoints: {federate.endpoints}",
         HelicsLogLevel.TRACE
     )
-    ems_federate = EMSFederate(federate,
-                               GridSpecification.from_json(args.grid_config))
-    federate.enter_executing_mode()
-    ems_federate.run(args.hours)
-    federate.disconnect()
+    run_federate(federate, GridSpecification.from_json(args.grid_config),
+                 args.hours)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,590 @@
+"""In-process federation for single-machine runs.
+
+A :py:class:`LocalFederation` hosts federates as threads in the current
+process and passes values and messages between them in memory, replacing
+the HELICS broker and the separate federate processes. Each
+:py:class:`LocalFederate` implements the subset of the HELICS federate
+API used by the federates in :py:mod:`ssim.federates`, so the same
+federate classes run unchanged on either HELICS or a local federation.
+
+Only one federate runs at a time. The federation repeatedly finds the
+smallest time that can be granted to any federate waiting in
+:py:meth:`LocalFederate.request_time` and grants it to every federate
+that can advance to that time, in the order the federates were added.
+Time requests follow the HELICS rules:
+
+- A federate is granted the time it requested, or the time of the
+  earliest value or message it has not yet received if that is sooner,
+  unless the federate is uninterruptible.
+- Successive grants are separated by at least the federate's time delta.
+
+Values and messages become visible to a federate when it is granted a
+time greater than or equal to the time they were sent, so a federate
+never sees data sent by another federate that was granted the same time.
+"""
+import functools
+import itertools
+import json
+import logging
+import threading
+from os import PathLike
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from ssim.grid import GridSpecification
+
+#: Largest time that can be granted (equal to
+#: ``helics.helics_time_maxtime``).
+MAX_TIME = 9223372036.854774
+
+#: Smallest time between grants if a federate does not set a time delta.
+_DEFAULT_TIME_DELTA = 1e-9
+
+
+class FederationError(Exception):
+    """Raised when a federate in a local federation fails."""
+
+
+class _Aborted(Exception):
+    """Raised inside federate threads to stop a federation early."""
+
+
+class LocalMessage:
+    """A message sent between endpoints of a local federation."""
+
+    def __init__(self, data: Union[str, bytes] = b"",
+                 source: str = "", destination: str = "",
+                 time: float = 0.0):
+        self.raw_data = data
+        self.source = source
+        self.original_source = source
+        self.destination = destination
+        self.time = time
+
+    @property
+    def raw_data(self) -> bytes:
+        """Message payload."""
+        return self._data
+
+    @raw_data.setter
+    def raw_data(self, data: Union[str, bytes]):
+        if isinstance(data, str):
+            data = data.encode()
+        self._data = data
+
+    @property
+    def data(self) -> str:
+        """Message payload decoded as a string."""
+        return self._data.decode()
+
+    @data.setter
+    def data(self, data: Union[str, bytes]):
+        self.raw_data = data
+
+
+class LocalEndpoint:
+    """Endpoint of a :py:class:`LocalFederate`.
+
+    Parameters
+    ----------
+    federate : LocalFederate
+        Federate that owns the endpoint.
+    name : str
+        Full name of the endpoint.
+    """
+
+    def __init__(self, federate: "LocalFederate", name: str):
+        self.name = name
+        self._federate = federate
+        self._messages: List[LocalMessage] = []
+
+    def has_message(self) -> bool:
+        """Return True if a message has been received."""
+        return len(self._messages) > 0
+
+    def get_message(self) -> LocalMessage:
+        """Return the next received message."""
+        return self._messages.pop(0)
+
+    def create_message(self) -> LocalMessage:
+        """Return a new empty message."""
+        return LocalMessage(source=self.name)
+
+    def send_data(self, data: Union[str, bytes, LocalMessage],
+                  destination: Optional[str] = None):
+        """Send a message.
+
+        Parameters
+        ----------
+        data : str, bytes, or LocalMessage
+            Payload of the message, or the complete message.
+        destination : str, optional
+            Name of the destination endpoint. Required unless `data` is a
+            message with its destination set.
+        """
+        if isinstance(data, LocalMessage):
+            message = data
+            if destination is not None:
+                message.destination = destination
+        else:
+            message = LocalMessage(data, self.name, destination)
+        message.time = max(message.time, self._federate.current_time)
+        self._federate._federation._send_message(message)
+
+    def _deliver(self, message: LocalMessage):
+        self._messages.append(message)
+
+
+class LocalPublication:
+    """Publication of a :py:class:`LocalFederate`."""
+
+    def __init__(self, federate: "LocalFederate", key: str,
+                 kind: Optional[str] = None, units: str = ""):
+        self.key = key
+        self.type = kind
+        self.units = units
+        self._federate = federate
+
+    def publish(self, value: Any):
+        """Publish `value` to all subscribers."""
+        self._federate._federation._publish(
+            self.key, self._federate.current_time, value
+        )
+
+
+class LocalSubscription:
+    """Subscription of a :py:class:`LocalFederate`."""
+
+    def __init__(self, federate: "LocalFederate", key: str,
+                 units: str = "", default: Any = 0.0):
+        self.key = key
+        self.units = units
+        self._federate = federate
+        self._value = default
+        self._received = False
+        self._updated = False
+        self._last_update_time = 0.0
+
+    def set_default(self, value: Any):
+        """Set the value returned before any value is received."""
+        if not self._received:
+            self._value = value
+
+    def is_updated(self) -> bool:
+        """Return True if a value was received since the last read."""
+        return self._updated
+
+    def get_last_update_time(self) -> float:
+        """Return the time the last value was received."""
+        return self._last_update_time
+
+    def _read(self):
+        self._updated = False
+        return self._value
+
+    @property
+    def value(self) -> Any:
+        return self._read()
+
+    @property
+    def double(self) -> float:
+        value = self._read()
+        if isinstance(value, complex):
+            return value.real if value.imag == 0 else abs(value)
+        return float(value)
+
+    @property
+    def complex(self) -> complex:
+        return complex(self._read())
+
+    def _deliver(self, time: float, value: Any):
+        self._value = value
+        self._received = True
+        self._updated = True
+        self._last_update_time = time
+
+
+class LocalFederate:
+    """A federate in a :py:class:`LocalFederation`.
+
+    Federates are created with :py:meth:`LocalFederation.create_federate`.
+
+    Parameters
+    ----------
+    federation : LocalFederation
+        The federation the federate belongs to.
+    config : dict
+        HELICS federate configuration. The name, time delta,
+        uninterruptible flag, endpoints, publications, and subscriptions
+        are used. All other fields are ignored.
+    """
+
+    def __init__(self, federation: "LocalFederation", config: dict):
+        self.name = config["name"]
+        self.time_delta = config.get(
+            "time_delta", config.get("timeDelta", _DEFAULT_TIME_DELTA)
+        )
+        self.uninterruptible = config.get("uninterruptible", False)
+        self.current_time = 0.0
+        self.endpoints: Dict[str, LocalEndpoint] = {}
+        self.publications: Dict[str, LocalPublication] = {}
+        self.subscriptions: Dict[str, LocalSubscription] = {}
+        self._federation = federation
+        self._logger = logging.getLogger(f"{__name__}.{self.name}")
+        self._state = "starting"
+        self._requested_time = 0.0
+        # pending values and messages: (time, sequence, target, payload)
+        self._pending = []
+        for endpoint in config.get("endpoints", []):
+            if endpoint.get("global", False):
+                self.register_global_endpoint(endpoint["name"])
+            else:
+                self.register_endpoint(endpoint["name"])
+        for publication in config.get("publications", []):
+            register = (self.register_global_publication
+                        if publication.get("global", False)
+                        else self.register_publication)
+            register(publication["key"], publication.get("type"),
+                     publication.get("units", publication.get("unit", "")))
+        for subscription in config.get("subscriptions", []):
+            self.register_subscription(
+                subscription["key"],
+                subscription.get("units", subscription.get("unit", ""))
+            ).set_default(subscription.get("default", 0.0))
+
+    def register_endpoint(self, name: str) -> LocalEndpoint:
+        """Register an endpoint named "<federate-name>/`name`"."""
+        return self.register_global_endpoint(f"{self.name}/{name}")
+
+    def register_global_endpoint(self, name: str) -> LocalEndpoint:
+        """Register an endpoint named `name`."""
+        endpoint = LocalEndpoint(self, name)
+        self._federation._add_endpoint(endpoint)
+        self.endpoints[name] = endpoint
+        return endpoint
+
+    def get_endpoint_by_name(self, name: str) -> LocalEndpoint:
+        """Return the endpoint with full or local name `name`."""
+        if name in self.endpoints:
+            return self.endpoints[name]
+        return self.endpoints[f"{self.name}/{name}"]
+
+    def register_publication(self, key: str, kind: Optional[str] = None,
+                             units: str = "") -> LocalPublication:
+        """Register a publication with key "<federate-name>/`key`"."""
+        return self.register_global_publication(
+            f"{self.name}/{key}", kind, units
+        )
+
+    def register_global_publication(self, key: str,
+                                    kind: Optional[str] = None,
+                                    units: str = "") -> LocalPublication:
+        """Register a publication with key `key`."""
+        publication = LocalPublication(self, key, kind, units)
+        self.publications[key] = publication
+        return publication
+
+    def register_subscription(self, key: str,
+                              units: str = "") -> LocalSubscription:
+        """Subscribe to the publication with key `key`."""
+        subscription = LocalSubscription(self, key, units)
+        self._federation._add_subscription(subscription)
+        self.subscriptions[key] = subscription
+        return subscription
+
+    def log_message(self, message: str, level=None):
+        """Log `message` at debug level."""
+        self._logger.debug(message)
+
+    def enter_executing_mode(self):
+        """Wait until all federates have entered executing mode."""
+        self._federation._wait(self, "entering")
+
+    def request_time(self, time: float) -> float:
+        """Request `time` and return the time that is granted."""
+        self._requested_time = time
+        self._federation._wait(self, "requesting")
+        return self.current_time
+
+    def disconnect(self):
+        """Leave the federation."""
+        self._state = "done"
+
+    def _enqueue(self, time, target, payload):
+        self._pending.append(
+            (time, next(self._federation._sequence), target, payload)
+        )
+
+    def _next_grant(self) -> float:
+        """Return the time that can be granted to the federate."""
+        time = self._requested_time
+        if not self.uninterruptible and len(self._pending) > 0:
+            time = min(time, min(p[0] for p in self._pending))
+        time = max(time, self.current_time + self.time_delta)
+        return min(time, self._federation.max_time)
+
+    def _grant(self, time: float):
+        """Advance to `time` and receive all values and messages sent up
+        to `time`."""
+        self.current_time = time
+        ready = sorted(p for p in self._pending if p[0] <= time)
+        self._pending = [p for p in self._pending if p[0] > time]
+        for sent, _, target, payload in ready:
+            if isinstance(target, LocalSubscription):
+                target._deliver(sent, payload)
+            else:
+                target._deliver(payload)
+
+
+class LocalFederation:
+    """Run federates in a single process.
+
+    Parameters
+    ----------
+    max_time : float, default MAX_TIME
+        Largest time that will be granted. [seconds]
+    """
+
+    def __init__(self, max_time: float = MAX_TIME):
+        self.max_time = max_time
+        self._federates: List[LocalFederate] = []
+        self._mains: Dict[str, Callable[[], Any]] = {}
+        self._endpoints: Dict[str, LocalEndpoint] = {}
+        self._subscriptions: Dict[str, List[LocalSubscription]] = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._active: Optional[LocalFederate] = None
+        self._aborted = False
+        self._error: Optional[BaseException] = None
+
+    def create_federate(self,
+                        config: Union[dict, str, PathLike]
+                        ) -> LocalFederate:
+        """Create a federate.
+
+        Parameters
+        ----------
+        config : dict, str, or PathLike
+            HELICS federate configuration, as a dict, a JSON string, or
+            the path to a JSON file.
+
+        Returns
+        -------
+        LocalFederate
+            The new federate.
+        """
+        if not isinstance(config, dict):
+            if isinstance(config, str) and config.lstrip().startswith("{"):
+                config = json.loads(config)
+            else:
+                with open(config) as f:
+                    config = json.load(f)
+        federate = LocalFederate(self, config)
+        self._federates.append(federate)
+        return federate
+
+    def add(self, federate: LocalFederate, main: Callable[[], Any]):
+        """Set the function that runs `federate`.
+
+        `main` is called in its own thread when the federation runs. It is
+        expected to enter executing mode, request times until it is done,
+        and disconnect, just as the entry point of a HELICS federate does.
+        """
+        self._mains[federate.name] = main
+
+    def _add_endpoint(self, endpoint: LocalEndpoint):
+        if endpoint.name in self._endpoints:
+            raise ValueError(f"Duplicate endpoint '{endpoint.name}'")
+        self._endpoints[endpoint.name] = endpoint
+
+    def _add_subscription(self, subscription: LocalSubscription):
+        self._subscriptions.setdefault(subscription.key, []).append(
+            subscription
+        )
+
+    def _send_message(self, message: LocalMessage):
+        endpoint = self._endpoints.get(message.destination)
+        if endpoint is None:
+            # HELICS drops messages to unknown endpoints.
+            logging.debug("dropping message from %s to unknown endpoint %s",
+                          message.source, message.destination)
+            return
+        endpoint._federate._enqueue(message.time, endpoint, message)
+
+    def _publish(self, key: str, time: float, value: Any):
+        for subscription in self._subscriptions.get(key, []):
+            subscription._federate._enqueue(time, subscription, value)
+
+    def _wait(self, federate: LocalFederate, state: str):
+        """Block `federate` until the federation resumes it."""
+        with self._condition:
+            federate._state = state
+            self._active = None
+            self._condition.notify_all()
+            self._condition.wait_for(
+                lambda: self._active is federate or self._aborted
+            )
+            if self._aborted:
+                raise _Aborted()
+            federate._state = "running"
+
+    def _resume(self, federate: LocalFederate):
+        """Run `federate` until it blocks or finishes."""
+        with self._condition:
+            self._active = federate
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self._active is None)
+        if self._error is not None:
+            raise FederationError(
+                f"federate '{federate.name}' failed"
+            ) from self._error
+
+    def _thread_main(self, federate: LocalFederate):
+        try:
+            self._wait(federate, "created")
+            self._mains[federate.name]()
+        except _Aborted:
+            pass
+        except BaseException as e:  # noqa: B902 - reported by run()
+            self._error = e
+        finally:
+            with self._condition:
+                federate._state = "done"
+                if self._active is federate:
+                    self._active = None
+                self._condition.notify_all()
+
+    def _waiting(self, state):
+        return [federate for federate in self._federates
+                if federate._state == state]
+
+    def run(self):
+        """Run all federates until they are done.
+
+        Raises
+        ------
+        FederationError
+            If any federate raises an exception. All other federates are
+            stopped.
+        """
+        threads = [
+            threading.Thread(target=self._thread_main, args=(federate,),
+                             name=f"federate-{federate.name}", daemon=True)
+            for federate in self._federates
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            # Wait for every thread to be ready before running any of them.
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: all(federate._state != "starting"
+                                for federate in self._federates)
+                )
+            for federate in self._waiting("created"):
+                self._resume(federate)
+            for federate in self._waiting("entering"):
+                self._resume(federate)
+            while True:
+                waiting = self._waiting("requesting")
+                if len(waiting) == 0:
+                    break
+                grants = [federate._next_grant() for federate in waiting]
+                time = min(grants)
+                granted = [federate for federate, grant in zip(waiting, grants)
+                           if grant == time]
+                for federate in granted:
+                    federate._grant(time)
+                for federate in granted:
+                    self._resume(federate)
+        finally:
+            with self._condition:
+                self._aborted = True
+                self._condition.notify_all()
+            for thread in threads:
+                thread.join()
+
+
+def _federate_config(federate: str) -> Path:
+    """Return the path to the configuration file for the federate type."""
+    return Path(__file__).with_name(f"{federate}.json")
+
+
+def run_local(grid_config: PathLike, hours: float,
+              workdir: Optional[PathLike] = None, ems: bool = False):
+    """Simulate the grid in `grid_config` with a local federation.
+
+    Runs the same federates as a HELICS federation built by
+    :py:meth:`ssim.ui.Configuration.evaluate`: metrics, logger, grid,
+    reliability, and one controller for each storage device. The
+    reliability federate is not run if the grid configuration names a file
+    of precomputed reliability events.
+
+    Parameters
+    ----------
+    grid_config : PathLike
+        Path to the JSON grid configuration file.
+    hours : float
+        How many hours to simulate.
+    workdir : PathLike, optional
+        Directory where output files are written. Defaults to the current
+        directory.
+    ems : bool, default False
+        If True the EMS federate is also run.
+
+    Raises
+    ------
+    FederationError
+        If any federate fails.
+    """
+    # The federates require HELICS, even though the federation does not.
+    from helics import helics_time_maxtime
+    from ssim.federates import (
+        ems as ems_federate, logger, metrics, opendss, reliability, storage
+    )
+    grid_config = str(Path(grid_config).absolute())
+    # Output paths are passed to each federate rather than changing the
+    # working directory, which is shared by every thread in the process.
+    workdir = Path(workdir or ".").absolute()
+    spec = GridSpecification.from_json(grid_config)
+    federation = LocalFederation(max_time=helics_time_maxtime)
+    # Federates run in the order they are added until they enter
+    # executing mode. The grid federate is added last because the
+    # other federates may compile the grid model in OpenDSS (which is
+    # shared by all federates in the process) while they are initialized.
+    if spec.reliability_events is None:
+        federate = federation.create_federate(
+            _federate_config("reliability")
+        )
+        federation.add(federate, functools.partial(
+            reliability.run_federate, federate, grid_config, hours
+        ))
+    if ems:
+        federate = federation.create_federate(_federate_config("ems"))
+        federation.add(federate, functools.partial(
+            ems_federate.run_federate, federate, spec, hours
+        ))
+    for device in spec.storage_devices:
+        federate = federation.create_federate(
+            storage._complete_config(device.name,
+                                     _federate_config("storage"))
+        )
+        federation.add(federate, functools.partial(
+            storage.run_federate, federate, grid_config, hours
+        ))
+    federate = federation.create_federate(_federate_config("metrics"))
+    federation.add(federate, functools.partial(
+        metrics.run_federate, federate, grid_config, hours, workdir
+    ))
+    federate = federation.create_federate(_federate_config("logger"))
+    federation.add(federate, functools.partial(
+        logger.run_federate, federate,
+        set(device.name for device in spec.storage_devices), hours, False,
+        workdir
+    ))
+    federate = federation.create_federate(_federate_config("grid"))
+    federation.add(federate, functools.partial(
+        opendss.run_federate, federate, grid_config, hours,
+        output_dir=workdir
+    ))
+    federation.run()
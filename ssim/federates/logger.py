@@ -3,8 +3,9 @@ import argparse
 import csv
 import json
 import logging
+from os import PathLike
 from pathlib import Path
-from typing import Set, List
+from typing import List, Optional, Set
 
 from helics import (
     HelicsFederate,
@@ -16,6 +17,7 @@ from helics import (
 import matplotlib.pyplot as plt
 
 from ssim.federates import timing
+from ssim.sink import ArraySink
 
 
 class HelicsLogger(ABC):
@@ -127,37 +129,40 @@ class PowerLogger(HelicsLogger):
         Directory where output files will be written.
     """
     def __init__(self, output_dir=None):
-        self.time = []
-        self.active_power = []
-        self.reactive_power = []
         self._total_power = None
         self._output_dir = output_dir or Path(".")
+        # columns are time, kW, and kVAR
+        self._power = ArraySink(3, path=self._output_dir / "total_power.sink")
+
+    @property
+    def time(self):
+        return self._power.to_array()[:, 0]
+
+    @property
+    def active_power(self):
+        return self._power.to_array()[:, 1]
+
+    @property
+    def reactive_power(self):
+        return self._power.to_array()[:, 2]
 
     def initialize(self, federate: HelicsValueFederate):
         self._total_power = federate.register_subscription(
             "grid/total_power",
             units="kW"
         )
-        self.time = []
-        self.active_power = []
-        self.reactive_power = []
 
     def log(self, time: float):
-        self.time.append(time)
-        self.active_power.append(
-            self._total_power.complex.real
-        )
-        self.reactive_power.append(
-            self._total_power.complex.imag
-        )
+        power = self._total_power.complex
+        self._power.append((time, power.real, power.imag))
 
     def finalize(self):
         with open(self._output_dir / "total_power.csv", 'w', newline='') as f:
             writer = csv.writer(f)
             writer.writerow(("time", "kW", "kVAR"))
-            writer.writerows(
-                zip(self.time, self.active_power, self.reactive_power)
-            )
+            for chunk in self._power.chunks():
+                writer.writerows(chunk.tolist())
+        self._power.close()
 
 
 class VoltageLogger(HelicsLogger):
@@ -169,11 +174,26 @@ class VoltageLogger(HelicsLogger):
         Set of busses to monitor.
     """
     def __init__(self, busses: Set[str], output_dir=None, name="storage"):
-        self.time = []
-        self.bus_voltage = {bus: [] for bus in busses}
+        self._busses = tuple(busses)
         self._voltage_subs = {}
         self._output_dir = output_dir or Path('.')
         self._name = name
+        # column 0 is the time, the remaining columns are the voltage at
+        # each bus in `self._busses`
+        self._voltage = ArraySink(
+            len(self._busses) + 1,
+            path=self._output_dir / f"{name}_voltage.sink"
+        )
+
+    @property
+    def time(self):
+        return self._voltage.to_array()[:, 0]
+
+    @property
+    def bus_voltage(self):
+        voltage = self._voltage.to_array()
+        return {bus: voltage[:, column + 1]
+                for column, bus in enumerate(self._busses)}
 
     def initialize(self, federate: HelicsValueFederate):
         self._voltage_subs = {
@@ -181,25 +201,23 @@ class VoltageLogger(HelicsLogger):
                 f"grid/storage.{bus}.voltage",
                 units="pu"
             )
-            for bus in self.bus_voltage
+            for bus in self._busses
         }
 
     def log(self, time: float):
         """Record the voltages at `time`."""
-        self.time.append(time)
-        for bus in self.bus_voltage:
-            self.bus_voltage[bus].append(
-                self._voltage_subs[bus].double
-            )
+        self._voltage.append(
+            (time, *(self._voltage_subs[bus].double for bus in self._busses))
+        )
 
     def finalize(self):
         output_file = self._output_dir / f"{self._name}_voltage.csv"
         with open(output_file, 'w', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(("time", *self.bus_voltage.keys()))
-            writer.writerows(
-                zip(self.time, *self.bus_voltage.values())
-            )
+            writer.writerow(("time", *self._busses))
+            for chunk in self._voltage.chunks():
+                writer.writerows(chunk.tolist())
+        self._voltage.close()
 
 
 class StorageLogger(HelicsLogger):
@@ -216,14 +234,43 @@ class StorageLogger(HelicsLogger):
     """
     def __init__(self, device_names, output_dir=None):
         self.device_names = device_names
+        self._devices = tuple(device_names)
         self._soc_subs = None
         self._power_subs = None
-        self.time = []
-        self.power_out = {device: [] for device in device_names}
-        self.power_in = {device: [] for device in device_names}
-        self.reactive_power = {device: [] for device in device_names}
-        self.soc = {device: [] for device in device_names}
         self._output_dir = output_dir or Path('.')
+        # column 0 is the time, followed by the discharging power,
+        # charging power, reactive power, and state of charge of each
+        # device in `self._devices`
+        self._state = ArraySink(
+            4 * len(self._devices) + 1,
+            path=self._output_dir / "storage_power.sink"
+        )
+
+    def _column(self, offset):
+        state = self._state.to_array()
+        start = 1 + offset * len(self._devices)
+        return {device: state[:, start + index]
+                for index, device in enumerate(self._devices)}
+
+    @property
+    def time(self):
+        return self._state.to_array()[:, 0]
+
+    @property
+    def power_out(self):
+        return self._column(0)
+
+    @property
+    def power_in(self):
+        return self._column(1)
+
+    @property
+    def reactive_power(self):
+        return self._column(2)
+
+    @property
+    def soc(self):
+        return self._column(3)
 
     def initialize(self, federate: HelicsValueFederate):
         self._soc_subs = {
@@ -240,26 +287,25 @@ class StorageLogger(HelicsLogger):
             for device in self.device_names
         }
 
-    def _log_soc(self):
-        for device, soc in self.soc.items():
-            soc.append(self._soc_subs[device].double)
+    def _soc(self):
+        return [self._soc_subs[device].double for device in self._devices]
 
-    def _log_power(self):
-        for device in self.device_names:
-            reactive_power = self._power_subs[device].complex.imag
+    def _power(self):
+        power_in = []
+        power_out = []
+        reactive_power = []
+        for device in self._devices:
+            reactive_power.append(self._power_subs[device].complex.imag)
             active_power = self._power_subs[device].complex.real
-            self.power_in[device].append(
-                0 if active_power >= 0 else abs(active_power)
-            )
-            self.power_out[device].append(
-                0 if active_power <= 0 else active_power
-            )
-            self.reactive_power[device].append(reactive_power)
+            power_in.append(0 if active_power >= 0 else abs(active_power))
+            power_out.append(0 if active_power <= 0 else active_power)
+        return power_out, power_in, reactive_power
 
     def log(self, time):
-        self.time.append(time)
-        self._log_soc()
-        self._log_power()
+        power_out, power_in, reactive_power = self._power()
+        self._state.append(
+            (time, *power_out, *power_in, *reactive_power, *self._soc())
+        )
 
     def finalize(self):
         output_file = self._output_dir / "storage_power.csv"
@@ -267,19 +313,15 @@ class StorageLogger(HelicsLogger):
             writer = csv.writer(f)
             columns = (
                 "time",
-                *(f"{device}_discharge_kw" for device in self.power_out),
-                *(f"{device}_charge_kw" for device in self.power_in),
-                *(f"{device}_kvar" for device in self.reactive_power),
-                *(f"{device}_soc" for device in self.soc)
+                *(f"{device}_discharge_kw" for device in self._devices),
+                *(f"{device}_charge_kw" for device in self._devices),
+                *(f"{device}_kvar" for device in self._devices),
+                *(f"{device}_soc" for device in self._devices)
             )
             writer.writerow(columns)
-            writer.writerows(
-                zip(self.time,
-                    *self.power_out.values(),
-                    *self.power_in.values(),
-                    *self.reactive_power.values(),
-                    *self.soc.values())
-            )
+            for chunk in self._state.chunks():
+                writer.writerows(chunk.tolist())
+        self._state.close()
 
 
 def to_hours(seconds: List[float]) -> List[float]:
@@ -300,7 +342,8 @@ def to_hours(seconds: List[float]) -> List[float]:
 def run_federate(federate,
                  storage_devices: Set[str],
                  hours: float,
-                 show_plots: bool):
+                 show_plots: bool,
+                 output_dir: Optional[PathLike] = None):
     """Run a logging federate as `federate`.
 
     Parameters
@@ -313,12 +356,16 @@ def run_federate(federate,
         Number of hours to run before exiting.
     show_plots : bool
         If true figures are displayed for each logger before exiting.
+    output_dir : PathLike, optional
+        Directory where output files are written. Defaults to the current
+        directory.
     """
     logging.debug("federate: %s", federate)
     logging.debug("storage: %s", storage_devices)
-    power_logger = PowerLogger()
-    voltage_logger = VoltageLogger(storage_devices)
-    storage_logger = StorageLogger(storage_devices)
+    output_dir = Path(output_dir or ".")
+    power_logger = PowerLogger(output_dir)
+    voltage_logger = VoltageLogger(storage_devices, output_dir)
+    storage_logger = StorageLogger(storage_devices, output_dir)
     logging_federate = LoggingFederate(federate)
     logging_federate.add_logger("power", power_logger)
     logging_federate.add_logger("voltage", voltage_logger)
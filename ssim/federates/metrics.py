@@ -1,9 +1,13 @@
 import argparse
 import logging
 import csv
+from pathlib import Path
+
+import numpy as np
 
 from ssim.metrics import (
     Metric,
+    MetricBank,
     MetricManager,
     MetricTimeAccumulator
 )
@@ -14,12 +18,12 @@ from helics import (
     helicsCreateMessageFederateFromConfig
 )
 
+from ssim.codec import MessageCodec
 from ssim.federates import timing
 
 from ssim.grid import (
-    BusVoltageStatus,
-    GridSpecification,
-    StatusMessage
+    BusVoltageBatch,
+    GridSpecification
 )
 
 from ssim.metrics import ImprovementType
@@ -33,14 +37,21 @@ class MetricsFederate:
     ----------
     federate : HelicsMessageFederate
         HELICS federate.
+    grid_config : PathLike
+        Path to the JSON grid configuration file.
+    output_dir : PathLike, optional
+        Directory where "metric_log.csv" is written. Defaults to the current
+        directory.
     """
-    def __init__(self, federate, grid_config):
+    def __init__(self, federate, grid_config, output_dir=None):
         self._federate = federate
         self._metricMgr = MetricManager()
         self.endpoint = federate.get_endpoint_by_name("metrics")
         g_spec = GridSpecification.from_json(grid_config)
+        self._codec = MessageCodec.from_grid_spec(g_spec)
         
-        self.csv_file = open("metric_log.csv", 'w', newline='')
+        output_dir = Path(output_dir or ".")
+        self.csv_file = open(output_dir / "metric_log.csv", 'w', newline='')
         self.csv_writer = csv.writer(self.csv_file)
         self.csv_fields = ["time"]
 
@@ -59,13 +70,34 @@ class MetricsFederate:
             self.csv_fields.append(bv_dict["name"])
 
         self.csv_writer.writerow(self.csv_fields)
+        # Column of each bus in the csv file.
+        self._columns = {}
+        for index, name in enumerate(self.csv_fields[1:], start=1):
+            self._columns.setdefault(name, index)
+        # All metrics are normalized and accumulated together by a
+        # MetricBank. The position in the bank and column in the csv file
+        # of each voltage in a BusVoltageBatch message are precomputed.
+        names = list(self._metricMgr.all_metrics)
+        self._bank = MetricBank(
+            accumulator.metric
+            for accumulator in self._metricMgr.all_metrics.values()
+        )
+        self._bank_index = {name: index for index, name in enumerate(names)}
+        self._batch_indices = np.array(
+            [self._bank_index[name] for name in g_spec.measured_busses],
+            dtype=int
+        )
+        self._batch_columns = np.array(
+            [self._columns[name] for name in g_spec.measured_busses],
+            dtype=int
+        )
 
     def initialize(self):
         self._federate.enter_executing_mode()
 
     def finalize(self):
         """Finalize all loggers."""
-        self.csv_writer.writerow([str(self._metricMgr.get_total_accumulation)])
+        self.csv_writer.writerow([str(self._bank.total_accumulation)])
         self.csv_file.close()
         self._federate.disconnect()
 
@@ -89,17 +121,31 @@ class MetricsFederate:
         self._metricMgr.add_accumulator(name, accumulator)
 
     def _update_metrics(self, time):
-        values = [0.0] * len(self.csv_fields)
+        values = np.zeros(len(self.csv_fields))
         values[0] = time
         while self.endpoint.has_message():
             message = self.endpoint.get_message()
-            bv_msg: BusVoltageStatus = StatusMessage.from_json(message.data)  # noqa
-            curr_metric: MetricTimeAccumulator = self._metricMgr.get_accumulator(bv_msg.name)
-            met_val = curr_metric.accumulate(bv_msg.voltage, bv_msg.time)
-            index = self.csv_fields.index(bv_msg.name)
-            values[index] = met_val
+            bv_msg = self._codec.decode(message.raw_data)
+            if isinstance(bv_msg, BusVoltageBatch):
+                self._accumulate_batch(bv_msg, values)
+                continue
+            met_val = self._bank.accumulate(
+                [bv_msg.voltage], bv_msg.time,
+                indices=[self._bank_index[bv_msg.name]]
+            )
+            values[self._columns[bv_msg.name]] = met_val[0]
+
+        self.csv_writer.writerow(values.tolist())
 
-        self.csv_writer.writerow(values)
+    def _accumulate_batch(self, batch: BusVoltageBatch, values):
+        """Accumulate the voltage at every measured bus from `batch`.
+
+        The normalized value for each bus is stored in its column of
+        `values`.
+        """
+        values[self._batch_columns] = self._bank.accumulate(
+            batch.voltage, batch.time, indices=self._batch_indices
+        )
 
     def run(self, hours):
         """Run for `hours` and invoke loggers whenever HELICS grants a time.
@@ -118,7 +164,7 @@ class MetricsFederate:
             self._update_metrics(time)
 
 
-def run_federate(federate, grid_config, hours):
+def run_federate(federate, grid_config, hours, output_dir=None):
     """Run a metrics federate as `federate`.
 
     Parameters
@@ -126,9 +172,14 @@ def run_federate(federate, grid_config, hours):
     federate : HelicsFederate
         HELICS federate handle.
     grid_config:
+    hours : float
+        How many hours to run.
+    output_dir : PathLike, optional
+        Directory where output files are written. Defaults to the current
+        directory.
     """
     logging.debug("federate: %s", federate)
-    metrics_federate = MetricsFederate(federate, grid_config)
+    metrics_federate = MetricsFederate(federate, grid_config, output_dir)
     metrics_federate.initialize()
     metrics_federate.run(hours)
     metrics_federate.finalize()
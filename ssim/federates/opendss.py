@@ -1,7 +1,9 @@
 """Federate for OpenDSS grid simulation."""
 import argparse
 import csv
+from os import PathLike
 from pathlib import Path
+from typing import Optional
 
 from helics import (
     HelicsCombinationFederate, helics_time_maxtime,
@@ -10,8 +12,13 @@ from helics import (
 )
 
 from ssim import reliability
-from ssim.grid import GridSpecification, PVStatus, BusVoltageStatus
+from ssim.codec import MessageCodec
+from ssim.grid import (
+    GridSpecification, PVStatus, BusVoltageBatch, LoadStatusBatch
+)
 from ssim.opendss import DSSModel
+from ssim.profiling import NullProfiler, StepProfiler, timed_grants
+from ssim.sink import RowSink
 from ssim.ems import GeneratorControlMessage
 from ssim.federates import timing
 
@@ -27,19 +34,22 @@ class ReliabilityInterface:
     ----------
     federate : HelicsCombinationFederate
         Federate handle. Must have an endpoint named "reliability".
+    codec : MessageCodec, optional
+        Codec used to decode messages.
     """
-    def __init__(self, federate):
+    def __init__(self, federate, codec=None):
         self.endpoint = federate.get_endpoint_by_name(
             "reliability"
         )
         self._federate = federate
+        self._codec = codec or MessageCodec()
 
     @property
     def events(self):
         """An iterator over all pending reliability events."""
         while self.endpoint.has_message():
             message = self.endpoint.get_message()
-            yield reliability.Event.from_json(message.data)
+            yield self._codec.decode(message.raw_data)
 
 
 class GeneratorInterface:
@@ -49,11 +59,14 @@ class GeneratorInterface:
     ----------
     federate : HelicsCombinationFederate
     generator : opendss.Generator
+    codec : MessageCodec, optional
+        Codec used to encode status messages.
     """
 
-    def __init__(self, federate, generator):
+    def __init__(self, federate, generator, codec=None):
         self._federate = federate
         self.generator = generator
+        self._codec = codec or MessageCodec()
         self.control_endpoint = federate.register_global_endpoint(
             f"generator.{generator.name.lower()}.control"
         )
@@ -73,14 +86,22 @@ class GeneratorInterface:
                 self.generator.change_setpoint(
                     gen_control.kw, gen_control.kvar)
 
-    def publish(self):
-        status_json = self.generator.status.to_json()
+    def publish(self, reliability=True):
+        """Send the generator status to the EMS.
+
+        Parameters
+        ----------
+        reliability : bool, default True
+            If True the status is also sent to the reliability federate.
+        """
+        status = self._codec.encode(self.generator.status)
         self.control_endpoint.send_data(
-            status_json, destination="ems/control"
-        )
-        self.reliability_endpoint.send_data(
-            status_json, destination="reliability/reliability"
+            status, destination="ems/control"
         )
+        if reliability:
+            self.reliability_endpoint.send_data(
+                status, destination="reliability/reliability"
+            )
 
 
 class StorageInterface:
@@ -150,10 +171,13 @@ class PVInterface:
         HELICS federate handle.
     pvsystem : PVSystem
         PVSystem instance providing access to the opendss model.
+    codec : MessageCodec, optional
+        Codec used to encode status messages.
     """
-    def __init__(self, federate, pvsystem):
+    def __init__(self, federate, pvsystem, codec=None):
         self._federate = federate
         self._system = pvsystem
+        self._codec = codec or MessageCodec()
         self._control_endpoint = federate.register_global_endpoint(
             f"pvsystem.{pvsystem.name}.control"
         )
@@ -178,14 +202,24 @@ class PVInterface:
             self._system.kvar
         )
         self._control_endpoint.send_data(
-            status.to_json(), "ems/control"
+            self._codec.encode(status), "ems/control"
         )
 
 
 class EventLog:
-    """A record of all events that have occured."""
-    def __init__(self):
-        self._events = []
+    """A record of all events that have occured.
+
+    Parameters
+    ----------
+    spill_dir : PathLike, optional
+        Directory where events are stored during the simulation. If not
+        specified a temporary file is used.
+    """
+    def __init__(self, spill_dir=None):
+        spill_file = None
+        if spill_dir is not None:
+            spill_file = Path(spill_dir) / "event_log.sink"
+        self._events = RowSink(spill_file)
 
     def add_event(self, time, event):
         """Add an event to the event log.
@@ -215,7 +249,11 @@ class EventLog:
         with open(output_dir / "event_log.csv", 'w', newline='') as f:
             writer = csv.writer(f)
             writer.writerow(("time", "type", "element", "connection"))
-            writer.writerows(self._events)
+            writer.writerows(self._events.rows())
+
+    def close(self):
+        """Discard the recorded events."""
+        self._events.close()
 
 
 class LoadInterface:
@@ -225,9 +263,14 @@ class LoadInterface:
     ----------
     federate : HelicsFederate
         HELICS federate handle.
+    model : DSSModel
+        The grid model.
+    codec : MessageCodec, optional
+        Codec used to encode status messages.
     """
-    def __init__(self, federate, model):
+    def __init__(self, federate, model, codec=None):
         self._federate = federate
+        self._codec = codec or MessageCodec()
         self._control_endpoint = federate.register_global_endpoint(
             "load.control"
         )
@@ -243,17 +286,23 @@ class LoadInterface:
 
     def _send_to_ems(self, status):
         self._control_endpoint.send_data(
-            status.to_json(), "ems/control"
+            self._codec.encode(status), "ems/control"
         )
 
     def publish(self):
-        """Send status updates to the EMS federate control endpoint"""
-        pass
-        # TODO the performance of both _send_to_ems() and Load.status is
-        #      too poor to use. Since we aren't using the EMS right now
-        #      we don't actually need to send these messages
-        # for load in self._model.loads():
-        #     self._send_to_ems(load.status)
+        """Send status updates to the EMS federate control endpoint
+
+        The status of all loads is sent in a single
+        :py:class:`~ssim.grid.LoadStatusBatch` message.
+        """
+        snapshot = self._model.load_snapshot()
+        self._send_to_ems(
+            LoadStatusBatch(
+                list(snapshot.names),
+                snapshot.kw.tolist(),
+                snapshot.kvar.tolist()
+            )
+        )
 
 
 class GridFederate:
@@ -267,49 +316,84 @@ class GridFederate:
         `grid_file`.
     grid_file : str
         Path to the JSON grid configuration file.
+    profile : bool, default False
+        If True, record the time spent in each phase of every time step.
+        The timing table is saved to "step_timing.csv" and a summary is
+        printed when the federate is finalized.
+    output_dir : PathLike, optional
+        Directory where output files are written. Defaults to the current
+        directory.
     """
-    def __init__(self, federate: HelicsCombinationFederate, grid_file: str):
-        helicsFederateLogDebugMessage(
-            federate, f"initializing DSSModel with {grid_file}"
+    #: Phases of a time step recorded when profiling is enabled.
+    STEP_PHASES = ("reliability", "storage", "solve", "record",
+                   "bus_voltages", "publish")
+
+    def __init__(self, federate: HelicsCombinationFederate, grid_file: str,
+                 profile: bool = False,
+                 output_dir: Optional[PathLike] = None):
+        federate.log_message(
+            f"initializing DSSModel with {grid_file}", HelicsLogLevel.DEBUG
         )
-        helicsFederateLogDebugMessage(
-            federate, f"publications: {federate.publications.keys()}"
+        federate.log_message(
+            f"publications: {federate.publications.keys()}",
+            HelicsLogLevel.DEBUG
         )
         g_spec = GridSpecification.from_json(grid_file)
-        self._grid_model = DSSModel.from_grid_spec(g_spec)
-        self.busses_to_measure = set(bus["name"] for bus in g_spec.busses_to_measure)
+        self._output_dir = Path(output_dir or ".")
+        # Recorded data is written to the output directory during the
+        # simulation so that it is not lost if the federate fails.
+        self._grid_model = DSSModel.from_grid_spec(
+            g_spec, spill_dir=self._output_dir
+        )
+        self.busses_to_measure = g_spec.measured_busses
+        self._codec = MessageCodec.from_grid_spec(g_spec)
 
         self._federate = federate
         self._storage_interface = [
             StorageInterface(federate, device)
             for device in self._grid_model.storage_devices.values()
         ]
-        self._event_log = EventLog()
+        self._event_log = EventLog(spill_dir=self._output_dir)
         self._pv_interface = [
-            PVInterface(federate, device)
+            PVInterface(federate, device, self._codec)
             for device in self._grid_model.pvsystems.values()
         ]
-        self._reliability = ReliabilityInterface(federate)
-        self._load_interface = LoadInterface(federate, self._grid_model)
+        self._reliability = ReliabilityInterface(federate, self._codec)
+        self._replay = None
+        if g_spec.reliability_events is not None:
+            self._replay = reliability.EventTimeline.load(
+                g_spec.reliability_events
+            )
+        self._load_interface = LoadInterface(federate, self._grid_model,
+                                             self._codec)
         self._generator_interface = [
-            GeneratorInterface(federate, generator)
+            GeneratorInterface(federate, generator, self._codec)
             for generator in self._grid_model.generators.values()
         ]
         self.metrics_endpoint = federate.get_endpoint_by_name(
             "metrics"
         )
+        if profile:
+            self._profiler = StepProfiler(
+                self.STEP_PHASES,
+                counters=("iterations", "control_iterations"),
+                spill_path=self._output_dir / "step_timing.sink"
+            )
+        else:
+            self._profiler = NullProfiler()
 
     def _update_storage(self):
         for storage in self._storage_interface:
             storage.update()
 
     def _update_bus_voltages(self, time: float):
-        for bus_name in self.busses_to_measure:
-            voltage = self._grid_model.mean_node_voltage(bus_name)
-            message = BusVoltageStatus(bus_name, voltage, time)
-            self.metrics_endpoint.send_data(
-                message.to_json(), destination="metrics"
-            )
+        if len(self.busses_to_measure) == 0:
+            return
+        voltage = self._grid_model.mean_bus_voltages(self.busses_to_measure)
+        message = BusVoltageBatch(voltage.tolist(), time)
+        self.metrics_endpoint.send_data(
+            self._codec.encode(message), destination="metrics"
+        )
 
     def _publish(self):
         for storage in self._storage_interface:
@@ -317,8 +401,10 @@ class GridFederate:
                 storage.device.bus
             )
             storage.publish(voltage)
+        # there is no reliability federate to send generator status to when
+        # reliability events are replayed from a file
         for generator in self._generator_interface:
-            generator.publish()
+            generator.publish(reliability=self._replay is None)
         for pvsystem in self._pv_interface:
             pvsystem.publish()
         self._load_interface.publish()
@@ -359,11 +445,22 @@ class GridFederate:
         else:
             self._apply_repair(event)
 
+    def _reliability_events(self, time):
+        if self._replay is not None:
+            yield from self._replay.events(time)
+        yield from self._reliability.events
+
     def _update_reliability(self, time):
-        for event in self._reliability.events:
+        for event in self._reliability_events(time):
             self._event_log.add_event(time, event)
             self._apply_reliability_event(event)
 
+    def _next_update(self):
+        next_update = self._grid_model.next_update()
+        if self._replay is not None:
+            return min(next_update, self._replay.peek())
+        return next_update
+
     def step(self, time: float):
         """Step the opendss model to `time`.
 
@@ -374,27 +471,78 @@ class GridFederate:
         """
         self._federate.log_message(
             f"granted time: {time}", HelicsLogLevel.INTERFACES)
-        self._update_reliability(time)
-        self._update_storage()
-        self._grid_model.solve(time)
-        self._grid_model.record_state()
-        self._update_bus_voltages(time)
-        self._publish()
+        profiler = self._profiler
+        profiler.begin_step(time)
+        with profiler.phase("reliability"):
+            self._update_reliability(time)
+        with profiler.phase("storage"):
+            self._update_storage()
+        with profiler.phase("solve"):
+            self._grid_model.solve(time)
+        if profiler.enabled:
+            iterations, control_iterations = \
+                self._grid_model.solver_iterations
+            profiler.count("iterations", iterations)
+            profiler.count("control_iterations", control_iterations)
+        with profiler.phase("record"):
+            self._grid_model.record_state()
+        with profiler.phase("bus_voltages"):
+            self._update_bus_voltages(time)
+        with profiler.phase("publish"):
+            self._publish()
+        profiler.end_step()
 
     def run(self, hours: float):
         """Run the simulation for `hours`."""
         schedule = timing.schedule(
             self._federate,
-            self._grid_model.next_update,
+            self._next_update,
             hours * 3600
         )
-        for current_time in schedule:
+        for current_time in timed_grants(schedule, self._profiler):
             self.step(current_time)
 
     def finalize(self):
         """Clean up the grid state and save output files."""
-        self._grid_model.save_record()
-        self._event_log.to_csv()
+        self._grid_model.save_record(self._output_dir)
+        self._event_log.to_csv(self._output_dir)
+        self._grid_model.close_record()
+        self._event_log.close()
+        if self._profiler.enabled:
+            self._profiler.to_csv(self._output_dir / "step_timing.csv")
+            self._federate.log_message(
+                f"step timing:\n{self._profiler.summary()}",
+                HelicsLogLevel.SUMMARY
+            )
+            self._profiler.close()
+
+
+def run_federate(federate, grid_config: str, hours: float,
+                 profile: bool = False,
+                 output_dir: Optional[PathLike] = None):
+    """Run a grid federate as `federate`.
+
+    Parameters
+    ----------
+    federate : HelicsCombinationFederate
+        HELICS federate handle.
+    grid_config : str
+        Path to the JSON grid configuration file.
+    hours : float
+        How many hours to run the simulation.
+    profile : bool, default False
+        Record the time spent in each phase of every time step.
+    output_dir : PathLike, optional
+        Directory where output files are written. Defaults to the current
+        directory.
+    """
+    grid_federate = GridFederate(federate, grid_config, profile=profile,
+                                 output_dir=output_dir)
+    federate.log_message("Model initialized", HelicsLogLevel.DEBUG)
+    federate.enter_executing_mode()
+    grid_federate.run(hours)
+    grid_federate.finalize()
+    federate.disconnect()
 
 
 def run():
@@ -416,6 +564,11 @@ def run():
         default=helics_time_maxtime,
         help="how many hours the simulation will run"
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="record the time spent in each phase of every time step"
+    )
     args = parser.parse_args()
     federate = helicsCreateCombinationFederateFromConfig(args.federate_config)
     helicsFederateLogDebugMessage(
@@ -424,9 +577,4 @@ def run():
         federate, f"Federate created: subscriptions: {federate.subscriptions}")
     helicsFederateLogDebugMessage(
         federate, f"Federate created: endpoints: {federate.endpoints}")
-    grid_federate = GridFederate(federate, args.grid_config)
-    helicsFederateLogDebugMessage(federate, "Model initialized")
-    federate.enter_executing_mode()
-    grid_federate.run(args.hours)
-    grid_federate.finalize()
-    federate.disconnect()
+    run_federate(federate, args.grid_config, args.hours, args.profile)
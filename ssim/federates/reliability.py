@@ -8,6 +8,7 @@ from helics import (
 )
 
 from ssim import grid
+from ssim.codec import MessageCodec
 from ssim.reliability import GridReliabilityModel
 from ssim.federates import timing
 
@@ -28,17 +29,22 @@ class ReliabilityFederate:
         Federate handle for interacting with HELICS.
     reliability_model : GridReliabilityModel
         Model that determines when grid components fail and are restored.
+    codec : MessageCodec, optional
+        Codec used to encode and decode messages.
     """
     def __init__(self, federate: HelicsMessageFederate,
-                 reliability_model: GridReliabilityModel):
+                 reliability_model: GridReliabilityModel,
+                 codec: MessageCodec = None):
         print(f"endpoints: {federate.endpoints}")
         self._federate = federate
+        self._codec = codec or MessageCodec()
         self._reliability_model = reliability_model
         self._endpoint = federate.get_endpoint_by_name("reliability")
 
     def _send_event_message(self, event):
-        self._endpoint.send_data(event.to_json(), "grid/reliability")
-        self._endpoint.send_data(event.to_json(), "ems/reliability")
+        message = self._codec.encode(event)
+        self._endpoint.send_data(message, "grid/reliability")
+        self._endpoint.send_data(message, "ems/reliability")
 
     def _pending_messages(self):
         while self._endpoint.has_message():
@@ -46,10 +52,12 @@ class ReliabilityFederate:
 
     def _generator_status_messages(self):
         for message in self._pending_messages():
-            status = grid.GeneratorStatus.from_json(message.data)
+            status: grid.GeneratorStatus = self._codec.decode(
+                message.raw_data
+            )
             self._federate.log_message(f"generator status: {status}",
                                        logging.DEBUG)
-            yield grid.GeneratorStatus.from_json(message.data)
+            yield status
 
     def step(self, time):
         """Advance the time of the reliability model to `time`."""
@@ -92,6 +100,28 @@ def _make_reliability_model(grid_config: str) -> GridReliabilityModel:
     return GridReliabilityModel(grid_config)
 
 
+def run_federate(federate, grid_config: str, hours: float):
+    """Run a reliability federate as `federate`.
+
+    Parameters
+    ----------
+    federate : HelicsMessageFederate
+        HELICS federate handle.
+    grid_config : str
+        Path to the JSON grid configuration file.
+    hours : float
+        Number of hours to simulate.
+    """
+    reliability_model = _make_reliability_model(grid_config)
+    codec = MessageCodec.from_grid_spec(
+        grid.GridSpecification.from_json(grid_config)
+    )
+    fed = ReliabilityFederate(federate, reliability_model, codec)
+    federate.enter_executing_mode()
+    fed.run(hours)
+    federate.disconnect()
+
+
 def run():
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -111,8 +141,4 @@ def run():
     )
     args = parser.parse_args()
     federate = helicsCreateMessageFederateFromConfig(args.federate_config)
-    reliability_model = _make_reliability_model(args.grid_config)
-    fed = ReliabilityFederate(federate, reliability_model)
-    federate.enter_executing_mode()
-    fed.run(args.hours)
-    federate.disconnect()
+    run_federate(federate, args.grid_config, args.hours)
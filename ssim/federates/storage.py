@@ -12,6 +12,7 @@ from helics import (
 
 from ssim import ems
 from ssim import grid
+from ssim.codec import MessageCodec
 from ssim.grid import GridSpecification
 from ssim.federates import timing
 
@@ -117,7 +118,7 @@ def pending_messages(endpoint):
         yield message.data
 
 
-def _send_soc_to_ems(soc, time, federate):
+def _send_soc_to_ems(soc, time, federate, codec):
     """Send a message to the ems/control endpoint with the current SOC.
 
     Parameters
@@ -129,6 +130,8 @@ def _send_soc_to_ems(soc, time, federate):
     federate : HelicsFederate
         Federate handle to send the message from. Must have a registered
         endpoint named "control".
+    codec : MessageCodec
+        Codec used to encode the message.
     """
     endpoint_name = f"storage.{federate.name.lower()}.control"
     endpoint = federate.get_endpoint_by_name(endpoint_name)
@@ -136,12 +139,12 @@ def _send_soc_to_ems(soc, time, federate):
     message.destination = "ems/control"
     message.original_source = endpoint_name
     message.source = endpoint_name
-    message.data = grid.StorageStatus(federate.name, soc).to_json()
+    message.raw_data = codec.encode(grid.StorageStatus(federate.name, soc))
     message.time = time
     endpoint.send_data(message)
 
 
-def _controller(federate, controller, hours):
+def _controller(federate, controller, hours, codec=None):
     """Main loop for the storage controller federate.
 
     Parameters
@@ -152,7 +155,10 @@ def _controller(federate, controller, hours):
         Controller instance.
     hours : float
         How long to run the controller.
+    codec : MessageCodec, optional
+        Codec used to encode messages to the EMS.
     """
+    codec = codec or MessageCodec()
     federate.log_message(f"storage starting ({hours})", HelicsLogLevel.TRACE)
     control_endpoint = federate.get_endpoint_by_name(
         f"storage.{federate.name.lower()}.control"
@@ -177,7 +183,7 @@ def _controller(federate, controller, hours):
                 HelicsLogLevel.TRACE
             )
             federate.publications[f"{federate.name}/power"].publish(power)
-        _send_soc_to_ems(soc, time, federate)
+        _send_soc_to_ems(soc, time, federate, codec)
 
 
 class CycleController(StorageController):
@@ -327,6 +333,21 @@ def _start_controller(name, federate_config_skeleton, grid_config, hours):
     federate_config = _complete_config(name, federate_config_skeleton)
     print(f"federate config: {federate_config}")
     federate = helicsCreateCombinationFederateFromConfig(federate_config)
+    run_federate(federate, grid_config, hours)
+
+
+def run_federate(federate, grid_config, hours):
+    """Run the controller for the storage device named ``federate.name``.
+
+    Parameters
+    ----------
+    federate : HelicsCombinationFederate
+        HELICS federate handle, configured by :py:func:`_complete_config`.
+    grid_config : str
+        Path to the grid configuration JSON.
+    hours : float
+        How long to run the controller.
+    """
     federate.register_global_endpoint(
         f"storage.{federate.name.lower()}.control"
     )
@@ -335,7 +356,8 @@ def _start_controller(name, federate_config_skeleton, grid_config, hours):
     federate.log_message(f"loaded device: {device}", HelicsLogLevel.TRACE)
     controller = _get_controller(device)
     federate.enter_executing_mode()
-    _controller(federate, controller, hours)
+    _controller(federate, controller, hours,
+                MessageCodec.from_grid_spec(spec))
     federate.disconnect()
 
 
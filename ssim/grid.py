@@ -301,6 +301,13 @@ class GridSpecification:
         self.busses_to_log: List[str] = []
         self.ems = None
         self.busses_to_measure: List[dict] = []
+        #: Encoding of messages between federates ('json' or 'binary').
+        #: See :py:mod:`ssim.codec`.
+        self.message_codec = "json"
+        #: Path to a file of reliability events computed before the
+        #: simulation, or None if events are sent by the reliability
+        #: federate. See :py:class:`ssim.reliability.EventTimeline`.
+        self.reliability_events = None
 
     def add_storage(self, specs: StorageSpecification):
         """Add a storage device to the grid specification.
@@ -356,6 +363,18 @@ class GridSpecification:
                 return device
         raise KeyError(f"no storage device named '{name}'")
 
+    @property
+    def measured_busses(self) -> List[str]:
+        """Names of the busses in :py:attr:`busses_to_measure`.
+
+        Names are listed in the order they appear in `busses_to_measure`,
+        without duplicates. The grid and metrics federates use this order
+        for the voltages in a :py:class:`BusVoltageBatch`.
+        """
+        return list(dict.fromkeys(
+            bus["name"] for bus in self.busses_to_measure
+        ))
+
     def add_ems(self, ems_spec):
         self.ems = ems_spec
 
@@ -366,6 +385,13 @@ class GridSpecification:
         grid = cls(pathlib.Path(spec["dss_file"]))
         grid.busses_to_log = set(spec.get("busses_to_log", []))
         grid.busses_to_measure = spec.get("busses_to_measure", [])
+        grid.message_codec = spec.get("message_codec", "json")
+        if grid.message_codec not in {"json", "binary"}:
+            raise ValueError(
+                f"Invalid message codec '{grid.message_codec}'. Valid "
+                "codecs are 'json' and 'binary'."
+            )
+        grid.reliability_events = spec.get("reliability_events")
 
         for device in spec["storage"]:
             grid.add_storage(
@@ -420,7 +446,22 @@ class StatusMessage:
         -------
         StatusMessage
         """
-        message = json.loads(jsonstr)
+        return cls.from_dict(json.loads(jsonstr))
+
+    @classmethod
+    def from_dict(cls, message: dict):
+        """Return the status message represented by a parsed JSON object.
+
+        Parameters
+        ----------
+        message : dict
+            Parsed JSON representation of a status message. The
+            "message_type" key is removed.
+
+        Returns
+        -------
+        StatusMessage
+        """
         message_type = message.pop("message_type")
         if message_type == "StorageStatus":
             return StorageStatus(**message)
@@ -430,8 +471,12 @@ class StatusMessage:
             return GeneratorStatus(**message)
         if message_type == "LoadStatus":
             return LoadStatus(**message)
+        if message_type == "LoadStatusBatch":
+            return LoadStatusBatch(**message)
         if message_type == "BusVoltageStatus":
             return BusVoltageStatus(**message)
+        if message_type == "BusVoltageBatch":
+            return BusVoltageBatch(**message)
 
 
 @dataclass
@@ -487,6 +532,27 @@ class LoadStatus(StatusMessage):
     kvar: float
 
 
+@dataclass
+class LoadStatusBatch(StatusMessage):
+    """Status of every load on the grid in a single message."""
+
+    __slots__ = ['names', 'kw', 'kvar']
+
+    names: List[str]
+    kw: List[float]
+    kvar: List[float]
+
+    def loads(self):
+        """Iterator over the status of each load in the batch.
+
+        Returns
+        -------
+        Iterable of LoadStatus
+        """
+        for name, kw, kvar in zip(self.names, self.kw, self.kvar):
+            yield LoadStatus(name, kw, kvar)
+
+
 @dataclass
 class BusVoltageStatus(StatusMessage):
     """Status of the voltage at a bus"""
@@ -496,3 +562,16 @@ class BusVoltageStatus(StatusMessage):
     name: str
     voltage: float
     time: float
+
+
+@dataclass
+class BusVoltageBatch(StatusMessage):
+    """Voltage at every measured bus in a single message.
+
+    Voltages are in the order of :py:attr:`GridSpecification.measured_busses`.
+    """
+
+    __slots__ = ['voltage', 'time']
+
+    voltage: List[float]
+    time: float
@@ -5,7 +5,8 @@ from ssim.grid import (
     PVStatus,
     GeneratorStatus,
     StorageStatus,
-    LoadStatus
+    LoadStatus,
+    LoadStatusBatch
 )
 
 
@@ -30,6 +31,7 @@ class CompositeHeuristicEMS(ems.Dispatcher):
             frozenset(component): self._new_ems(component)
             for component in grid_model.components()
         }
+        self._topology_version = grid_model.topology_version
 
     def _new_ems(self, component):
         """Create a new EMS to manage a subset of the grid.
@@ -51,7 +53,12 @@ class CompositeHeuristicEMS(ems.Dispatcher):
         )
 
     def _update_components(self, grid_model):
+        # the components only change when the topology changes
+        if grid_model is self._grid_model \
+                and grid_model.topology_version == self._topology_version:
+            return
         self._grid_model = grid_model
+        self._topology_version = grid_model.topology_version
         old_ems_instances = self._component_ems
         self._component_ems = {}
         for component in map(frozenset, self._grid_model.components()):
@@ -91,6 +98,14 @@ class CompositeHeuristicEMS(ems.Dispatcher):
                     )
                 )
                 load[component] += message.kw
+            elif isinstance(message, LoadStatusBatch):
+                for load_status in message.loads():
+                    component = frozenset(
+                        grid_model.component_from_element(
+                            f"load.{load_status.name}"
+                        )
+                    )
+                    load[component] += load_status.kw
             elif isinstance(message, GeneratorStatus):
                 print(f"got generator status message: {message}")
                 # TODO update generator statuses
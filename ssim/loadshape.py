@@ -0,0 +1,192 @@
+"""Binary load shapes.
+
+OpenDSS parses CSV load shapes as text every time a model is built, and
+the number of points in the shape must be known before the file is read.
+For long, high resolution profiles (for example a year of irradiance at
+one second resolution) both steps are slow. The :py:class:`LoadShapeCache`
+converts a CSV profile once to the binary single (``sngfile``) or double
+(``dblfile``) precision format that OpenDSS reads directly, and caches the
+result keyed by the content of the CSV file. The number of points is
+computed from the size of the binary file.
+"""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import os
+import tempfile
+from collections import namedtuple
+from os import PathLike
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+#: Environment variable that sets the default cache directory.
+CACHE_DIR_ENV = "SSIM_LOADSHAPE_CACHE"
+
+#: numpy type of the values in each binary format, by file extension.
+_BINARY_TYPES = {".sng": np.float32, ".dbl": np.float64}
+
+#: Number of CSV lines parsed at a time.
+_CHUNK_LINES = 65536
+
+#: A binary load shape that can be loaded by OpenDSS.
+#:
+#: `file` is the path to the binary file, `npts` is the number of points in
+#: the load shape, and `interval` is the time between points in hours (0 if
+#: the time of each point is stored in the file).
+BinaryLoadShape = namedtuple("BinaryLoadShape", ["file", "npts", "interval"])
+
+
+def binary_npts(file: PathLike, interval: float) -> int:
+    """Return the number of points in a binary load shape file.
+
+    Parameters
+    ----------
+    file : PathLike
+        Path to the file. The extension must be ".sng" or ".dbl".
+    interval : float
+        Time between points in hours. If 0, each point is a pair of values
+        (hour, multiplier).
+
+    Returns
+    -------
+    int
+        Number of points in the file.
+    """
+    file = Path(file)
+    itemsize = np.dtype(_BINARY_TYPES[file.suffix.lower()]).itemsize
+    values_per_point = 2 if interval == 0 else 1
+    return os.path.getsize(file) // (itemsize * values_per_point)
+
+
+def csv_to_binary(csv_file: PathLike, output_file: PathLike,
+                  interval: float):
+    """Convert a CSV load shape to the OpenDSS binary format.
+
+    The CSV file is read in chunks so that memory use does not depend on
+    the length of the load shape. Values are interpreted the same way
+    OpenDSS interprets ``csvfile``: if `interval` is 0 the first column is
+    the hour and the second column is the multiplier (0 if the line has
+    only one value), otherwise the first column is the multiplier.
+
+    Parameters
+    ----------
+    csv_file : PathLike
+        Path to the CSV file.
+    output_file : PathLike
+        Path to the binary file. The extension (".sng" or ".dbl")
+        determines the precision of the values written.
+    interval : float
+        Time between points in hours.
+    """
+    output_file = Path(output_file)
+    dtype = _BINARY_TYPES[output_file.suffix.lower()]
+    width = 2 if interval == 0 else 1
+    with open(csv_file, "r") as csv, open(output_file, "wb") as out:
+        while True:
+            lines = [line for line in itertools.islice(csv, _CHUNK_LINES)
+                     if line.strip()]
+            if len(lines) == 0:
+                break
+            columns = min(width, lines[0].count(",") + 1)
+            values = np.zeros((len(lines), width), dtype=dtype)
+            values[:, :columns] = np.loadtxt(
+                lines, delimiter=",", usecols=range(columns), ndmin=2
+            )
+            values.tofile(out)
+
+
+def _content_hash(file: PathLike) -> str:
+    h = hashlib.sha256()
+    with open(file, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class LoadShapeCache:
+    """On-disk cache of binary load shapes converted from CSV files.
+
+    Parameters
+    ----------
+    cache_dir : PathLike, optional
+        Directory where converted load shapes are stored. If not specified
+        the directory named by the ``SSIM_LOADSHAPE_CACHE`` environment
+        variable is used, or "ssim-loadshape-cache" in the system temporary
+        directory if the variable is not set.
+    precision : str, default "dbl"
+        Precision of the binary files, "sng" for single precision or "dbl"
+        for double precision. Single precision is only used for load shapes
+        with a fixed interval; it cannot resolve one second steps late in
+        the year, so load shapes that store the hour of each point are
+        always saved in double precision.
+    """
+
+    def __init__(self, cache_dir: Optional[PathLike] = None,
+                 precision: str = "dbl"):
+        if cache_dir is None:
+            cache_dir = os.environ.get(
+                CACHE_DIR_ENV,
+                Path(tempfile.gettempdir()) / "ssim-loadshape-cache"
+            )
+        if f".{precision}" not in _BINARY_TYPES:
+            raise ValueError(f"Invalid precision '{precision}'. Precision "
+                             "must be 'sng' or 'dbl'.")
+        self.cache_dir = Path(cache_dir)
+        self.precision = precision
+
+    def key(self, csv_file: PathLike, interval: float) -> str:
+        """Return the cache key for a CSV load shape.
+
+        The key depends on the content of the file, not its name, and on
+        whether the file contains the time of each point.
+
+        Parameters
+        ----------
+        csv_file : PathLike
+            Path to the CSV file.
+        interval : float
+            Time between points in hours.
+        """
+        layout = "hour-mult" if interval == 0 else "mult"
+        return f"{_content_hash(csv_file)}-{layout}"
+
+    def binary(self, csv_file: PathLike,
+               interval: float = 0) -> BinaryLoadShape:
+        """Return the binary version of a CSV load shape.
+
+        If the load shape is not cached it is converted and added to the
+        cache.
+
+        Parameters
+        ----------
+        csv_file : PathLike
+            Path to the CSV file.
+        interval : float, default 0
+            Time between points in hours. If 0 the CSV file contains the
+            hour and multiplier of each point.
+
+        Returns
+        -------
+        BinaryLoadShape
+            The binary load shape.
+        """
+        precision = "dbl" if interval == 0 else self.precision
+        binary_file = self.cache_dir / \
+            f"{self.key(csv_file, interval)}.{precision}"
+        if not binary_file.exists():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir,
+                                       suffix=f".{precision}")
+            os.close(fd)
+            try:
+                csv_to_binary(csv_file, tmp, interval)
+                os.replace(tmp, binary_file)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        return BinaryLoadShape(
+            binary_file, binary_npts(binary_file, interval), interval
+        )
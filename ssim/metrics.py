@@ -3,6 +3,9 @@ from __future__ import annotations
 import enum
 import math
 import hashlib
+from typing import Iterable
+
+import numpy as np
 
 
 @enum.unique
@@ -999,6 +1002,251 @@ class MetricTimeAccumulator(MetricAccumulator):
         return val
 
 
+class MetricBank:
+    """A class used to normalize and accumulate many metrics at once.
+
+    The limits, objectives, improvement types, and curve constants of each
+    metric are stored in arrays so that a whole vector of raw values can be
+    normalized in one call. The normalized values are identical to those
+    returned by Metric.normalize for each metric. Time weighted accumulation
+    follows the MetricTimeAccumulator rules, keeping a separate current time
+    for each metric.
+
+    Parameters
+    ----------
+    metrics : Iterable[Metric]
+        The metrics in the bank. Values passed to the methods of this class
+        are ordered the same way as the metrics.
+    init_time : float
+        The time to be the initial "current time" for every metric.
+        The default is 0.
+    """
+
+    def __init__(self, metrics: Iterable[Metric], init_time: float = 0.0):
+        self._metrics = list(metrics)
+        imp_types = np.array(
+            [m.improvement_type for m in self._metrics], dtype=int
+        )
+        self._objective = np.array(
+            [m.objective for m in self._metrics], dtype=float
+        )
+        self._lower = np.array([
+            np.nan if m.lower_limit is None else m.lower_limit
+            for m in self._metrics
+        ], dtype=float)
+        self._upper = np.array([
+            np.nan if m.upper_limit is None else m.upper_limit
+            for m in self._metrics
+        ], dtype=float)
+        self._minimize = imp_types == ImprovementType.Minimize
+        self._seek = imp_types == ImprovementType.SeekValue
+        self._a = np.array([m._a for m in self._metrics], dtype=float)
+        self._b = np.array([m._b for m in self._metrics], dtype=float)
+        self._c = np.array([m._c for m in self._metrics], dtype=float)
+        self._g = np.array([m._g for m in self._metrics], dtype=float)
+        # The curve constants are computed by the metrics themselves so the
+        # values (and rounding) match scalar normalization exactly.
+        d = [m._d() for m in self._metrics]
+        h = [m._h(d_i) for m, d_i in zip(self._metrics, d)]
+        self._d_const = np.array(d, dtype=float)
+        self._f_const = np.array(
+            [m._f(d_i) for m, d_i in zip(self._metrics, d)], dtype=float
+        )
+        self._psi_const = np.array(
+            [m._psi(d_i) for m, d_i in zip(self._metrics, d)], dtype=float
+        )
+        self._h_const = np.array(h, dtype=float)
+        self._phi_const = np.array(
+            [m._phi(h_i) for m, h_i in zip(self._metrics, h)], dtype=float
+        )
+        self._curr_time = np.full(len(self._metrics), init_time, dtype=float)
+        self._accumulated = np.zeros(len(self._metrics))
+        self._total_time = np.zeros(len(self._metrics))
+
+    def __len__(self):
+        return len(self._metrics)
+
+    def normalize(self, values) -> np.ndarray:
+        """Convert raw metric values into normalized fitness values.
+
+        Parameters
+        ----------
+        values : array_like
+            The raw metric values in natural units. The last axis must have
+            one entry per metric in the bank, so a 2-d array with one row per
+            time step normalizes a whole time series.
+
+        Returns
+        -------
+        numpy.ndarray:
+            The normalized values, with the same shape as `values`.
+        """
+        values = np.asarray(values, dtype=float)
+        # Every metric is normalized as a maximization. Minimization (and
+        # the part of a seek value metric above the objective) negates the
+        # value, limit, and objective.
+        negate = self._minimize | (self._seek & (values >= self._objective))
+        value = np.where(negate, -values, values)
+        limit = np.where(negate, -self._upper, self._lower)
+        objective = np.where(negate, -self._objective, self._objective)
+        norm = (value - limit) / (objective - limit)
+        with np.errstate(invalid="ignore"):
+            violated = -(self._a * norm * norm) / 2.0 + \
+                self._b * norm + self._c
+            feasible = self._d_const * np.sqrt(norm + self._f_const) + \
+                self._c - self._psi_const
+            super_optimal = \
+                self._g * np.sqrt(norm + self._h_const - 1.0) - \
+                self._phi_const + 1.0
+        return np.where(
+            value < limit, violated,
+            np.where(value < objective, feasible, super_optimal)
+        )
+
+    def accumulate(self, values, curr_time: float,
+                   indices=None) -> np.ndarray:
+        """Adds in normalized values weighted by the difference between the
+           last time each metric was accumulated and the time provided.
+
+        Parameters
+        ----------
+        values : array_like
+            The raw metric values to be normalized and accumulated, one for
+            each metric in the bank or one for each metric in `indices`.
+        curr_time: float
+            The simulation time of this call to be used along with the last
+            time each metric was accumulated for accumulation purposes.
+        indices : array_like, optional
+            The positions in the bank of the metrics that `values` belong
+            to. If not provided, `values` has one entry for every metric.
+
+        Returns
+        -------
+        numpy.ndarray:
+            The result of normalizing the supplied values. As with
+            MetricTimeAccumulator.accumulate, the result is 0 for any metric
+            whose last accumulation was at `curr_time`.
+        """
+        if indices is None:
+            indices = slice(None)
+        last_time = self._curr_time[indices]
+        assert np.all(curr_time >= last_time), \
+            "current time provided to accumulate function must be greater " + \
+            "than or equal to any prior time provided."
+        d_time = curr_time - last_time
+        met_vals = self._subset(indices).normalize(values)
+        met_vals = np.where(d_time == 0.0, 0.0, met_vals)
+        self._total_time[indices] += d_time
+        self._accumulated[indices] += d_time * met_vals
+        self._curr_time[indices] = curr_time
+        return met_vals
+
+    def accumulate_series(self, values, times) -> np.ndarray:
+        """Accumulates a time series of raw values for every metric.
+
+        This is equivalent to calling accumulate once for each time in
+        `times`, but normalizes the whole series at once.
+
+        Parameters
+        ----------
+        values : array_like
+            The raw metric values with one row per time and one column per
+            metric in the bank.
+        times : array_like
+            The simulation time of each row of `values`, in increasing order.
+
+        Returns
+        -------
+        numpy.ndarray:
+            The normalized values, 0 where the time of a row is equal to the
+            time of the previous accumulation.
+        """
+        times = np.asarray(times, dtype=float)
+        previous = np.empty((len(times), len(self)))
+        previous[:1] = self._curr_time
+        previous[1:] = times[:-1, np.newaxis]
+        assert np.all(times[:, np.newaxis] >= previous), \
+            "times provided to accumulate_series must be increasing and " + \
+            "greater than or equal to any prior time provided."
+        d_time = times[:, np.newaxis] - previous
+        met_vals = np.where(d_time == 0.0, 0.0, self.normalize(values))
+        self._total_time += d_time.sum(axis=0)
+        self._accumulated += (d_time * met_vals).sum(axis=0)
+        if len(times) > 0:
+            self._curr_time[:] = times[-1]
+        return met_vals
+
+    def _subset(self, indices) -> MetricBank:
+        if isinstance(indices, slice) and indices == slice(None):
+            return self
+        subset = MetricBank.__new__(MetricBank)
+        for name in ("_objective", "_lower", "_upper", "_minimize", "_seek",
+                     "_a", "_b", "_c", "_g", "_d_const", "_f_const",
+                     "_psi_const", "_h_const", "_phi_const"):
+            setattr(subset, name, getattr(self, name)[indices])
+        return subset
+
+    @property
+    def metrics(self) -> list:
+        """Allows access to the Metrics in this bank.
+
+        Returns
+        -------
+        list:
+            The metrics in the order their values are passed to this bank.
+        """
+        return self._metrics
+
+    @property
+    def accumulated_values(self) -> np.ndarray:
+        """Allows access to the current accumulation value of each metric.
+
+        Returns
+        -------
+        numpy.ndarray:
+            The current time weighted sum of normalized values for each
+            metric.
+        """
+        return self._accumulated
+
+    @property
+    def total_times(self) -> np.ndarray:
+        """Allows access to the current sum of accumulated time of each
+           metric.
+
+        Returns
+        -------
+        numpy.ndarray:
+            The current sum of all accumulated time for each metric.
+        """
+        return self._total_time
+
+    @property
+    def denormalized_values(self) -> np.ndarray:
+        """Allows access to the total accumulation of each metric divided by
+           its total time.
+
+        Returns
+        -------
+        numpy.ndarray:
+            The current total accumulation over the total time accumulated so
+            far for each metric.
+        """
+        return self._accumulated / self._total_time
+
+    @property
+    def total_accumulation(self) -> float:
+        """Computes and returns the total accumulated value over all metrics
+           in this bank.
+
+        Returns
+        -------
+        float:
+            The sum of the accumulated values of all metrics in this bank.
+        """
+        return float(self._accumulated.sum())
+
+
 class MetricManager:
     """A class used to manage a set of metric accumulators keyed on names."""
 
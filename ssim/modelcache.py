@@ -0,0 +1,232 @@
+"""Cache of grid model topology.
+
+Compiling an OpenDSS model is expensive, and several federates compile the
+same model only to find out which lines, transformers, and devices are in
+it. The :py:class:`ModelCache` stores this inventory on disk, keyed by the
+fingerprint of the model files (see :py:func:`ssim.dssutil.fingerprint`), so
+that the model only needs to be compiled the first time it is used.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field, asdict
+from os import PathLike
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import opendssdirect as dssdirect
+
+from ssim import dssutil
+
+#: Environment variable that sets the default cache directory.
+CACHE_DIR_ENV = "SSIM_MODEL_CACHE"
+
+# OpenDSS has a single global engine per process, so only one thread may
+# compile a model at a time.
+_compile_lock = threading.Lock()
+
+
+@dataclass
+class ModelInventory:
+    """Topology and element inventory of an OpenDSS model.
+
+    All names are lower case, as reported by OpenDSS.
+    """
+
+    #: Map from line name to the names of the busses at each terminal.
+    lines: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+    #: Map from switch name to its normal state ('open' or 'closed').
+    #: Every switch is also included in `lines`.
+    switches: Dict[str, str] = field(default_factory=dict)
+
+    #: Map from transformer name to the names of the busses at each
+    #: terminal.
+    transformers: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+    #: Map from element name (for example 'load.load1') to the bus its
+    #: first terminal is connected to.
+    elements: Dict[str, str] = field(default_factory=dict)
+
+    #: Names of all generators.
+    generators: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_opendss(cls) -> ModelInventory:
+        """Read the inventory of the active OpenDSS circuit."""
+        inventory = cls()
+        for name, properties in dssutil.iterate_properties(
+                dssdirect.Lines, ("Bus1", "Bus2", "IsSwitch")):
+            inventory.lines[name] = (properties.Bus1, properties.Bus2)
+            if properties.IsSwitch:
+                inventory.switches[name] = _switch_state_normal(name)
+        transformer = dssdirect.Transformers.First()
+        while transformer > 0:
+            bus1, bus2 = dssdirect.CktElement.BusNames()
+            inventory.transformers[dssdirect.Transformers.Name()] = (
+                bus1, bus2
+            )
+            transformer = dssdirect.Transformers.Next()
+        for element in dssdirect.Circuit.AllElementNames():
+            dssdirect.Circuit.SetActiveElement(element)
+            busses = dssdirect.CktElement.BusNames()
+            if len(busses) > 0:
+                inventory.elements[element.lower()] = busses[0]
+        inventory.generators = list(dssdirect.Generators.AllNames())
+        return inventory
+
+    @classmethod
+    def from_json(cls, file: PathLike) -> ModelInventory:
+        """Load an inventory saved by :py:meth:`ModelInventory.to_json`."""
+        with open(file) as f:
+            inventory = json.load(f)
+        return cls(
+            lines={name: tuple(busses)
+                   for name, busses in inventory["lines"].items()},
+            switches=inventory["switches"],
+            transformers={name: tuple(busses)
+                          for name, busses
+                          in inventory["transformers"].items()},
+            elements=inventory["elements"],
+            generators=inventory["generators"]
+        )
+
+    def to_json(self, file: PathLike):
+        """Save the inventory to a JSON file.
+
+        The file is replaced atomically so that concurrent readers never
+        see a partially written inventory.
+
+        Parameters
+        ----------
+        file : PathLike
+            Path to the output file.
+        """
+        file = Path(file)
+        fd, tmp = tempfile.mkstemp(dir=file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(asdict(self), f)
+            os.replace(tmp, file)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+class ModelCache:
+    """On-disk cache of OpenDSS model inventories.
+
+    Parameters
+    ----------
+    cache_dir : PathLike, optional
+        Directory where cached inventories are stored. If not specified the
+        directory named by the ``SSIM_MODEL_CACHE`` environment variable is
+        used, or "ssim-model-cache" in the system temporary directory if
+        the variable is not set.
+    """
+
+    def __init__(self, cache_dir: Optional[PathLike] = None):
+        if cache_dir is None:
+            cache_dir = os.environ.get(
+                CACHE_DIR_ENV,
+                Path(tempfile.gettempdir()) / "ssim-model-cache"
+            )
+        self.cache_dir = Path(cache_dir)
+
+    def key(self, dss_file: PathLike) -> Optional[str]:
+        """Return the cache key for the model in `dss_file`.
+
+        The key combines the fingerprint of the directory containing
+        `dss_file` with the name of the file, since a directory may contain
+        several models.
+
+        Parameters
+        ----------
+        dss_file : PathLike
+            Path to the OpenDSS model.
+
+        Returns
+        -------
+        str or None
+            The key, or None if the model files could not be fingerprinted.
+        """
+        dss_file = Path(dss_file)
+        try:
+            fingerprint = dssutil.fingerprint(dss_file.parent)
+        except OSError:
+            return None
+        h = hashlib.sha256(fingerprint.encode())
+        h.update(dss_file.name.lower().encode())
+        return h.hexdigest()
+
+    def inventory(self, dss_file: PathLike) -> ModelInventory:
+        """Return the inventory of the model in `dss_file`.
+
+        If the inventory is not cached the model is compiled and its
+        inventory is added to the cache. In that case the model is left
+        loaded in OpenDSS. Models are compiled by one thread at a time, and
+        threads waiting for the same model use the inventory cached by the
+        first one.
+
+        Parameters
+        ----------
+        dss_file : PathLike
+            Path to the OpenDSS model.
+
+        Returns
+        -------
+        ModelInventory
+            Inventory of the model.
+        """
+        key = self.key(dss_file)
+        cache_file = self.cache_dir / f"{key}.json"
+        if key is not None and cache_file.exists():
+            return ModelInventory.from_json(cache_file)
+        with _compile_lock:
+            if key is not None and cache_file.exists():
+                return ModelInventory.from_json(cache_file)
+            dssutil.load_model(dss_file)
+            inventory = ModelInventory.from_opendss()
+            if key is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                inventory.to_json(cache_file)
+        return inventory
+
+
+def _switch_state_normal(name):
+    """Return the "normal" state of the switch.
+
+    If the switch is controlled by a SwtControl object, this is the NormalState
+    value of the controller, otherwise the current state of the switch is
+    returned.
+
+    Parameters
+    ----------
+    name : str
+        Name of the switch.
+
+    Returns
+    -------
+    str
+        Returns 'open' if the normal state is open, or 'closed' if it
+        is closed.
+    """
+    dssdirect.Lines.Name(name)
+    if dssdirect.CktElement.HasSwitchControl():
+        for c in range(dssdirect.CktElement.NumControls()):
+            controller_type, controller_name = \
+                dssdirect.CktElement.Controller(c + 1).split('.')
+            if controller_type.lower() == "swtcontrol":
+                dssdirect.SwtControls.Name(controller_name)
+                if dssdirect.SwtControls.NormalState() == 1:
+                    return "open"
+                return "closed"
+    # No switch control. If either terminal is open return 'open', otherwise
+    # return 'closed'
+    if dssdirect.CktElement.IsOpen(1, 1) or dssdirect.CktElement.IsOpen(2, 1):
+        return "open"
+    return "closed"
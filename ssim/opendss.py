@@ -3,18 +3,20 @@ from __future__ import annotations
 from collections import namedtuple
 import csv
 import enum
-from functools import lru_cache, cached_property
+from functools import cached_property
 import logging
 import math
 import os
 from os import PathLike, path
 from pathlib import Path
-import re
-from typing import Any, List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 
+import numpy as np
 import opendssdirect as dssdirect
 
 from ssim import grid
+from ssim.loadshape import LoadShapeCache
+from ssim.sink import ArraySink, RowSink, save_npz
 from ssim.grid import GridSpecification, StorageSpecification
 from ssim.storage import StorageDevice, StorageState
 from ssim import dssutil
@@ -22,43 +24,76 @@ from ssim import dssutil
 
 ControlEvent = namedtuple("ControlEvent", ("time", "element", "action"))
 
+#: Power demand of every load in the model at the last solution.
+LoadSnapshot = namedtuple("LoadSnapshot", ("names", "kw", "kvar"))
+
+#: Storage properties that are cached after each solution.
+_STORAGE_CACHED_PROPERTIES = (
+    "state", "kw", "kvar", "kwrated", "kwhrated", "kwhstored", "%stored",
+    "%reserve", "%effcharge", "%effdischarge", "%idlingkw"
+)
+
+#: OpenDSS LoadShape property used to load a file, by file extension.
+_LOADSHAPE_FILE_TYPES = {".sng": "sngfile", ".dbl": "dblfile"}
+
 
 def _parse_control_event(event_record: str) -> ControlEvent:
-    """Parse a string containing an opendss event record."""
-    m = re.match(r"Hour=(?P<hour>\d+), "
-                 r"Sec=(?P<sec>\d+(\.\d*)?), "
-                 r"ControlIter=\d+, "
-                 r"Element=(?P<element>[a-zA-Z0-9._/]+), "
-                 r"([a-zA-Z0-9._/]+, )?Action=(?P<action>.*)",
-                 event_record)
-    if m is None:
+    """Parse a string containing an opendss event record.
+
+    Event records have the form ``"Hour=<h>, Sec=<s>, ControlIter=<n>,
+    Element=<element>, [<field>, ]Action=<action>"``.
+    """
+    try:
+        hour, sec, iteration, element, action = event_record.split(", ", 4)
+        if not (hour.startswith("Hour=")
+                and sec.startswith("Sec=")
+                and iteration.startswith("ControlIter=")
+                and element.startswith("Element=")):
+            raise ValueError
+        if not action.startswith("Action="):
+            # skip the optional field before the action
+            _, action = action.split(", ", 1)
+            if not action.startswith("Action="):
+                raise ValueError
+        time = float(hour[5:]) * 3600 + float(sec[4:])
+    except ValueError:
         logging.error("Could not parse control event record: '%s'",
                       event_record)
         return None
-    hours = float(m.group("hour"))
-    seconds = float(m.group("sec"))
-    time = hours * 3600 + seconds
-    element = m.group("element")
-    action = m.group("action")
-    return ControlEvent(time, element, action)
+    return ControlEvent(time, element[8:], action[7:])
 
 
 class ControlLog:
-    """Record of control actions that have been executed by OpenDSS."""
+    """Record of control actions that have been executed by OpenDSS.
 
-    def __init__(self):
-        self._log_index = 0
-        self.events = []
+    The OpenDSS event log is cleared each time it is read so that only
+    new events are retrieved by :py:meth:`ControlLog.update`.
+
+    Parameters
+    ----------
+    spill_dir : PathLike, optional
+        Directory where recorded events are stored during the simulation.
+        If not specified a temporary file is used.
+    """
+
+    def __init__(self, spill_dir=None):
+        self._events = RowSink(_spill_path(spill_dir, "control_log"))
+
+    @property
+    def events(self) -> List[ControlEvent]:
+        """All control events that have been recorded."""
+        return list(self._events.rows())
 
     def update(self):
         """Add any new control actions to the control log."""
         event_log = dssdirect.Solution.EventLog()
-        while self._log_index < len(event_log):
-            event = _parse_control_event(event_log[self._log_index])
-            self._log_index += 1
-            if event is None:
-                continue
-            self.events.append(event)
+        if len(event_log) == 0:
+            return
+        dssutil.run_command("reset eventlog")
+        for record in event_log:
+            event = _parse_control_event(record)
+            if event is not None:
+                self._events.append(event)
 
     def to_csv(self, output_file):
         """Save the control log to a CSV file.
@@ -72,7 +107,11 @@ class ControlLog:
         with open(output_file, 'w', newline='') as f:
             writer = csv.writer(f)
             writer.writerow(ControlEvent._fields)
-            writer.writerows(self.events)
+            writer.writerows(self._events.rows())
+
+    def close(self):
+        """Discard the recorded events."""
+        self._events.close()
 
 
 class Storage(StorageDevice):
@@ -99,6 +138,7 @@ class Storage(StorageDevice):
         self.name = name
         self.bus = bus
         self._device_parameters = device_parameters
+        self._cache = None
         dssutil.run_command(
             f"New Storage.{name}",
             {"bus1": bus, "phases": phases, "state": state,
@@ -128,11 +168,28 @@ class Storage(StorageDevice):
         OpenDSSError
             If the property could not be set.
         """
+        self._cache = None
         dssutil.run_command(f"storage.{self.name}.{property}={value}")
 
     def _get(self, property: str) -> str:
+        if self._cache is not None and property in self._cache:
+            return self._cache[property]
         return dssutil.get_property(f"storage.{self.name}.{property}")
 
+    def _update_cache(self, properties: Dict[str, str]):
+        """Replace the cached property values.
+
+        The cache is used by :py:meth:`Storage._get` until the next time
+        any property of the device is set.
+
+        Parameters
+        ----------
+        properties : dict
+            Map from lower case property names to their values as returned
+            by OpenDSS.
+        """
+        self._cache = properties
+
     def set_power(self, kw: float, kvar: float = None, pf: float = None):
         self._set('kW', kw)
         if pf is not None:
@@ -487,6 +544,17 @@ def _opendss_storage_params(storage_spec: StorageSpecification) -> dict:
     return {**params, **storage_spec.params}
 
 
+def _spill_path(spill_dir, name):
+    """Return the path to the spill file for `name` in `spill_dir`.
+
+    If `spill_dir` is None then None is returned and a temporary file is
+    used for the spill file.
+    """
+    if spill_dir is None:
+        return None
+    return Path(spill_dir) / f"{name}.sink"
+
+
 class BusRecorder:
     """Recorder for data from a subset of busses.
 
@@ -505,22 +573,26 @@ class BusRecorder:
         Name of the recorder.
     busses : Iterable of str, optional
         Set of busses to record. If None, then all busses are used.
+    spill_dir : PathLike, optional
+        Directory where recorded data is stored during the simulation. If
+        not specified a temporary file is used.
     """
 
-    def __init__(self, name, busses=None):
+    #: Columns in the recorded data.
+    columns = ("time", "vmin", "vmax", "vmin_node", "vmax_node",
+               "load_kw", "load_kvar", "pv_kw", "pv_kvar")
+
+    # The node name columns are stored as indices into `self.nodes`.
+    _node_columns = (3, 4)
+
+    def __init__(self, name, busses=None, spill_dir=None):
         if busses is None:
             self.busses = set(dssdirect.Circuit.AllBusNames())
         else:
             self.busses = set(busses)
-        self._times = []
-        self._min_voltage = []
-        self._max_voltage = []
-        self._min_node = []
-        self._max_node = []
-        self._load_kw = []
-        self._load_kvar = []
-        self._pv_kw = []
-        self._pv_kvar = []
+        self._values = ArraySink(
+            len(self.columns), path=_spill_path(spill_dir, name)
+        )
         self.name = name
 
     @cached_property
@@ -552,65 +624,133 @@ class BusRecorder:
             nodes.extend(f"{bus}.{node}" for node in bus_nodes)
         return nodes
 
-    def sample(self, time):
+    @cached_property
+    def _node_index(self):
+        node_index = {node: index for index, node
+                      in enumerate(dssdirect.Circuit.AllNodeNames())}
+        return np.array([node_index[node] for node in self.nodes], dtype=int)
+
+    @cached_property
+    def _load_index(self):
+        return _element_index(dssdirect.Loads.AllNames(), self.loads)
+
+    @cached_property
+    def _pvsystem_index(self):
+        return _element_index(dssdirect.PVsystems.AllNames(), self.pvsystems)
+
+    def sample(self, time, powers=None):
         """Record data at the given time.
 
         Parameters
         ----------
         time : float
             The current time in seconds.
+        powers : tuple, optional
+            The real and reactive power of every load and of every PV system
+            at the current solution, as ``((load_kw, load_kvar), (pv_kw,
+            pv_kvar))`` (see :py:meth:`DSSModel.solution_powers`). If not
+            specified the powers are read from OpenDSS.
+        """
+        if powers is None:
+            powers = _load_powers(), _pvsystem_powers()
+        (load_kw, load_kvar), (pv_kw, pv_kvar) = powers
+        voltages = np.asarray(
+            dssdirect.Circuit.AllBusMagPu())[self._node_index]
+        # ignore any busses that are not energized
+        energized = np.flatnonzero(voltages >= 0.1)
+        if len(energized) == 0:
+            minimum_voltage, maximum_voltage = 10.0, 0.0
+            minimum, maximum = -1, -1
+        else:
+            minimum = energized[np.argmin(voltages[energized])]
+            maximum = energized[np.argmax(voltages[energized])]
+            minimum_voltage = voltages[minimum]
+            maximum_voltage = voltages[maximum]
+        self._values.append(
+            (time, minimum_voltage, maximum_voltage, minimum, maximum,
+             load_kw[self._load_index].sum(),
+             load_kvar[self._load_index].sum(),
+             pv_kw[self._pvsystem_index].sum(),
+             pv_kvar[self._pvsystem_index].sum())
+        )
+
+    def _chunks(self):
+        """Iterate over the recorded data one chunk at a time.
+
+        Yields a dict mapping each column name to the values in the chunk.
+        """
+        # index -1 selects None for samples with no energized nodes
+        nodes = np.array(self.nodes + [None], dtype=object)
+        for chunk in self._values.chunks():
+            data = dict(zip(self.columns, chunk.T))
+            for column in self._node_columns:
+                name = self.columns[column]
+                data[name] = nodes[data[name].astype(int)]
+            yield data
+
+    def _column_chunks(self, column):
+        """Iterate over the values of `column` one chunk at a time.
+
+        Node names are returned as strings, with an empty string in place
+        of None.
+        """
+        for chunk in self._chunks():
+            if self.columns.index(column) in self._node_columns:
+                yield ["" if node is None else node for node in chunk[column]]
+            else:
+                yield chunk[column]
+
+    def data(self) -> Dict[str, np.ndarray]:
+        """Return the recorded data.
+
+        Returns
+        -------
+        dict
+            Map from column name (see :py:attr:`BusRecorder.columns`) to a
+            numpy array of the recorded values. The node name columns
+            contain None for samples where no node was energized.
         """
-        self._times.append(time)
-        total_kw = 0.0
-        total_kvar = 0.0
-        for load in self.loads:
-            dssdirect.Loads.Name(load)
-            kw, kvar = dssdirect.CktElement.TotalPowers()
-            total_kw += kw
-            total_kvar += kvar
-        self._load_kw.append(total_kw)
-        self._load_kvar.append(total_kvar)
-        pv_kw = 0.0
-        pv_kvar = 0.0
-        for pvsystem in self.pvsystems:
-            dssdirect.PVsystems.Name(pvsystem)
-            pv_kw += dssdirect.PVsystems.kW()
-            pv_kvar += dssdirect.PVsystems.kvar()
-        self._pv_kw.append(pv_kw)
-        self._pv_kvar.append(pv_kvar)
-        node_voltages = all_node_voltages(time)
-        select_voltage = {node: node_voltages[node] for node in self.nodes}
-        minimum_voltage = 10.0
-        maximum_voltage = 0.0
-        minimum_node = None
-        maximum_node = None
-        for node, voltage in select_voltage.items():
-            if voltage < 0.1:
-                # ignore any busses that are not energized
-                continue
-            if voltage < minimum_voltage:
-                minimum_voltage = voltage
-                minimum_node = node
-            if voltage > maximum_voltage:
-                maximum_voltage = voltage
-                maximum_node = node
-        self._min_node.append(minimum_node)
-        self._min_voltage.append(minimum_voltage)
-        self._max_node.append(maximum_node)
-        self._max_voltage.append(maximum_voltage)
+        chunks = list(self._chunks())
+        if len(chunks) == 0:
+            return {column: np.empty(0) for column in self.columns}
+        return {column: np.concatenate([chunk[column] for chunk in chunks])
+                for column in self.columns}
 
     def to_csv(self, output_file):
         with open(output_file, 'w', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(("time", "vmin", "vmax", "vmin_node", "vmax_node",
-                             "load_kw", "load_kvar",
-                             "pv_kw", "pv_kvar"))
-            writer.writerows(
-                zip(self._times, self._min_voltage, self._max_voltage,
-                    self._min_node, self._max_node,
-                    self._load_kw, self._load_kvar,
-                    self._pv_kw, self._pv_kvar)
-            )
+            writer.writerow(self.columns)
+            for chunk in self._chunks():
+                writer.writerows(
+                    zip(*(values.tolist() for values in chunk.values()))
+                )
+
+    def to_npz(self, output_file):
+        """Save the data to a compressed numpy archive.
+
+        The archive contains one array for each column. Node names are
+        stored as strings, with an empty string where the CSV output has
+        no node.
+
+        Parameters
+        ----------
+        output_file : str or pathlike
+            Path to the output file.
+        """
+        shape = (len(self._values),)
+        node_dtype = f"<U{max(map(len, self.nodes), default=1)}"
+        arrays = {
+            name: (float, shape, self._column_chunks(name))
+            for name in self.columns
+        }
+        for column in self._node_columns:
+            name = self.columns[column]
+            arrays[name] = (node_dtype, shape, self._column_chunks(name))
+        save_npz(output_file, arrays)
+
+    def close(self):
+        """Discard the recorded data."""
+        self._values.close()
 
 
 class PDERecorder:
@@ -620,13 +760,24 @@ class PDERecorder:
     ----------
     names : Iterable of str, optional
         Names of the power delivery elements to monitor.
+    spill_dir : PathLike, optional
+        Directory where recorded data is stored during the simulation. If
+        not specified a temporary file is used.
     """
 
-    def __init__(self, names=None):
+    def __init__(self, names=None, spill_dir=None):
         if names is None:
             names = dssdirect.PDElements.AllNames()
         self._names = tuple(names)
-        self._loading = []
+        # column 0 is the time, the remaining columns are the loading
+        # of each element in `self._names`
+        self._loading = ArraySink(
+            len(self._names) + 1, path=_spill_path(spill_dir, "pde_loading")
+        )
+
+    @cached_property
+    def _index(self):
+        return _element_index(dssdirect.PDElements.AllNames(), self._names)
 
     def to_csv(self, output_file):
         """Save the data to a CSV file.
@@ -639,18 +790,43 @@ class PDERecorder:
         with open(output_file, "w", newline="") as f:
             writer = csv.writer(f)
             writer.writerow(("time", *self._names))
-            writer.writerows(self._loading)
+            for chunk in self._loading.chunks():
+                writer.writerows(chunk.tolist())
+
+    def to_npz(self, output_file):
+        """Save the data to a compressed numpy archive.
+
+        The archive contains the arrays `time`, `names`, and `loading`,
+        where ``loading[i, j]`` is the loading of element ``names[j]`` at
+        ``time[i]``.
+
+        Parameters
+        ----------
+        output_file : str or pathlike
+            Path to the output file.
+        """
+        num_samples = len(self._loading)
+        save_npz(
+            output_file,
+            {"time": (float, (num_samples,),
+                      (chunk[:, 0] for chunk in self._loading.chunks())),
+             "names": np.array(self._names, dtype=str),
+             "loading": (float, (num_samples, len(self._names)),
+                         (chunk[:, 1:] for chunk in self._loading.chunks()))}
+        )
 
     def _pde_loading(self):
-        loading = dict(zip(dssdirect.PDElements.AllNames(),
-                           dssdirect.PDElements.AllPctNorm()))
-        for name in self._names:
-            yield loading[name]
+        return np.asarray(dssdirect.PDElements.AllPctNorm())[self._index]
 
     def sample(self, time):
-        self._loading.append(
-            (time, *self._pde_loading())
-        )
+        row = np.empty(len(self._names) + 1)
+        row[0] = time
+        row[1:] = self._pde_loading()
+        self._loading.append(row)
+
+    def close(self):
+        """Discard the recorded data."""
+        self._loading.close()
 
 
 class VoltageRecorder:
@@ -663,37 +839,72 @@ class VoltageRecorder:
     ----------
     busses : Iterable of str
         Set of busses to record.
+    spill_dir : PathLike, optional
+        Directory where recorded data is stored during the simulation. If
+        not specified a temporary file is used.
     """
 
-    def __init__(self, busses):
-        self.times = []
-        self.voltage = {bus: [] for bus in busses}
+    def __init__(self, busses, spill_dir=None):
+        self.busses = tuple(busses)
+        # column 0 is the time, the remaining columns are the voltage
+        # at each bus in `self.busses`
+        self._voltage = ArraySink(
+            len(self.busses) + 1, path=_spill_path(spill_dir, "bus_voltage")
+        )
 
-    def _voltage(self, bus):
+    @property
+    def times(self) -> np.ndarray:
+        """Times when the voltage was sampled. [seconds]"""
+        return self._voltage.to_array()[:, 0]
+
+    @property
+    def voltage(self) -> Dict[str, np.ndarray]:
+        """Map from bus name to the voltage at each sample. [pu]"""
+        voltage = self._voltage.to_array()
+        return {bus: voltage[:, column + 1]
+                for column, bus in enumerate(self.busses)}
+
+    def _voltage_at(self, bus):
         """Return the average voltage over all nodes at `bus`."""
         return _mean_node_voltage(bus)
 
     def sample(self, time):
-        self.times.append(time)
-        for bus, voltages in self.voltage.items():
-            voltages.append(self._voltage(bus))
+        self._voltage.append(
+            (time, *(self._voltage_at(bus) for bus in self.busses))
+        )
 
     def to_csv(self, output_path):
         with open(output_path, 'w', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(("time", *self.voltage.keys()))
-            writer.writerows(zip(self.times, *self.voltage.values()))
+            writer.writerow(("time", *self.busses))
+            for chunk in self._voltage.chunks():
+                writer.writerows(chunk.tolist())
+
+    def to_npz(self, output_path):
+        """Save the data to a compressed numpy archive.
 
+        The archive contains the arrays `time`, `busses`, and `voltage`,
+        where ``voltage[i, j]`` is the voltage at ``busses[j]`` at
+        ``time[i]``.
 
-@lru_cache(maxsize=1)
-def all_node_voltages(time):
-    """Return a dict of per-unit voltage at all nodes in the active circuit."""
-    # NOTE the parameter `time` is unused. it is provided only to facilitate
-    #      caching the results.
-    return dict(
-        zip(dssdirect.Circuit.AllNodeNames(),
-            dssdirect.Circuit.AllBusMagPu())
-    )
+        Parameters
+        ----------
+        output_path : str or pathlike
+            Path to the output file.
+        """
+        num_samples = len(self._voltage)
+        save_npz(
+            output_path,
+            {"time": (float, (num_samples,),
+                      (chunk[:, 0] for chunk in self._voltage.chunks())),
+             "busses": np.array(self.busses, dtype=str),
+             "voltage": (float, (num_samples, len(self.busses)),
+                         (chunk[:, 1:] for chunk in self._voltage.chunks()))}
+        )
+
+    def close(self):
+        """Discard the recorded data."""
+        self._voltage.close()
 
 
 class Monitor:
@@ -745,11 +956,23 @@ class Monitor:
 
 
 class DSSModel:
-    """Wrapper around OpenDSSDirect."""
+    """Wrapper around OpenDSSDirect.
+
+    Parameters
+    ----------
+    dss_file : PathLike
+        Path to the OpenDSS model.
+    loadshape_class : LoadShapeClass, default LoadShapeClass.DAILY
+        Load shape class used for the simulation.
+    spill_dir : PathLike, optional
+        Directory where the recorders store data during the simulation. If
+        not specified temporary files are used.
+    """
 
     def __init__(self,
                  dss_file: PathLike,
-                 loadshape_class: LoadShapeClass = LoadShapeClass.DAILY):
+                 loadshape_class: LoadShapeClass = LoadShapeClass.DAILY,
+                 spill_dir: Optional[PathLike] = None):
         dssutil.load_model(dss_file)
         dssutil.run_command("calcv")
         dssutil.run_command(
@@ -765,13 +988,21 @@ class DSSModel:
             name: Generator(name) for name in dssdirect.Generators.AllNames()
         }
         self._failed_elements = set()
-        self._recorder = BusRecorder("all-busses")
+        self._element_positions = {}
+        self._solution_powers = None
+        self._spill_dir = spill_dir
+        self._recorder = BusRecorder("all-busses", spill_dir=spill_dir)
+        self._voltage_recorder = None
+        self._bus_node_index = None
         self._loading_recorder = None
         self._max_step = 15 * 60  # 15 minutes
-        self._control_log = ControlLog()
+        self._control_log = ControlLog(spill_dir)
 
     @classmethod
-    def from_grid_spec(cls, gridspec: GridSpecification) -> DSSModel:
+    def from_grid_spec(cls, gridspec: GridSpecification,
+                       spill_dir: Optional[PathLike] = None,
+                       loadshape_cache: Optional[LoadShapeCache] = None
+                       ) -> DSSModel:
         """Construct an DSSModel from a grid specification.
 
         The OpenDSS model is initialized by loading ``gridspec.file``. After
@@ -791,7 +1022,9 @@ class DSSModel:
         :py:attr: `grid.PVSpecification.irradiance_profile` field or as a
         parameter in :py:attr:`grid.PVSpecification.params`. Either way a new
         LoadShape will be created in the OpenDSS model named
-        "irrad_pv_<pvsystem-name>".
+        "irrad_pv_<pvsystem-name>". Irradiance profiles given as csv files
+        are converted to binary load shapes by `loadshape_cache` so that the
+        text is only parsed the first time a profile is used.
 
         Similarly, for the storage device, the efficiency curve may be
         specified as a parameter in :py:attr:`grid.StorageSpecification.params`
@@ -809,101 +1042,34 @@ class DSSModel:
         way will override the value provided in
         :py:attr:`InvControlSpecification.params`
 
+        All elements are created with a single batch of OpenDSS commands
+        (see :py:func:`ssim.dssutil.batch`).
+
         Parameters
         ----------
         gridspec : GridSpecification
             Grid specification.
+        spill_dir : PathLike, optional
+            Directory where the recorders store data during the simulation.
+        loadshape_cache : LoadShapeCache, optional
+            Cache of binary load shapes. If not specified a cache in the
+            default location is used.
 
         Returns
         -------
         DSSModel
             An opendss grid model that matches the specification in `gridspec`.
         """
-        model = DSSModel(gridspec.file)
+        model = DSSModel(gridspec.file, spill_dir=spill_dir)
         model.add_voltage_recorder(
             gridspec.busses_to_log.union(
                 set(bus["name"] for bus in gridspec.busses_to_measure)
             )
         )
         model.add_loading_recorder()
-        for storage_device in gridspec.storage_devices:
-            storage_params = _opendss_storage_params(storage_device)
-            if storage_device.inverter_efficiency is not None:
-                model.add_xycurve(f"eff_storage_{storage_device.name}",
-                                  *zip(*storage_device.inverter_efficiency))
-                storage_params["EffCurve"] = \
-                    f"eff_storage_{storage_device.name}"
-            model.add_storage(
-                storage_device.name,
-                storage_device.bus,
-                storage_device.phases,
-                storage_params
-            )
-        for pv_system in gridspec.pv_systems:
-            system_params = pv_system.params.copy()
-            if pv_system.irradiance_profile is not None:
-                npts = _count_lines(pv_system.irradiance_profile)
-                model.add_loadshape(f"irrad_pv_{pv_system.name}",
-                                    pv_system.irradiance_profile, 0, npts)
-                loadshape_class = str(model.loadshapeclass)
-                system_params[loadshape_class] = f"irrad_pv_{pv_system.name}"
-            if pv_system.inverter_efficiency is not None:
-                model.add_xycurve(f"eff_pv_{pv_system.name}",
-                                  *zip(*pv_system.inverter_efficiency))
-                system_params["EffCurve"] = f"eff_pv_{pv_system.name}"
-            if pv_system.pt_curve is not None:
-                model.add_xycurve(f"pt_{pv_system.name}",
-                                  *zip(*pv_system.pt_curve))
-                system_params["P-TCurve"] = f"pt_{pv_system.name}"
-            model.add_pvsystem(
-                pv_system.name,
-                pv_system.bus,
-                pv_system.phases,
-                pv_system.kva_rated,
-                pv_system.pmpp,
-                system_params
-            )
-        for inv_control in gridspec.inv_control:
-            control_params = inv_control.params.copy()
-            if inv_control.function_curve_1 is not None:
-                # single inverter control functions
-                # add function_curve_1 to the model
-                model.add_xycurve(f"func_{inv_control.name}_1",
-                                  *zip(*inv_control.function_curve_1))
-                # volt-var function
-                if inv_control.inv_control_mode.lower() == "voltvar":
-                    control_params["vvc_curve1"] = \
-                        f"func_{inv_control.name}_1"
-                # volt-watt function
-                elif inv_control.inv_control_mode.lower() == "voltwatt":
-                    control_params["voltwatt_curve"] = \
-                        f"func_{inv_control.name}_1"
-                # watt-pf function
-                elif inv_control.inv_control_mode.lower() == "wattpf":
-                    control_params["wattpf_curve"] = \
-                        f"func_{inv_control.name}_1"
-                # watt-var function
-                elif inv_control.inv_control_mode.lower() == "wattvar":
-                    control_params["wattvar_curve"] = \
-                        f"func_{inv_control.name}_1"
-                elif inv_control.inv_control_mode.lower() == "vv_vw":
-                    if inv_control.function_curve_2 is None:
-                        raise ValueError("vv_vw control mode requires two "
-                                         "function curves. Add a value for "
-                                         "'function_curve_2'.")
-                    model.add_xycurve(f"func_{inv_control.name}_2",
-                                      *zip(*inv_control.function_curve_2))
-                    control_params["vvc_curve1"] = \
-                        f"func_{inv_control.name}_1"
-                    control_params["voltwatt_curve"] = \
-                        f"func_{inv_control.name}_2"
-
-            model.add_inverter_controller(
-                inv_control.name,
-                inv_control.der_list,
-                inv_control.inv_control_mode,
-                control_params
-            )
+        with dssutil.batch():
+            _add_grid_spec_elements(model, gridspec,
+                                    loadshape_cache or LoadShapeCache())
         return model
 
     @property
@@ -956,6 +1122,7 @@ class DSSModel:
             Time at which to solve. [seconds]
         """
         self._set_time(time)
+        self._solution_powers = None
         try:
             dssdirect.Solution.Solve()
         except dssdirect.DSSException as e:
@@ -965,14 +1132,83 @@ class DSSModel:
             else:
                 logging.info("Max control iterations exceeded.")
         self._last_solution_time = time
+        self._refresh_storage_cache()
+
+    @property
+    def solver_iterations(self) -> Tuple[int, int]:
+        """Iterations used by the last solution.
+
+        Returns
+        -------
+        iterations : int
+            Number of power flow iterations.
+        control_iterations : int
+            Number of control iterations.
+        """
+        return (dssdirect.Solution.Iterations(),
+                dssdirect.Solution.ControlIterations())
+
+    def _refresh_storage_cache(self):
+        """Read the state of every storage device in a single pass.
+
+        The storage devices are visited using the OpenDSS storage
+        iterator and all properties in ``_STORAGE_CACHED_PROPERTIES`` are
+        read from the active element, avoiding a command round trip for
+        each property.
+        """
+        if len(self._storage) == 0:
+            return
+        devices = {name.lower(): device
+                   for name, device in self._storage.items()}
+        storage = dssdirect.Storages.First()
+        while storage > 0:
+            device = devices.get(dssdirect.Storages.Name())
+            if device is not None:
+                device._update_cache(
+                    {prop: dssdirect.Properties.Value(prop)
+                     for prop in _STORAGE_CACHED_PROPERTIES}
+                )
+            storage = dssdirect.Storages.Next()
+
+    def _positions(self, elements):
+        # Disabling an element does not remove it from AllNames(), so the
+        # positions only change when elements are added to the model.
+        position = self._element_positions.get(elements)
+        if position is None or len(position) != elements.Count():
+            position = _element_positions(elements)
+            self._element_positions[elements] = position
+        return position
+
+    def solution_powers(self):
+        """Return the power of every load and PV system at the last solution.
+
+        The powers are read from OpenDSS once per solution and shared by
+        the recorders and :py:meth:`load_snapshot`.
+
+        Returns
+        -------
+        loads : tuple of numpy.ndarray
+            Real [kW] and reactive [kVAR] power of each load, in the order of
+            ``dssdirect.Loads.AllNames()``. Disabled loads have zero power.
+        pvsystems : tuple of numpy.ndarray
+            Real [kW] and reactive [kVAR] power output of each PV system, in
+            the order of ``dssdirect.PVsystems.AllNames()``.
+        """
+        if self._solution_powers is None:
+            self._solution_powers = (
+                _load_powers(self._positions(dssdirect.Loads)),
+                _pvsystem_powers(self._positions(dssdirect.PVsystems))
+            )
+        return self._solution_powers
 
     def add_voltage_recorder(self, busses):
         """Monitor voltage at each bus in `busses`."""
-        self._voltage_recorder = VoltageRecorder(busses)
+        self._voltage_recorder = VoltageRecorder(busses, self._spill_dir)
 
     def record_state(self):
         """Record the values of interest at the last solution."""
-        self._recorder.sample(self._last_solution_time)
+        self._recorder.sample(self._last_solution_time,
+                              self.solution_powers())
         self._control_log.update()
         if self._voltage_recorder is not None:
             self._voltage_recorder.sample(self._last_solution_time)
@@ -994,15 +1230,31 @@ class DSSModel:
         if output_dir is None:
             output_dir = Path(".")
         self._recorder.to_csv(output_dir / "grid_state.csv")
+        self._recorder.to_npz(output_dir / "grid_state.npz")
         self._control_log.to_csv(output_dir / "control_log.csv")
         if self._voltage_recorder is not None:
             self._voltage_recorder.to_csv(output_dir / "bus_voltage.csv")
+            self._voltage_recorder.to_npz(output_dir / "bus_voltage.npz")
         if self._loading_recorder is not None:
             self._loading_recorder.to_csv(output_dir / "pde_loading.csv")
+            self._loading_recorder.to_npz(output_dir / "pde_loading.npz")
         # Save the data recorded by any internal OpenDSS monitors
         for monitor in self.monitors():
             monitor.to_csv(directory=output_dir)
 
+    def close_record(self):
+        """Discard the recorded simulation values.
+
+        Deletes the files where the recorders store data during the
+        simulation. Call this after :py:meth:`DSSModel.save_record`.
+        """
+        self._recorder.close()
+        self._control_log.close()
+        if self._voltage_recorder is not None:
+            self._voltage_recorder.close()
+        if self._loading_recorder is not None:
+            self._loading_recorder.close()
+
     def monitors(self):
         for monitor_name in dssdirect.Monitors.AllNames():
             yield Monitor(monitor_name)
@@ -1053,6 +1305,7 @@ class DSSModel:
         system = PVSystem(name, bus, phases, pmpp_kw, kva_rating,
                           system_parameters)
         self._pvsystems[name] = system
+        self._solution_powers = None
         return system
 
     def add_inverter_controller(self, name: str, der_list: List,
@@ -1088,17 +1341,21 @@ class DSSModel:
         name : str
             Name of the load shape.
         file : PathLike
-            Path to a CSV file containing the values of the load shape.
+            Path to a file containing the values of the load shape. Files
+            with the extension ".sng" or ".dbl" are read as binary single
+            or double precision values, any other file is read as CSV.
         interval : float
             Time between points in hours.
         npts : int
             Number of points in the load shape.
         """
+        file_type = _LOADSHAPE_FILE_TYPES.get(Path(file).suffix.lower(),
+                                              "csvfile")
         dssutil.run_command(
             f"New LoadShape.{name}"
             f" npts={npts}"
             f" interval={interval}"
-            f" csvfile={file}"
+            f" {file_type}={file}"
         )
 
     @staticmethod
@@ -1188,6 +1445,25 @@ class DSSModel:
         for load in dssdirect.Loads.AllNames():
             yield Load(load)
 
+    @cached_property
+    def _load_names(self):
+        # Loads are never added or removed after the model is constructed so
+        # the names only need to be read once.
+        return np.array(dssdirect.Loads.AllNames(), dtype=object)
+
+    def load_snapshot(self) -> LoadSnapshot:
+        """Return the actual power demand of every load in the model.
+
+        Returns
+        -------
+        LoadSnapshot
+            Named tuple of numpy arrays. `names` holds the load names, `kw`
+            and `kvar` the real [kW] and reactive [kVAR] power demand of
+            the corresponding load.
+        """
+        (kw, kvar), _ = self.solution_powers()
+        return LoadSnapshot(self._load_names, kw, kvar)
+
     def available_phases(self, bus):
         dssdirect.Circuit.SetActiveBus(bus)
         return dssdirect.Bus.Nodes()
@@ -1237,6 +1513,38 @@ class DSSModel:
         """
         return _mean_node_voltage(bus)
 
+    def mean_bus_voltages(self, busses: List[str]) -> np.ndarray:
+        """Return the mean per-unit node voltage at each bus in `busses`.
+
+        The voltage of every node in the circuit is read in a single call,
+        then averaged over the nodes of each bus.
+
+        Parameters
+        ----------
+        busses : List[str]
+            Names of the busses. Must not include any node names.
+
+        Returns
+        -------
+        numpy.ndarray
+            Per-unit voltage at each bus, in the order of `busses`.
+        """
+        busses = tuple(busses)
+        if self._bus_node_index is None or self._bus_node_index[0] != busses:
+            nodes = [node.split(".")[0]
+                     for node in dssdirect.Circuit.AllNodeNames()]
+            bus_index = {bus.lower(): i for i, bus in enumerate(busses)}
+            node_bus = np.array([bus_index.get(node, -1) for node in nodes])
+            counts = np.bincount(node_bus[node_bus >= 0],
+                                 minlength=len(busses))
+            self._bus_node_index = (busses, node_bus, counts)
+        _, node_bus, counts = self._bus_node_index
+        voltage = np.asarray(dssdirect.Circuit.AllBusMagPu())
+        selected = node_bus >= 0
+        total = np.bincount(node_bus[selected], weights=voltage[selected],
+                            minlength=len(counts))
+        return total / counts
+
     @staticmethod
     def positive_sequence_voltage(bus):
         """Return positive sequence voltage at `bus` [pu]."""
@@ -1446,7 +1754,7 @@ class DSSModel:
             self.generators[name].turn_on()
 
     def add_loading_recorder(self):
-        self._loading_recorder = PDERecorder()
+        self._loading_recorder = PDERecorder(spill_dir=self._spill_dir)
 
     def export_model(self, output_dir):
         """Write the grid model as a connonical set of files.
@@ -1461,10 +1769,196 @@ class DSSModel:
         dssutil.export(source_dir, output_dir)
 
 
-def _count_lines(file_path):
-    """Return the number of lines in the file."""
-    with open(file_path, "r") as f:
-        return len(f.readlines())
+def _add_grid_spec_elements(model: DSSModel, gridspec: GridSpecification,
+                            loadshape_cache: LoadShapeCache):
+    """Add the devices and controllers in `gridspec` to `model`."""
+    for storage_device in gridspec.storage_devices:
+        storage_params = _opendss_storage_params(storage_device)
+        if storage_device.inverter_efficiency is not None:
+            model.add_xycurve(f"eff_storage_{storage_device.name}",
+                              *zip(*storage_device.inverter_efficiency))
+            storage_params["EffCurve"] = \
+                f"eff_storage_{storage_device.name}"
+        model.add_storage(
+            storage_device.name,
+            storage_device.bus,
+            storage_device.phases,
+            storage_params
+        )
+    for pv_system in gridspec.pv_systems:
+        system_params = pv_system.params.copy()
+        if pv_system.irradiance_profile is not None:
+            profile = loadshape_cache.binary(pv_system.irradiance_profile)
+            model.add_loadshape(f"irrad_pv_{pv_system.name}",
+                                profile.file, profile.interval, profile.npts)
+            loadshape_class = str(model.loadshapeclass)
+            system_params[loadshape_class] = f"irrad_pv_{pv_system.name}"
+        if pv_system.inverter_efficiency is not None:
+            model.add_xycurve(f"eff_pv_{pv_system.name}",
+                              *zip(*pv_system.inverter_efficiency))
+            system_params["EffCurve"] = f"eff_pv_{pv_system.name}"
+        if pv_system.pt_curve is not None:
+            model.add_xycurve(f"pt_{pv_system.name}",
+                              *zip(*pv_system.pt_curve))
+            system_params["P-TCurve"] = f"pt_{pv_system.name}"
+        model.add_pvsystem(
+            pv_system.name,
+            pv_system.bus,
+            pv_system.phases,
+            pv_system.kva_rated,
+            pv_system.pmpp,
+            system_params
+        )
+    for inv_control in gridspec.inv_control:
+        control_params = inv_control.params.copy()
+        if inv_control.function_curve_1 is not None:
+            # single inverter control functions
+            # add function_curve_1 to the model
+            model.add_xycurve(f"func_{inv_control.name}_1",
+                              *zip(*inv_control.function_curve_1))
+            # volt-var function
+            if inv_control.inv_control_mode.lower() == "voltvar":
+                control_params["vvc_curve1"] = \
+                    f"func_{inv_control.name}_1"
+            # volt-watt function
+            elif inv_control.inv_control_mode.lower() == "voltwatt":
+                control_params["voltwatt_curve"] = \
+                    f"func_{inv_control.name}_1"
+            # watt-pf function
+            elif inv_control.inv_control_mode.lower() == "wattpf":
+                control_params["wattpf_curve"] = \
+                    f"func_{inv_control.name}_1"
+            # watt-var function
+            elif inv_control.inv_control_mode.lower() == "wattvar":
+                control_params["wattvar_curve"] = \
+                    f"func_{inv_control.name}_1"
+            elif inv_control.inv_control_mode.lower() == "vv_vw":
+                if inv_control.function_curve_2 is None:
+                    raise ValueError("vv_vw control mode requires two "
+                                     "function curves. Add a value for "
+                                     "'function_curve_2'.")
+                model.add_xycurve(f"func_{inv_control.name}_2",
+                                  *zip(*inv_control.function_curve_2))
+                control_params["vvc_curve1"] = \
+                    f"func_{inv_control.name}_1"
+                control_params["voltwatt_curve"] = \
+                    f"func_{inv_control.name}_2"
+
+        model.add_inverter_controller(
+            inv_control.name,
+            inv_control.der_list,
+            inv_control.inv_control_mode,
+            control_params
+        )
+
+
+def _element_index(all_names, names):
+    """Return the position of each of `names` in `all_names`.
+
+    Names are compared without regard to case.
+    """
+    index = {name.lower(): i for i, name in enumerate(all_names)}
+    return np.array([index[name.lower()] for name in names], dtype=int)
+
+
+def _element_positions(elements):
+    """Return a map from the lower case name of each element in a collection
+    to its position in ``elements.AllNames()``."""
+    return {name.lower(): index
+            for index, name in enumerate(elements.AllNames())}
+
+
+def _element_powers(elements, read_powers, position=None):
+    """Return the real and reactive power of every element in a collection.
+
+    The elements are read in a single pass using the OpenDSS iterator of
+    the collection, which avoids activating each element by name. The
+    iterator skips disabled elements, so the values are placed by name;
+    disabled elements are reported with zero power.
+
+    Parameters
+    ----------
+    elements : module
+        OpenDSSDirect interface to the collection (for example
+        ``dssdirect.Loads``).
+    read_powers : Callable
+        Function that returns the real [kW] and reactive [kVAR] power of
+        the active element.
+    position : dict, optional
+        Position of each element, as returned by
+        :py:func:`_element_positions`. If not specified it is read from
+        OpenDSS.
+
+    Returns
+    -------
+    kw : numpy.ndarray
+        Real power [kW] of each element, in the order of
+        ``elements.AllNames()``.
+    kvar : numpy.ndarray
+        Reactive power [kVAR] of each element.
+    """
+    if position is None:
+        position = _element_positions(elements)
+    kw = np.zeros(len(position))
+    kvar = np.zeros(len(position))
+    if not position:
+        return kw, kvar
+    element = elements.First()
+    while element > 0:
+        index = position[elements.Name().lower()]
+        kw[index], kvar[index] = read_powers()
+        element = elements.Next()
+    return kw, kvar
+
+
+def _load_powers(position=None):
+    """Return the real and reactive power of every load in the circuit.
+
+    Parameters
+    ----------
+    position : dict, optional
+        Position of each load, as returned by :py:func:`_element_positions`.
+
+    Returns
+    -------
+    kw : numpy.ndarray
+        Real power [kW] of each load, in the order of
+        ``dssdirect.Loads.AllNames()``. Disabled loads have zero power.
+    kvar : numpy.ndarray
+        Reactive power [kVAR] of each load.
+    """
+    return _element_powers(dssdirect.Loads, _active_element_powers, position)
+
+
+def _active_element_powers():
+    kw, kvar = dssdirect.CktElement.TotalPowers()
+    return kw, kvar
+
+
+def _active_pvsystem_powers():
+    return dssdirect.PVsystems.kW(), dssdirect.PVsystems.kvar()
+
+
+def _pvsystem_powers(position=None):
+    """Return the real and reactive power output of every PV system.
+
+    Parameters
+    ----------
+    position : dict, optional
+        Position of each PV system, as returned by
+        :py:func:`_element_positions`.
+
+    Returns
+    -------
+    kw : numpy.ndarray
+        Real power output [kW] of each PV system, in the order of
+        ``dssdirect.PVsystems.AllNames()``. Disabled PV systems have zero
+        output.
+    kvar : numpy.ndarray
+        Reactive power output [kVAR] of each PV system.
+    """
+    return _element_powers(dssdirect.PVsystems, _active_pvsystem_powers,
+                           position)
 
 
 def _mean_node_voltage(bus):
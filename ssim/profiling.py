@@ -0,0 +1,221 @@
+"""Low overhead timing of federate time steps.
+
+A :py:class:`StepProfiler` records the wall time spent in each phase of a
+federate time step, along with the time spent waiting for HELICS to grant
+the step and any counters the federate reports (for example power flow
+solver iterations). One row is recorded per time step and saved as a
+table with one column per phase.
+"""
+import contextlib
+import csv
+import math
+import time
+from os import PathLike
+from typing import Iterable, Optional
+
+import numpy as np
+
+from ssim.sink import ArraySink
+
+
+class StepProfiler:
+    """Record the time spent in each phase of a federate time step.
+
+    Parameters
+    ----------
+    phases : Iterable[str]
+        Names of the phases of a time step, in the order they run.
+    counters : Iterable[str], optional
+        Names of integer counters recorded for each step.
+    spill_path : PathLike, optional
+        Path to the file where rows are stored during the simulation. If
+        not specified a temporary file is used.
+    """
+
+    enabled = True
+
+    def __init__(self, phases: Iterable[str],
+                 counters: Iterable[str] = (),
+                 spill_path: Optional[PathLike] = None):
+        self.phases = list(phases)
+        self.counters = list(counters)
+        #: Names of the columns of the timing table.
+        self.columns = (["time", "request_latency"]
+                        + self.phases + self.counters)
+        self._column = {name: i for i, name in enumerate(self.columns)}
+        self._sink = ArraySink(len(self.columns), path=spill_path)
+        self._row = np.zeros(len(self.columns))
+        self._latency = 0.0
+
+    def record_grant(self, granted_time: float, latency: float):
+        """Record the time spent waiting for HELICS to grant a time.
+
+        The latency is recorded in the row for the next step that starts.
+
+        Parameters
+        ----------
+        granted_time : float
+            Time granted by HELICS. [seconds]
+        latency : float
+            Wall time spent in the time request. [seconds]
+        """
+        self._latency = latency
+
+    def begin_step(self, step_time: float):
+        """Start recording a new time step.
+
+        Parameters
+        ----------
+        step_time : float
+            Simulation time of the step. [seconds]
+        """
+        self._row[:] = 0.0
+        self._row[0] = step_time
+        self._row[1] = self._latency
+        self._latency = 0.0
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Context manager that times one phase of the current step.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase. Time is added to any time already recorded
+            for the phase in the current step.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._row[self._column[name]] += time.perf_counter() - start
+
+    def count(self, name: str, value: int):
+        """Set the value of a counter for the current step."""
+        self._row[self._column[name]] = value
+
+    def end_step(self):
+        """Finish recording the current time step."""
+        self._sink.append(self._row)
+
+    def data(self) -> np.ndarray:
+        """Return the timing table as an array with one row per step."""
+        return self._sink.to_array()
+
+    def to_csv(self, output_file: PathLike):
+        """Save the timing table to a CSV file.
+
+        Parameters
+        ----------
+        output_file : PathLike
+            Path to the output file.
+        """
+        with open(output_file, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.columns)
+            for chunk in self._sink.chunks():
+                writer.writerows(chunk.tolist())
+
+    def summary(self, bins: int = 8, width: int = 40) -> str:
+        """Return a text summary of the time spent in each phase.
+
+        For each phase the total, mean, and maximum time per step are
+        reported along with a histogram of the step times on a log scale.
+
+        Parameters
+        ----------
+        bins : int, default 8
+            Number of histogram bins for each phase.
+        width : int, default 40
+            Width of the longest histogram bar in characters.
+        """
+        data = self.data()
+        lines = [f"{len(data)} steps"]
+        if len(data) == 0:
+            return lines[0]
+        total = data[:, 1:2 + len(self.phases)].sum()
+        for name in ["request_latency"] + self.phases:
+            times = data[:, self._column[name]]
+            lines.append(
+                f"{name}: total {times.sum():.3f}s"
+                f" ({100 * times.sum() / total if total > 0 else 0:.1f}%),"
+                f" mean {times.mean() * 1e3:.3f}ms,"
+                f" max {times.max() * 1e3:.3f}ms"
+            )
+            lines.extend(_histogram(times, bins, width))
+        for name in self.counters:
+            counts = data[:, self._column[name]]
+            lines.append(f"{name}: mean {counts.mean():.2f},"
+                         f" max {int(counts.max())}")
+        return "\n".join(lines)
+
+    def close(self):
+        """Discard the recorded data."""
+        self._sink.close()
+
+
+class NullProfiler:
+    """A profiler that records nothing.
+
+    Used in place of a :py:class:`StepProfiler` when profiling is
+    disabled so that instrumented code does not need to check whether
+    profiling is enabled.
+    """
+
+    enabled = False
+
+    def record_grant(self, granted_time: float, latency: float):
+        pass
+
+    def begin_step(self, step_time: float):
+        pass
+
+    def phase(self, name: str):
+        return contextlib.nullcontext()
+
+    def count(self, name: str, value: int):
+        pass
+
+    def end_step(self):
+        pass
+
+
+def _histogram(times: np.ndarray, bins: int, width: int):
+    """Return the lines of a log scale histogram of `times`."""
+    positive = times[times > 0]
+    if len(positive) == 0:
+        return []
+    low = math.log10(positive.min())
+    high = math.log10(positive.max())
+    if high - low < 1e-9:
+        high = low + 1
+    counts, edges = np.histogram(np.log10(positive), bins=bins,
+                                 range=(low, high))
+    lines = []
+    for count, edge in zip(counts, edges):
+        bar = "#" * math.ceil(width * count / counts.max())
+        lines.append(f"  >= {10 ** edge * 1e3:10.3f}ms {count:8d} {bar}")
+    return lines
+
+
+def timed_grants(schedule: Iterable[float],
+                 profiler: StepProfiler) -> Iterable[float]:
+    """Record the latency of each time granted by `schedule`.
+
+    Parameters
+    ----------
+    schedule : Iterable[float]
+        Iterable of granted times, such as
+        :py:func:`ssim.federates.timing.schedule`.
+    profiler : StepProfiler
+        Profiler that records the latency of each grant.
+    """
+    schedule = iter(schedule)
+    while True:
+        start = time.perf_counter()
+        try:
+            granted_time = next(schedule)
+        except StopIteration:
+            return
+        profiler.record_grant(granted_time, time.perf_counter() - start)
+        yield granted_time
@@ -2,6 +2,8 @@
 from __future__ import annotations
 import abc
 import enum
+import hashlib
+import heapq
 import itertools
 import json
 import random
@@ -10,9 +12,8 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Union, Tuple
 
 import numpy as np
-import opendssdirect
 
-from ssim import dssutil
+from ssim.modelcache import ModelCache
 
 
 @enum.unique
@@ -108,10 +109,15 @@ class AgingFailure(FailureMode):
     repair_state : Mode of callable, default Mode.CLOSED
         State of the connection to the grid following repair.  If a callable
         must accept no arguments and return a :py:class:`Mode`.
+    rng : random.Random, optional
+        Source of random numbers. If not specified the functions in the
+        :py:mod:`random` module are used.
     """
     def __init__(self, mtbf, min_repair, max_repair,
                  failure_state=Mode.OPEN,
-                 repair_state=Mode.CLOSED):
+                 repair_state=Mode.CLOSED,
+                 rng=None):
+        self._rng = random if rng is None else rng
         self.mtbf = mtbf
         self.min_repair = min_repair
         self.max_repair = max_repair
@@ -122,11 +128,11 @@ class AgingFailure(FailureMode):
         self._sample_failure()
 
     def _sample_failure(self):
-        self._failure_time = self._time + random.expovariate(
+        self._failure_time = self._time + self._rng.expovariate(
             1.0 / self.mtbf
         )
         self._next_failure = Failure(
-            repair_time=random.uniform(self.min_repair, self.max_repair),
+            repair_time=self._rng.uniform(self.min_repair, self.max_repair),
             connection=self._get_failure_state(),
             repair=Repair(connection=self._get_repair_state())
         )
@@ -170,10 +176,15 @@ class OperatingWearOut(FailureMode):
         minimum repair time (wall time) [hours].
     max_repair : float
         maximum repair time (wall time) [hours].
+    rng : random.Random, optional
+        Source of random numbers. If not specified the functions in the
+        :py:mod:`random` module are used.
     """
     def __init__(self, mtbf, min_repair, max_repair,
                  failure_state=Mode.OPEN,
-                 repair_state=Mode.CLOSED):
+                 repair_state=Mode.CLOSED,
+                 rng=None):
+        self._rng = random if rng is None else rng
         self.mtbf = mtbf
         self.min_repair = min_repair
         self.max_repair = max_repair
@@ -186,12 +197,12 @@ class OperatingWearOut(FailureMode):
         self._sample_failure()
 
     def _sample_failure(self):
-        self._failure_time = self._operating_time + random.expovariate(
+        self._failure_time = self._operating_time + self._rng.expovariate(
             1.0 / self.mtbf
         )
         self._failure_wall_time = None
         self._next_failure = Failure(
-            repair_time=random.uniform(self.min_repair, self.max_repair),
+            repair_time=self._rng.uniform(self.min_repair, self.max_repair),
             connection=self._get_failure_state(),
             repair=Repair(connection=self._get_repair_state())
         )
@@ -377,7 +388,17 @@ class Event:
         json_str : str
             JSON string representation of an event.
         """
-        data = json.loads(json_str)
+        return cls.from_dict(json.loads(json_str))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Event:
+        """Construct an ``Event`` from a parsed JSON object.
+
+        Parameters
+        ----------
+        data : dict
+            Parsed JSON representation of an event.
+        """
         return cls(
             EventType(data["type"]),
             Mode(data["mode"]),
@@ -395,46 +416,298 @@ class Event:
         )
 
 
+#: Connection modes indexed by the mode codes used in
+#: :py:class:`ReliabilityTimeline`.
+_MODES = (Mode.OPEN, Mode.CLOSED, Mode.CURRENT)
+
+
+def component_seed(seed, component: str,
+                   replicate: int = 0) -> np.random.SeedSequence:
+    """Return the seed sequence for the random stream of `component`.
+
+    The stream depends only on `seed`, the name of the component, and the
+    replicate index. It does not change when other components are added
+    to or removed from the grid, so every configuration of the same grid
+    simulated with the same seed and replicate sees the same failures
+    (common random numbers).
+
+    Parameters
+    ----------
+    seed : int or None
+        Base seed. If None, fresh entropy is used.
+    component : str
+        Name of the component (for example "line.l1").
+    replicate : int, default 0
+        Index of the Monte Carlo replicate.
+    """
+    # the full digest keeps the streams of components with different
+    # names distinct, a 32-bit hash would collide on large feeders
+    digest = hashlib.sha256(component.encode()).digest()
+    return np.random.SeedSequence(
+        seed,
+        spawn_key=(*np.frombuffer(digest, dtype="<u4").tolist(), replicate)
+    )
+
+
+def _python_rngs(sequence: np.random.SeedSequence, count: int):
+    """Return `count` independent :py:class:`random.Random` instances
+    seeded from `sequence`."""
+    return [random.Random(int(child.generate_state(1, np.uint64)[0]))
+            for child in sequence.spawn(count)]
+
+
+class ReliabilityTimeline:
+    """Pre-sampled failure and repair times for a set of components.
+
+    Each component alternates between operation, with a duration sampled
+    from an exponential distribution with mean `mtbf`, and repair, with a
+    duration sampled uniformly between `min_repair` and `max_repair`. This
+    is the same process as a :py:class:`MultiModeReliabilityModel` with a
+    single :py:class:`AgingFailure` mode. The failure and repair times for
+    all components are sampled in blocks of `block_size` cycles and kept in
+    arrays sorted by time; more cycles are sampled as the timeline is
+    read.
+
+    Every component has its own random stream, so the timeline of a
+    component depends only on its seed and not on the other components or
+    on `block_size`.
+
+    Parameters
+    ----------
+    components : Iterable[str]
+        Names of the components.
+    seeds : Iterable[np.random.SeedSequence]
+        Seed for each component's random stream.
+    mtbf : float or array_like
+        Mean time before failure of each component. [seconds]
+    min_repair : float or array_like
+        Minimum repair time of each component. [seconds]
+    max_repair : float or array_like
+        Maximum repair time of each component. [seconds]
+    p_open : float or array_like, default 1.0
+        Probability that a component is open following a failure.
+    p_closed : float or array_like, default 0.0
+        Probability that a component is closed following a failure. With
+        probability ``1 - p_open - p_closed`` the component keeps its
+        current state.
+    repair_state : Mode or Iterable[Mode], default Mode.CLOSED
+        State of each component following repair.
+    horizon : float, default 0.0
+        Initial time up to which the timeline is sampled. [seconds]
+    block_size : int, default 8
+        Number of failure/repair cycles sampled for a component at a time.
+    """
+    def __init__(self, components, seeds, mtbf, min_repair, max_repair,
+                 p_open=1.0, p_closed=0.0, repair_state=Mode.CLOSED,
+                 horizon=0.0, block_size=8):
+        self.components = list(components)
+        n = len(self.components)
+        self._streams = [np.random.default_rng(seed) for seed in seeds]
+        if len(self._streams) != n:
+            raise ValueError("expected one seed for each component")
+        self._mtbf = np.broadcast_to(np.asarray(mtbf, dtype=float), n)
+        self._min_repair = np.broadcast_to(
+            np.asarray(min_repair, dtype=float), n)
+        self._repair_range = np.broadcast_to(
+            np.asarray(max_repair, dtype=float), n) - self._min_repair
+        self._p_open = np.broadcast_to(np.asarray(p_open, dtype=float), n)
+        self._p_closed = np.broadcast_to(np.asarray(p_closed, dtype=float), n)
+        if isinstance(repair_state, Mode):
+            repair_state = [repair_state] * n
+        self._repair_mode = np.array(
+            [_MODES.index(Mode(mode)) for mode in repair_state],
+            dtype=np.int8
+        )
+        self._block_size = block_size
+        # end of the last sampled repair of each component
+        self._sampled_until = np.zeros(n)
+        self._cycles = np.zeros(n, dtype=np.int64)
+        # events that have not been read yet, sorted by time then component
+        self._time = np.empty(0)
+        self._component = np.empty(0, dtype=np.int64)
+        self._failure = np.empty(0, dtype=bool)
+        self._mode = np.empty(0, dtype=np.int8)
+        self._sequence = np.empty(0, dtype=np.int64)
+        self._cursor = 0
+        # time up to which the timelines of all components are sampled
+        self._horizon = 0.0
+        self._extend(horizon)
+
+    def __len__(self):
+        return len(self.components)
+
+    def _extend_past(self, time):
+        """Extend the timeline beyond `time`.
+
+        The horizon is at least doubled, so reading a long timeline
+        requires few extensions.
+        """
+        mean_cycle = np.mean(self._mtbf + self._min_repair
+                             + self._repair_range / 2)
+        self._extend(max(time, 2 * self._horizon,
+                         self._horizon + self._block_size * mean_cycle))
+
+    def _extend(self, until):
+        """Sample cycles until every component's timeline extends beyond
+        `until`."""
+        while True:
+            need = np.flatnonzero(self._sampled_until <= until)
+            if need.size == 0:
+                self._horizon = max(self._horizon, until)
+                return
+            k = self._block_size
+            # three uniform draws per cycle: time to failure, repair time
+            # and failure state
+            draws = np.stack(
+                [self._streams[index].random((k, 3)) for index in need]
+            )
+            up = -np.log1p(-draws[:, :, 0]) * self._mtbf[need, None]
+            down = (self._min_repair[need, None]
+                    + draws[:, :, 1] * self._repair_range[need, None])
+            # accumulate from the end of the sampled timeline so the sums,
+            # and therefore the event times, do not depend on `block_size`
+            repair_time = np.cumsum(
+                np.column_stack([self._sampled_until[need], up + down]),
+                axis=1
+            )[:, 1:]
+            failure_time = repair_time - down
+            p_open = self._p_open[need, None]
+            mode = np.where(
+                draws[:, :, 2] < p_open, 0,
+                np.where(draws[:, :, 2] < p_open + self._p_closed[need, None],
+                         1, 2)
+            ).astype(np.int8)
+            cycle = self._cycles[need, None] + np.arange(k)
+            component = np.broadcast_to(need[:, None], (need.size, k))
+            self._sampled_until[need] = repair_time[:, -1]
+            self._cycles[need] += k
+            self._merge(
+                np.concatenate([failure_time.ravel(), repair_time.ravel()]),
+                np.concatenate([component.ravel(), component.ravel()]),
+                np.repeat([True, False], need.size * k),
+                np.concatenate([
+                    mode.ravel(),
+                    np.broadcast_to(self._repair_mode[need, None],
+                                    (need.size, k)).ravel()
+                ]),
+                np.concatenate([2 * cycle.ravel(), 2 * cycle.ravel() + 1])
+            )
+
+    def _merge(self, time, component, failure, mode, sequence):
+        c = self._cursor
+        time = np.concatenate([self._time[c:], time])
+        component = np.concatenate([self._component[c:], component])
+        sequence = np.concatenate([self._sequence[c:], sequence])
+        order = np.lexsort((sequence, component, time))
+        self._time = time[order]
+        self._component = component[order]
+        self._sequence = sequence[order]
+        self._failure = np.concatenate([self._failure[c:], failure])[order]
+        self._mode = np.concatenate([self._mode[c:], mode])[order]
+        self._cursor = 0
+
+    def peek(self) -> float:
+        """Return the time of the next event that has not been read."""
+        if len(self) == 0:
+            return np.inf
+        while True:
+            if self._cursor < len(self._time):
+                next_time = self._time[self._cursor]
+            else:
+                next_time = np.inf
+            # events of a component that are not sampled yet are later than
+            # the end of its sampled timeline
+            if next_time <= self._horizon:
+                return next_time
+            self._extend_past(self._horizon)
+
+    def events(self, time):
+        """Yield the events at or before `time` that have not been read.
+
+        Events are yielded in order of time, and events at the same time in
+        the order of the components.
+
+        Parameters
+        ----------
+        time : float
+            Current time. [seconds]
+        """
+        if len(self) == 0:
+            return
+        if time > self._horizon:
+            self._extend_past(time)
+        end = np.searchsorted(self._time, time, side="right")
+        start = self._cursor
+        self._cursor = end
+        for index in range(start, end):
+            event_type = EventType.FAIL if self._failure[index] \
+                else EventType.RESTORE
+            yield Event(event_type, _MODES[self._mode[index]],
+                        self.components[self._component[index]])
+
+
 class GridReliabilityModel:
-    def __init__(self, config_file):
+    def __init__(self, config_file, model_cache=None):
         with open(config_file) as f:
             config = json.load(f)
         self._model_params = config["reliability"]
         seed = self._model_params.get("seed", random.uniform(0, 1000000))
-        if seed is not None:
-            random.seed(seed)
-        dssutil.load_model(config["dss_file"])
-        lines = list(
-            dssutil.iterate_properties(opendssdirect.Lines, ["IsSwitch"])
-        )
+        # every component has its own random stream derived from the seed,
+        # the component name, and the replicate index
+        self._seed = (np.random.SeedSequence().entropy if seed is None
+                      else int(seed))
+        self._replicate = self._model_params.get("replicate", 0)
+        if model_cache is None:
+            model_cache = ModelCache()
+        inventory = model_cache.inventory(config["dss_file"])
         self._lines = {}
-        if self._line_reliability_enabled:
-            self._lines = {
-                f"line.{line}": self._make_line_reliability_model()
-                for line, properties in lines if not properties.IsSwitch
-            }
         self._switches = {}
-        if self._switch_reliability_enabled:
-            self._switches = {
-                f"line.{switch}": self._make_switch_reliability_model(switch)
-                for switch, properties in lines if properties.IsSwitch
-            }
+        self._timeline = None
+        if self._model_params.get("backend", "model") == "timeline":
+            self._timeline = self._make_timeline(inventory)
+        else:
+            if self._line_reliability_enabled:
+                self._lines = {
+                    f"line.{line}": self._make_line_reliability_model(
+                        f"line.{line}"
+                    )
+                    for line in inventory.lines
+                    if line not in inventory.switches
+                }
+            if self._switch_reliability_enabled:
+                self._switches = {
+                    f"line.{switch}": self._make_switch_reliability_model(
+                        switch, Mode(normal_state)
+                    )
+                    for switch, normal_state in inventory.switches.items()
+                }
         self._generators = {}
         if self._generator_reliability_enabled:
             self._generators = {
                 f"generator.{generator}":
                 self._make_generator_reliability_model(
-                    generator
+                    f"generator.{generator}"
                 )
-                for generator in opendssdirect.Generators.AllNames()
+                for generator in inventory.generators
             }
+        self._components = list(self._all_components())
+        self._index = {component: index
+                       for index, (component, _) in enumerate(self._components)}
+        # Min-heap of (next update time, component index). Entries are
+        # invalidated lazily: an entry is only valid if its time matches the
+        # time in `_scheduled` for the component.
+        self._heap = []
+        self._scheduled = [np.inf] * len(self._components)
+        # components that must be checked for events after the next update
+        self._touched = set()
+        # components with failures that have not been activated yet
+        self._pending = set()
+        for index in range(len(self._components)):
+            self._schedule(index)
+        self._time = 0.0
 
     def _model_enabled(self, model):
-        model = self._model_params.get(model, None)
-        if model is None:
-            return False
-        # if a model exists it is enabled by default
-        return model.get("enabled", True)
+        return _model_enabled(self._model_params, model)
 
     @property
     def _line_reliability_enabled(self):
@@ -448,13 +721,23 @@ class GridReliabilityModel:
     def _generator_reliability_enabled(self):
         return self._model_enabled("generator")
 
+    def _component_rngs(self, component, count):
+        """Return `count` independent random number generators for the
+        failure modes of `component`."""
+        return _python_rngs(
+            component_seed(self._seed, component, self._replicate), count
+        )
+
     def _make_generator_reliability_model(self, generator):
         rm = MultiModeReliabilityModel()
-        self._make_generator_aging_model(rm)
-        self._make_generator_wearout_model(rm)
+        # each failure mode has its own stream, so enabling one mode does
+        # not change the failures sampled by the other
+        aging_rng, wearout_rng = self._component_rngs(generator, 2)
+        self._make_generator_aging_model(rm, aging_rng)
+        self._make_generator_wearout_model(rm, wearout_rng)
         return rm
 
-    def _make_generator_wearout_model(self, rm):
+    def _make_generator_wearout_model(self, rm, rng=None):
         if "operating_wear_out" in self._model_params["generator"]:
             wearout_params = self._model_params["generator"][
                 "operating_wear_out"
@@ -465,11 +748,12 @@ class GridReliabilityModel:
                 OperatingWearOut(
                     wearout_params["mtbf"]*3600,
                     wearout_params["min_repair"]*3600,
-                    wearout_params["max_repair"]*3600
+                    wearout_params["max_repair"]*3600,
+                    rng=rng
                 )
             )
 
-    def _make_generator_aging_model(self, rm):
+    def _make_generator_aging_model(self, rm, rng=None):
         if "aging" in self._model_params["generator"]:
             aging_params = self._model_params["generator"]["aging"]
             if not aging_params.get("enabled", True):
@@ -478,25 +762,62 @@ class GridReliabilityModel:
                 AgingFailure(
                     aging_params["mtbf"]*3600,
                     aging_params["min_repair"]*3600,
-                    aging_params["max_repair"]*3600
+                    aging_params["max_repair"]*3600,
+                    rng=rng
                 )
             )
 
-    def _make_line_reliability_model(self):
+    def _make_timeline(self, inventory):
+        """Construct a timeline for the line and switch reliability models"""
+        components, seeds = [], []
+        mtbf, min_repair, max_repair = [], [], []
+        p_open, p_closed, repair_state = [], [], []
+
+        def add(component, params, normal_state, open_, closed):
+            components.append(component)
+            seeds.append(
+                component_seed(self._seed, component, self._replicate)
+            )
+            mtbf.append(params["mtbf"]*3600)
+            min_repair.append(params["min_repair"]*3600)
+            max_repair.append(params["max_repair"]*3600)
+            p_open.append(open_)
+            p_closed.append(closed)
+            repair_state.append(normal_state)
+
+        if self._line_reliability_enabled:
+            for line in inventory.lines:
+                if line not in inventory.switches:
+                    add(f"line.{line}", self._model_params["line"],
+                        Mode.CLOSED, 1.0, 0.0)
+        if self._switch_reliability_enabled:
+            params = self._model_params["switch"]
+            for switch, normal_state in inventory.switches.items():
+                add(f"line.{switch}", params, Mode(normal_state),
+                    params["p_open"], params["p_closed"])
+        return ReliabilityTimeline(
+            components, seeds, mtbf, min_repair, max_repair,
+            p_open=p_open, p_closed=p_closed, repair_state=repair_state
+        )
+
+    def _make_line_reliability_model(self, line):
         """Construct a line reliability model"""
         rm = MultiModeReliabilityModel()
+        rng, = self._component_rngs(line, 1)
         rm.add_failure_mode(
             AgingFailure(
                 self._model_params["line"]["mtbf"]*3600,
                 self._model_params["line"]["min_repair"]*3600,
-                self._model_params["line"]["max_repair"]*3600
+                self._model_params["line"]["max_repair"]*3600,
+                rng=rng
             )
         )
         return rm
 
-    def _make_switch_reliability_model(self, switch):
+    def _make_switch_reliability_model(self, switch, normal_state):
         rm = MultiModeReliabilityModel()
         print(f"making reliability model for switch: {switch}")
+        rng, = self._component_rngs(f"line.{switch}", 1)
         rm.add_failure_mode(
             AgingFailure(
                 self._model_params["switch"]["mtbf"]*3600,
@@ -504,23 +825,79 @@ class GridReliabilityModel:
                 self._model_params["switch"]["max_repair"]*3600,
                 failure_state=lambda: _random_mode(
                     self._model_params["switch"]["p_open"],
-                    self._model_params["switch"]["p_closed"]
+                    self._model_params["switch"]["p_closed"],
+                    rng
                 ),
-                repair_state=_switch_state_normal(switch)
+                repair_state=normal_state,
+                rng=rng
             )
         )
         return rm
 
+    def _schedule(self, index):
+        """Add the next update time of component `index` to the heap."""
+        _, model = self._components[index]
+        next_update = model.next_update()
+        self._scheduled[index] = next_update
+        if next_update < np.inf:
+            heapq.heappush(self._heap, (next_update, index))
+
+    def _discard_stale(self):
+        while self._heap and \
+                self._heap[0][0] != self._scheduled[self._heap[0][1]]:
+            heapq.heappop(self._heap)
+
+    def _pop_due(self, time):
+        """Remove and return the indices of all components with scheduled
+        updates at or before `time`."""
+        due = set()
+        self._discard_stale()
+        while self._heap and self._heap[0][0] <= time:
+            _, index = heapq.heappop(self._heap)
+            due.add(index)
+            self._scheduled[index] = np.inf
+            self._discard_stale()
+        return due
+
     def peek(self):
+        """Return the time of the next reliability update.
+
+        Only the components that have been updated since the last call to
+        :py:meth:`events` are examined directly, all others are read from
+        the event queue.
+        """
         if self._num_models == 0:
             return np.inf
-        return min(
-            model.next_update() for model in self.all_models()
-        )
+        self._discard_stale()
+        next_update = self._heap[0][0] if self._heap else np.inf
+        if self._timeline is not None:
+            next_update = min(next_update, self._timeline.peek())
+        for index in self._touched:
+            _, model = self._components[index]
+            next_update = min(next_update, model.next_update())
+        return next_update
 
     def events(self):
-        for component, model in self._all_components():
+        """Yield the reliability events at the current time.
+
+        Only components that were updated by the most recent call to
+        :py:meth:`update`, or that have failures waiting to be activated,
+        are checked. Events are yielded in the same order as the
+        components are listed by :py:meth:`all_models`, after any events
+        from the pre-sampled line and switch timeline.
+        """
+        if self._timeline is not None:
+            yield from self._timeline.events(self._time)
+        touched = sorted(self._touched | self._pending)
+        self._touched = set()
+        for index in touched:
+            component, model = self._components[index]
             event = model.next_event()
+            if model.has_pending_failure():
+                self._pending.add(index)
+            else:
+                self._pending.discard(index)
+            self._schedule(index)
             if event is not None:
                 yield _make_event(event, f"{component}")
 
@@ -533,7 +910,9 @@ class GridReliabilityModel:
 
     @property
     def _num_models(self):
-        return len(list(self.all_models()))
+        if self._timeline is not None:
+            return len(self._components) + len(self._timeline)
+        return len(self._components)
 
     def all_models(self):
         return itertools.chain(
@@ -541,16 +920,200 @@ class GridReliabilityModel:
         )
 
     def update(self, time, generator_status):
+        """Advance the reliability models to `time`.
+
+        Line and switch models are only updated if they have an update
+        scheduled at or before `time` or a pending failure; the state of
+        all other models does not change until their next update time.
+        Generator models are updated when a status message is received.
+
+        Parameters
+        ----------
+        time : float
+            Current time. [seconds]
+        generator_status : Iterable[GeneratorStatus]
+            Status messages received from the generators since the last
+            update.
+        """
         if self._num_models == 0:
             return
-        for model in itertools.chain(self._lines.values(),
-                                     self._switches.values()):
-            model.update(time)
+        self._time = time
+        due = self._pop_due(time)
+        for index in due | self._pending:
+            component, model = self._components[index]
+            if component not in self._generators:
+                model.update(time)
         for status in generator_status:
-            self._generators[f"generator.{status.name}"].update(
+            component = f"generator.{status.name}"
+            self._generators[component].update(
                 time,
                 operating_time=status.operating_time
             )
+            due.add(self._index[component])
+        self._touched |= due
+
+
+class EventTimeline:
+    """Reliability events computed before a simulation.
+
+    Line and switch failures do not depend on the state of the grid, so
+    their events can be generated before the simulation starts, saved to
+    a file, and replayed by each federate that needs them instead of being
+    sent by a reliability federate.
+
+    Parameters
+    ----------
+    times : Iterable[float]
+        Time of each event. [seconds]
+    events : Iterable[Event]
+        The events, in the order they occur.
+    """
+    def __init__(self, times, events):
+        self.times = np.asarray(times, dtype=float)
+        self._events = list(events)
+        if len(self.times) != len(self._events):
+            raise ValueError("expected one time for each event")
+        self._cursor = 0
+
+    def __len__(self):
+        return len(self._events)
+
+    @classmethod
+    def from_model(cls, model: GridReliabilityModel, hours: float,
+                   time_delta: float = 1.0) -> EventTimeline:
+        """Record the events generated by `model`.
+
+        The model is stepped the way the reliability federate steps it,
+        from time 0 to `hours` with at least `time_delta` seconds between
+        steps. Models that need status messages from generators are never
+        updated, so the model should not include generator reliability.
+
+        Parameters
+        ----------
+        model : GridReliabilityModel
+            The reliability model.
+        hours : float
+            Length of the simulation. [hours]
+        time_delta : float, default 1.0
+            Smallest time between steps. [seconds]
+        """
+        end = hours * 3600
+        times, events = [], []
+        time = 0.0
+        while True:
+            model.update(time, [])
+            for event in model.events():
+                times.append(time)
+                events.append(event)
+            time = max(model.peek(), time + time_delta)
+            if time > end:
+                return cls(times, events)
+
+    @classmethod
+    def load(cls, file) -> EventTimeline:
+        """Load a timeline saved by :py:meth:`save`.
+
+        Parameters
+        ----------
+        file : PathLike
+            Path to the file.
+        """
+        with np.load(file) as data:
+            elements = data["elements"].tolist()
+            events = [
+                Event(EventType.FAIL if failure else EventType.RESTORE,
+                      _MODES[mode], elements[element])
+                for failure, mode, element in zip(
+                    data["failure"].tolist(), data["mode"].tolist(),
+                    data["element"].tolist()
+                )
+            ]
+            return cls(data["time"], events)
+
+    def save(self, file):
+        """Save the timeline to `file` in numpy ``.npz`` format.
+
+        Events are stored as arrays of times, event types, modes, and
+        element indices. Additional event data is not saved.
+
+        Parameters
+        ----------
+        file : PathLike
+            Path to the file.
+        """
+        elements = list(dict.fromkeys(event.element for event in self._events))
+        index = {element: i for i, element in enumerate(elements)}
+        np.savez(
+            file,
+            time=self.times,
+            failure=np.array([event.type is EventType.FAIL
+                              for event in self._events], dtype=bool),
+            mode=np.array([_MODES.index(event.mode)
+                           for event in self._events], dtype=np.int8),
+            element=np.array([index[event.element]
+                              for event in self._events], dtype=np.int32),
+            elements=np.array(elements, dtype=str)
+        )
+
+    def peek(self) -> float:
+        """Return the time of the next event that has not been replayed."""
+        if self._cursor < len(self._events):
+            return self.times[self._cursor]
+        return np.inf
+
+    def events(self, time):
+        """Yield the events at or before `time` that have not been
+        replayed.
+
+        Parameters
+        ----------
+        time : float
+            Current time. [seconds]
+        """
+        while self._cursor < len(self._events) \
+                and self.times[self._cursor] <= time:
+            self._cursor += 1
+            yield self._events[self._cursor - 1]
+
+
+def precompute_enabled(params: Optional[dict]) -> bool:
+    """Return True if the reliability events described by `params` can be
+    computed before the simulation.
+
+    Events can be computed in advance unless generator reliability is
+    enabled (generator wear-out depends on the operating time reported by
+    the grid during the simulation), or ``"precompute"`` is false.
+
+    Parameters
+    ----------
+    params : dict
+        Reliability parameters from the grid configuration.
+    """
+    if params is None:
+        return False
+    return (params.get("precompute", True)
+            and not _model_enabled(params, "generator"))
+
+
+def network_reliability_enabled(params: Optional[dict]) -> bool:
+    """Return True if line or switch reliability is enabled in `params`.
+
+    Parameters
+    ----------
+    params : dict
+        Reliability parameters from the grid configuration.
+    """
+    if params is None:
+        return False
+    return _model_enabled(params, "line") or _model_enabled(params, "switch")
+
+
+def _model_enabled(params, model):
+    model = params.get(model, None)
+    if model is None:
+        return False
+    # if a model exists it is enabled by default
+    return model.get("enabled", True)
 
 
 def _make_event(event, element):
@@ -559,47 +1122,10 @@ def _make_event(event, element):
     return Event(EventType.RESTORE, event.connection, element, event.data)
 
 
-def _random_mode(p_open, p_closed):
-    p = random.uniform(0, 1)
+def _random_mode(p_open, p_closed, rng=random):
+    p = rng.uniform(0, 1)
     if p < p_open:
         return Mode.OPEN
     if p < p_open + p_closed:
         return Mode.CLOSED
     return Mode.CURRENT
-
-
-def _switch_state_normal(name):
-    """Return the "normal" state of the switch.
-
-    If the switch is controlled by a SwtControl object, this is the NormalState
-    value of the controller, otherwise the current state of the switch is
-    returned.
-
-    Parameters
-    ----------
-    name : str
-        Name of the switch.
-
-    Returns
-    -------
-    Mode
-        Returns Mode.OPEN if the normal state is open, or Mode.CLOSED if it
-        is closed.
-    """
-    opendssdirect.Lines.Name(name)
-    if opendssdirect.CktElement.HasSwitchControl():
-        for c in opendssdirect.CktElement.NumControls():
-            controller_type, controller_name = \
-                opendssdirect.CktElement.Controller(c).split('.')
-            if controller_type == "SwtControl":
-                opendssdirect.SwtControls.Name(controller_name)
-                normal_state = opendssdirect.SwtControls.NormalState()
-                if normal_state == 1:
-                    return Mode.OPEN
-                return Mode.CLOSED
-    # No switch control. If either terminal is open return OPEN, otherwise
-    # return CLOSED
-    if opendssdirect.CktElement.IsOpen(1, 1) \
-            or opendssdirect.CktElement.IsOpen(2, 1):
-        return Mode.OPEN
-    return Mode.CLOSED
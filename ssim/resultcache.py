@@ -0,0 +1,121 @@
+"""Cache of simulation results.
+
+Simulating a configuration is expensive, and iterative studies evaluate
+many configurations that were already simulated in an earlier version of
+the project. The :py:class:`ResultCache` stores the output files of each
+simulation keyed by a hash of everything that affects the output (see
+:py:meth:`ssim.ui.core.Configuration.cache_key`), so that an identical
+configuration can reuse the stored results instead of being simulated
+again.
+
+Results are copied into and out of the cache, since the federates rewrite
+their output files in place when a result directory is reused.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from os import PathLike
+from pathlib import Path
+from typing import Iterable, Optional
+
+#: Environment variable that sets the default cache directory.
+CACHE_DIR_ENV = "SSIM_RESULT_CACHE"
+
+
+class ResultCache:
+    """On-disk cache of simulation results.
+
+    Parameters
+    ----------
+    cache_dir : PathLike, optional
+        Directory where cached results are stored. If not specified the
+        directory named by the ``SSIM_RESULT_CACHE`` environment variable
+        is used, or "ssim-result-cache" in the system temporary directory
+        if the variable is not set.
+    """
+
+    def __init__(self, cache_dir: Optional[PathLike] = None):
+        if cache_dir is None:
+            cache_dir = os.environ.get(
+                CACHE_DIR_ENV,
+                Path(tempfile.gettempdir()) / "ssim-result-cache"
+            )
+        self.cache_dir = Path(cache_dir)
+
+    def contains(self, key: str) -> bool:
+        """Return True if results are cached for `key`."""
+        return (self.cache_dir / key).is_dir()
+
+    def store(self, key: str, result_dir: PathLike,
+              exclude: Iterable[str] = ()):
+        """Add the results in `result_dir` to the cache.
+
+        The results are added atomically, so concurrent readers never see
+        a partially stored result. If results are already cached for `key`
+        the cache is not changed.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        result_dir : PathLike
+            Directory containing the results.
+        exclude : Iterable[str], optional
+            Names of files and directories in `result_dir` that are not
+            results (for example configuration files) and are not stored.
+        """
+        if self.contains(key):
+            return
+        result_dir = Path(result_dir)
+        exclude = set(exclude)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=self.cache_dir, suffix=".tmp"))
+        try:
+            for item in result_dir.iterdir():
+                if item.name in exclude:
+                    continue
+                if item.is_dir():
+                    shutil.copytree(item, tmp / item.name)
+                else:
+                    shutil.copy2(item, tmp / item.name)
+            os.rename(tmp, self.cache_dir / key)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            # another process stored the same results first
+            if not self.contains(key):
+                raise
+
+    def restore(self, key: str, result_dir: PathLike) -> bool:
+        """Copy the cached results for `key` into `result_dir`.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        result_dir : PathLike
+            Directory where the results are restored. Existing files with
+            the same names as the cached results are replaced.
+
+        Returns
+        -------
+        bool
+            True if the results were found in the cache and restored.
+        """
+        cached = self.cache_dir / key
+        if not cached.is_dir():
+            return False
+        result_dir = Path(result_dir)
+        result_dir.mkdir(parents=True, exist_ok=True)
+        for item in cached.iterdir():
+            target = result_dir / item.name
+            if target.is_dir():
+                shutil.rmtree(target)
+            elif target.exists():
+                target.unlink()
+            if item.is_dir():
+                shutil.copytree(item, target)
+            else:
+                shutil.copy2(item, target)
+        return True
@@ -0,0 +1,166 @@
+"""Columnar storage of simulation results.
+
+The federates save their results as CSV files, which must be parsed in
+full every time they are read even if only a few columns are needed. A
+:py:class:`ColumnStore` converts each CSV file once to one ``.npy`` file
+per column, described by a manifest, so that individual columns can be
+loaded (memory-mapped where possible) without reading the rest of the
+table. A table is converted again if its CSV file changes.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from os import PathLike
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+#: Name of the manifest file in a column store.
+MANIFEST = "manifest.json"
+
+#: Format version of the manifest. Tables converted with a different
+#: version are converted again.
+_FORMAT_VERSION = 1
+
+
+def _source_stamp(source: Path) -> dict:
+    stat = source.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class Table:
+    """A table in a :py:class:`ColumnStore`.
+
+    Parameters
+    ----------
+    directory : PathLike
+        Directory containing the column files.
+    entry : dict
+        The manifest entry describing the table.
+    """
+
+    def __init__(self, directory: PathLike, entry: dict):
+        self._directory = Path(directory)
+        self._entry = entry
+        self._columns = {column["name"]: column
+                         for column in entry["columns"]}
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the columns, in the order of the CSV file."""
+        return [column["name"] for column in self._entry["columns"]]
+
+    def __len__(self):
+        return self._entry["rows"]
+
+    def column(self, name: str) -> np.ndarray:
+        """Return the values in column `name`.
+
+        Numeric columns are memory-mapped. Missing values in text columns
+        are returned as NaN, as :py:func:`pandas.read_csv` does.
+        """
+        column = self._columns[name]
+        path = self._directory / column["file"]
+        if column["kind"] == "str":
+            values = np.load(path).astype(object)
+            values[np.load(self._directory / column["missing"])] = np.nan
+            return values
+        return np.load(path, mmap_mode="r")
+
+    def read(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Return the table as a data frame.
+
+        Parameters
+        ----------
+        columns : Iterable[str], optional
+            Names of the columns to load. If not specified all columns are
+            loaded.
+        """
+        if columns is None:
+            columns = self.columns
+        return pd.DataFrame({name: self.column(name) for name in columns},
+                            columns=list(columns))
+
+
+class ColumnStore:
+    """Columnar copies of the CSV files in a results directory.
+
+    Parameters
+    ----------
+    directory : PathLike
+        Directory where the column files and manifest are stored.
+    """
+
+    def __init__(self, directory: PathLike):
+        self.directory = Path(directory)
+
+    def _manifest(self) -> dict:
+        try:
+            with open(self.directory / MANIFEST) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {"version": _FORMAT_VERSION, "tables": {}}
+        if manifest.get("version") != _FORMAT_VERSION:
+            return {"version": _FORMAT_VERSION, "tables": {}}
+        return manifest
+
+    def table(self, source: PathLike) -> Table:
+        """Return the table stored from the CSV file `source`.
+
+        The file is converted the first time it is requested, and again
+        whenever it changes.
+
+        Parameters
+        ----------
+        source : PathLike
+            Path to the CSV file.
+        """
+        source = Path(source)
+        manifest = self._manifest()
+        entry = manifest["tables"].get(source.name)
+        if entry is None or entry["source"] != _source_stamp(source):
+            entry = self._convert(source)
+        return Table(self.directory / entry["directory"], entry)
+
+    def _convert(self, source: Path) -> dict:
+        stamp = _source_stamp(source)
+        data = pd.read_csv(source)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        table_dir = Path(tempfile.mkdtemp(dir=self.directory,
+                                          prefix=f"{source.stem}-"))
+        columns = []
+        for index, name in enumerate(data.columns):
+            values = data[name]
+            column = {"name": name, "file": f"{index}.npy"}
+            if not pd.api.types.is_numeric_dtype(values.dtype):
+                missing = values.isna().to_numpy()
+                np.save(table_dir / column["file"],
+                        np.array(values.fillna("").astype(str).tolist(),
+                                 dtype=str))
+                column["kind"] = "str"
+                column["missing"] = f"{index}.missing.npy"
+                np.save(table_dir / column["missing"], missing)
+            else:
+                column["kind"] = "numeric"
+                np.save(table_dir / column["file"], values.to_numpy())
+            columns.append(column)
+        entry = {"source": stamp, "directory": table_dir.name,
+                 "rows": len(data), "columns": columns}
+        # Re-read the manifest so tables converted by another reader in the
+        # meantime are kept, then replace it atomically.
+        manifest = self._manifest()
+        previous = manifest["tables"].get(source.name)
+        manifest["tables"][source.name] = entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self.directory / MANIFEST)
+        if previous is not None:
+            shutil.rmtree(self.directory / previous["directory"],
+                          ignore_errors=True)
+        return entry
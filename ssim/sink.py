@@ -0,0 +1,224 @@
+"""Streaming storage for tabular simulation output.
+
+Recorders and loggers append one row per sample to a sink. The sink keeps
+a bounded number of rows in memory and periodically appends them to a
+spill file on disk, so memory use does not grow with the length of the
+simulation and data recorded before a crash is not lost. The spill file
+is read back one chunk at a time to produce the final output files.
+"""
+import os
+import pickle
+import tempfile
+import time
+import weakref
+import zipfile
+from os import PathLike
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+
+class RowSink:
+    """Append-only sequence of rows with bounded memory use.
+
+    Rows are buffered in memory until `buffer_size` rows have accumulated
+    or `flush_interval` seconds have passed since the last flush. The
+    buffered rows are then appended to the spill file as a single chunk.
+
+    Parameters
+    ----------
+    path : PathLike, optional
+        Path to the spill file. If the file exists it is truncated. If not
+        specified a temporary file is created the first time rows are
+        flushed, and deleted when the sink is closed or garbage collected.
+    buffer_size : int, default 1024
+        Maximum number of rows held in memory.
+    flush_interval : float, default 60.0
+        Maximum time between flushes. [seconds]
+    """
+
+    def __init__(self, path: Optional[PathLike] = None,
+                 buffer_size: int = 1024, flush_interval: float = 60.0):
+        self.path = None
+        self._finalizer = None
+        if path is not None:
+            self.path = Path(path)
+            self.path.write_bytes(b"")
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._num_flushed = 0
+        self._num_buffered = 0
+        self._buffer = self._new_buffer()
+
+    def __len__(self):
+        return self._num_flushed + self._num_buffered
+
+    def _new_buffer(self):
+        return []
+
+    def _store(self, row):
+        self._buffer.append(row)
+
+    def _pending(self):
+        """Return the rows that have not been flushed as a single chunk."""
+        return self._buffer
+
+    def _clear(self):
+        self._buffer = self._new_buffer()
+
+    def append(self, row: Any):
+        """Append a row to the sink.
+
+        Parameters
+        ----------
+        row : Any
+            The row.
+        """
+        self._store(row)
+        self._num_buffered += 1
+        if (self._num_buffered >= self._buffer_size
+                or time.monotonic() - self._last_flush
+                >= self._flush_interval):
+            self.flush()
+
+    def _spill_file(self) -> Path:
+        """Return the path to the spill file, creating a temporary file if
+        no path was given."""
+        if self.path is None:
+            fd, path = tempfile.mkstemp(suffix=".sink")
+            os.close(fd)
+            self.path = Path(path)
+            self._finalizer = weakref.finalize(
+                self, self.path.unlink, missing_ok=True
+            )
+        return self.path
+
+    def flush(self):
+        """Append all buffered rows to the spill file."""
+        if self._num_buffered > 0:
+            with open(self._spill_file(), "ab") as f:
+                pickle.dump(self._pending(), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            self._num_flushed += self._num_buffered
+            self._num_buffered = 0
+            self._clear()
+        self._last_flush = time.monotonic()
+
+    def chunks(self) -> Iterator:
+        """Iterate over the recorded rows one chunk at a time.
+
+        Chunks are read from the spill file in the order they were
+        written, followed by any rows that have not been flushed yet.
+        """
+        if self.path is not None:
+            with open(self.path, "rb") as f:
+                while True:
+                    try:
+                        yield pickle.load(f)
+                    except EOFError:
+                        break
+        if self._num_buffered > 0:
+            yield self._pending()
+
+    def rows(self) -> Iterator:
+        """Iterate over all recorded rows."""
+        for chunk in self.chunks():
+            yield from chunk
+
+    def close(self):
+        """Discard all data and delete the spill file."""
+        self._clear()
+        self._num_buffered = 0
+        self._num_flushed = 0
+        if self._finalizer is not None:
+            self._finalizer()
+        elif self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+class ArraySink(RowSink):
+    """Sink for rows of numbers with a fixed number of columns.
+
+    Rows are buffered in a preallocated numpy array and each chunk is a
+    two dimensional array with `width` columns.
+
+    Parameters
+    ----------
+    width : int
+        Number of columns.
+    dtype : numpy.dtype, default float
+        Type of the values stored in the sink.
+    path : PathLike, optional
+        Path to the spill file. If not specified a temporary file is
+        created when rows are first flushed.
+    buffer_size : int, default 256
+        Maximum number of rows held in memory.
+    flush_interval : float, default 60.0
+        Maximum time between flushes. [seconds]
+    """
+
+    def __init__(self, width: int, dtype=float,
+                 path: Optional[PathLike] = None, buffer_size: int = 256,
+                 flush_interval: float = 60.0):
+        self.width = width
+        self.dtype = np.dtype(dtype)
+        super().__init__(path, buffer_size, flush_interval)
+
+    def _new_buffer(self):
+        return np.empty((self._buffer_size, self.width), dtype=self.dtype)
+
+    def _store(self, row):
+        self._buffer[self._num_buffered] = row
+
+    def _pending(self):
+        return self._buffer[:self._num_buffered]
+
+    def _clear(self):
+        # The buffer is reused after it has been written to the spill file.
+        pass
+
+    def to_array(self) -> np.ndarray:
+        """Return all rows as a single two dimensional array."""
+        chunks = list(self.chunks())
+        if len(chunks) == 0:
+            return np.empty((0, self.width), dtype=self.dtype)
+        return np.concatenate(chunks)
+
+
+#: An array, or a tuple ``(dtype, shape, chunks)`` describing an array
+#: that is formed by concatenating `chunks` along its first axis.
+ArrayChunks = Union[np.ndarray, Tuple[Any, Tuple[int, ...], Iterable]]
+
+
+def save_npz(output_file: PathLike, arrays: Dict[str, ArrayChunks]):
+    """Save arrays to a compressed numpy archive one chunk at a time.
+
+    The file can be read with :py:func:`numpy.load`. Only one chunk of each
+    array is held in memory at a time.
+
+    Parameters
+    ----------
+    output_file : PathLike
+        Path to the output file.
+    arrays : dict
+        Map from array name to the array or its chunks.
+    """
+    with zipfile.ZipFile(output_file, "w",
+                         compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, array in arrays.items():
+            if isinstance(array, np.ndarray):
+                dtype, shape, chunks = array.dtype, array.shape, (array,)
+            else:
+                dtype, shape, chunks = array
+            dtype = np.dtype(dtype)
+            with archive.open(f"{name}.npy", "w", force_zip64=True) as f:
+                np.lib.format.write_array_header_1_0(
+                    f,
+                    {"descr": np.lib.format.dtype_to_descr(dtype),
+                     "fortran_order": False,
+                     "shape": tuple(shape)}
+                )
+                for chunk in chunks:
+                    f.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
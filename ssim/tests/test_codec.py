@@ -0,0 +1,80 @@
+"""Tests for ssim.codec"""
+import json
+
+import pytest
+from ssim import grid
+from ssim.codec import MessageCodec
+from ssim.reliability import Event, EventType, Mode
+
+_MESSAGES = [
+    grid.StorageStatus("s1", 0.5),
+    grid.PVStatus("pv1", 10.0, -1.5),
+    grid.GeneratorStatus("gen1", 100.0, 20.0, 3.5, True),
+    grid.LoadStatus("load1", 12.0, 4.0),
+    grid.LoadStatusBatch(["load1", "load2"], [1.0, 2.0], [0.5, 0.25]),
+    grid.LoadStatusBatch([], [], []),
+    grid.BusVoltageStatus("bus1", 1.02, 3600.0),
+    grid.BusVoltageBatch([1.02, 0.98, 1.0], 3600.0),
+    Event(EventType.FAIL, Mode.OPEN, "line.l1", {"terminal": 2}),
+    Event(EventType.RESTORE, Mode.CLOSED, "generator.gen1"),
+]
+
+
+@pytest.fixture(params=[False, True], ids=["json", "binary"])
+def codec(request):
+    return MessageCodec(["s1", "pv1", "bus1"], binary=request.param)
+
+
+@pytest.mark.parametrize("message", _MESSAGES)
+def test_MessageCodec_round_trip(codec, message):
+    encoded = codec.encode(message)
+    assert codec.decode(encoded) == message
+    if isinstance(encoded, str):
+        assert codec.decode(encoded.encode()) == message
+
+
+@pytest.mark.parametrize("message", _MESSAGES)
+def test_MessageCodec_decode_json(message):
+    # every codec decodes JSON messages
+    codec = MessageCodec(binary=True)
+    assert codec.decode(message.to_json()) == message
+
+
+def test_MessageCodec_binary_names():
+    codec = MessageCodec(["bus1"], binary=True)
+    indexed = codec.encode(grid.BusVoltageStatus("bus1", 1.0, 0.0))
+    inline = codec.encode(grid.BusVoltageStatus("bus2", 1.0, 0.0))
+    assert len(indexed) < len(inline)
+    assert len(indexed) < len(
+        grid.BusVoltageStatus("bus1", 1.0, 0.0).to_json()
+    )
+    # decoding requires the same name table
+    assert MessageCodec(["bus0", "bus1"]).decode(indexed).name == "bus0"
+    assert MessageCodec().decode(inline).name == "bus2"
+
+
+def test_MessageCodec_invalid():
+    codec = MessageCodec(binary=True)
+    with pytest.raises(TypeError):
+        codec.encode("not a message")
+    with pytest.raises(ValueError):
+        codec.decode(b"\x7f")
+
+
+def test_MessageCodec_from_grid_spec(tmp_path):
+    config = {"dss_file": "circuit.dss",
+              "storage": [], "pvsystem": [], "invcontrol": [],
+              "busses_to_measure": [{"name": "bus1"}]}
+    path = tmp_path / "grid.json"
+    path.write_text(json.dumps(config))
+    codec = MessageCodec.from_grid_spec(grid.GridSpecification.from_json(path))
+    assert not codec.binary
+    assert codec.names == ["bus1"]
+    config["message_codec"] = "binary"
+    path.write_text(json.dumps(config))
+    codec = MessageCodec.from_grid_spec(grid.GridSpecification.from_json(path))
+    assert codec.binary
+    config["message_codec"] = "xml"
+    path.write_text(json.dumps(config))
+    with pytest.raises(ValueError):
+        grid.GridSpecification.from_json(path)
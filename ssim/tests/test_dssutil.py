@@ -19,6 +19,29 @@ def simple_circuit():
     dssutil.run_command("clear")
 
 
+def test_batch(simple_circuit):
+    with dssutil.batch():
+        assert "" == dssutil.run_command(
+            "new load.load2", {"bus1": "lb2", "kw": 1.0, "kv": 0.240})
+        with dssutil.batch():
+            dssutil.run_command(
+                "new load.load3", {"bus1": "lb2", "kw": 1.0, "kv": 0.240})
+        assert set(dssdirect.Loads.AllNames()) == {"load1"}
+    assert set(dssdirect.Loads.AllNames()) == {"load1", "load2", "load3"}
+
+
+def test_batch_error(simple_circuit):
+    with pytest.raises(dssutil.OpenDSSError, match="^load.bad_load: "):
+        with dssutil.batch():
+            dssutil.run_command("new load.load2 bus1=lb2 kw=1.0 kv=0.240")
+            dssutil.run_command("new load.bad_load bus1=lb2 kw=x kv=0.240")
+            dssutil.run_command("new load.load3 bus1=lb2 kw=1.0 kv=0.240")
+    assert "load3" not in dssdirect.Loads.AllNames()
+    # commands are not deferred after the batch exits
+    dssutil.run_command("new load.load4 bus1=lb2 kw=1.0 kv=0.240")
+    assert "load4" in dssdirect.Loads.AllNames()
+
+
 def test_missing_file():
     with pytest.raises(dssutil.OpenDSSError):
         dssutil.load_model("missing_file.dss")
@@ -1,8 +1,11 @@
 """Tests for EMS components."""
+import random
 from pathlib import Path
 
+import networkx as nx
 import pytest
 from ssim import ems, grid, reliability
+from ssim.modelcache import ModelCache
 
 
 @pytest.fixture
@@ -26,6 +29,20 @@ def all_busses():
     }
 
 
+def test_GridModel_from_cached_inventory(grid_model_path, tmp_path):
+    gridspec = grid.GridSpecification(grid_model_path)
+    gridspec.add_storage(
+        grid.StorageSpecification("S1", "LoadBus3.1.2.3", 100, 100, "droop")
+    )
+    model_cache = ModelCache(tmp_path)
+    for _ in range(2):
+        grid_model = ems.GridModel(gridspec, model_cache)
+        assert grid_model.num_components == 1
+        assert grid_model.node("storage.s1") == "loadbus3"
+        assert grid_model.node("load.load1") == "loadbus1"
+        assert grid_model.node("generator.gen1") == "regbus"
+
+
 def test_node_to_bus_mapping(grid_model):
     expected_nodes = {
         'subbus', 'regbus', 'sourcebus',
@@ -188,3 +205,37 @@ def test_generator_control_to_from_json(action):
     else:
         assert message2.kw == None
         assert message2.kvar == None
+
+
+def _expected_components(grid_model):
+    return sorted(map(sorted, nx.connected_components(grid_model._network)))
+
+
+def test_incremental_components(grid_model_path, tmp_path):
+    grid_model = ems.GridModel(grid.GridSpecification(grid_model_path),
+                               ModelCache(tmp_path))
+    edges = sorted(grid_model._edges)
+    rng = random.Random(1)
+    disabled = set()
+    version = grid_model.topology_version
+    for _ in range(200):
+        edge = rng.choice(edges)
+        if edge in disabled:
+            grid_model.enable_edge(edge)
+            disabled.remove(edge)
+        else:
+            grid_model.disable_edge(edge)
+            disabled.add(edge)
+        assert grid_model.topology_version > version
+        version = grid_model.topology_version
+        assert sorted(map(sorted, grid_model.components())) == \
+            _expected_components(grid_model)
+        assert grid_model.num_components == \
+            len(_expected_components(grid_model))
+        for element in ("load.load1", "generator.gen1", "load.load2"):
+            assert grid_model.component_from_element(element) == \
+                nx.node_connected_component(grid_model._network,
+                                            grid_model.node(element))
+    assert (grid_model.component_id("load.load1")
+            == grid_model.component_id("load.load2")) == \
+        nx.has_path(grid_model._network, "loadbus1", "loadbus2")
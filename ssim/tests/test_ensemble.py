@@ -0,0 +1,101 @@
+"""Tests for ssim.ui.ensemble"""
+import numpy as np
+import pytest
+import tomli
+
+from ssim.grid import StorageSpecification
+from ssim.ui.core import Configuration, Project
+from ssim.ui.ensemble import (
+    ReliabilityEnsemble,
+    confidence_interval,
+    outage_statistics
+)
+
+
+def test_confidence_interval():
+    mean, half_width = confidence_interval([1.0, 2.0, 3.0, np.nan])
+    assert mean == 2.0
+    # t(0.975, 2) * 1 / sqrt(3)
+    assert half_width == pytest.approx(4.302653 / np.sqrt(3))
+    assert confidence_interval([1.0]) == (1.0, np.inf)
+
+
+def test_outage_statistics(tmp_path):
+    assert outage_statistics(tmp_path, 24) == \
+        {"failures": None, "outage_hours": None}
+    (tmp_path / "event_log.csv").write_text(
+        "time,type,element,connection\n"
+        "3600.0,fail,line.l1,open\n"
+        "7200.0,fail,line.sw,closed\n"
+        "10800.0,restore,line.l1,closed\n"
+        "14400.0,restore,line.sw,open\n"
+        "72000.0,fail,line.l1,open\n"
+    )
+    assert outage_statistics(tmp_path, 24) == \
+        {"failures": 3, "outage_hours": 6.0}
+
+
+_LINE = {"mtbf": 10, "min_repair": 1, "max_repair": 2}
+
+
+def _configuration(grid):
+    storage = StorageSpecification("s1", "loadbus1", 100.0, 50.0, "droop")
+    return Configuration(str(grid), {}, [], [storage], [],
+                         reliability={"seed": 1, "line": _LINE},
+                         sim_duration=24)
+
+
+def test_Configuration_replicate(grid_model_path):
+    config = _configuration(grid_model_path)
+    first = config.replicate(0)
+    second = config.replicate(1, seed=7)
+    assert len({config.id, first.id, second.id}) == 3
+    assert first.reliability["seed"] == 1
+    assert first.reliability["replicate"] == 0
+    assert second.reliability["seed"] == 7
+    assert second.reliability["replicate"] == 1
+    assert first.reliability["line"] == _LINE
+    assert "replicate" not in config.reliability
+
+
+def _fake_run_local(self):
+    value = np.random.default_rng(
+        [self.reliability["seed"], self.reliability["replicate"]]
+    ).normal(10, 1)
+    (self._workdir / "metric_log.csv").write_text(
+        f"time,bus1\n0.0,0.0\n{value}\n")
+    (self._workdir / "event_log.csv").write_text(
+        "time,type,element,connection\n0.0,fail,line.l1,open\n")
+
+
+@pytest.mark.parametrize("tolerance,expected", [(0.5, 4), (0.0, 12)])
+def test_ReliabilityEnsemble_run(monkeypatch, tmp_path, grid_model_path,
+                                 tolerance, expected):
+    monkeypatch.setattr(Configuration, "_run_local", _fake_run_local)
+    ensemble = ReliabilityEnsemble(
+        _configuration(grid_model_path), tmp_path, seed=3,
+        tolerance=tolerance, min_replicates=4, max_replicates=12,
+        batch_size=4, max_workers=2, local=True
+    )
+    result = ensemble.run()
+    assert len(result.replicates) == expected
+    assert result.converged == (tolerance > 0)
+    assert result.replicates["replicate"].tolist() == list(range(expected))
+    assert result.replicates["outage_hours"].tolist() == [24.0] * expected
+    interval = result.intervals.loc["accumulated_metric"]
+    assert interval["samples"] == expected
+    assert interval["lower"] < interval["mean"] < interval["upper"]
+    assert interval["mean"] == \
+        pytest.approx(result.replicates["accumulated_metric"].mean())
+
+
+def test_Project_reliability_seed():
+    project = Project("study")
+    project.reliability_params = {"line": {"enabled": False}}
+    seed = project.reliability_seed
+    assert seed == Project("study").reliability_seed
+    assert seed != Project("other").reliability_seed
+    project.reliability_params = {"seed": 12, "line": {"enabled": False}}
+    assert project.reliability_seed == 12
+    assert tomli.loads(project._reliability_to_toml())["reliability"] == \
+        project.reliability_params
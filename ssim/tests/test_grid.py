@@ -47,3 +47,21 @@ def test_PVStatus_from_json():
 def test_PVStatus_to_json():
     status = grid.PVStatus("foo", 1.1, 1.2)
     assert grid.StatusMessage.from_json(status.to_json()) == status
+
+
+def test_LoadStatusBatch_to_json():
+    status = grid.LoadStatusBatch(["foo", "bar"], [1.1, 2.1], [1.2, 2.2])
+    assert grid.StatusMessage.from_json(status.to_json()) == status
+    assert list(status.loads()) == [grid.LoadStatus("foo", 1.1, 1.2),
+                                    grid.LoadStatus("bar", 2.1, 2.2)]
+
+
+def test_BusVoltageBatch_to_json():
+    status = grid.BusVoltageBatch([1.0, 0.95], 300.0)
+    assert grid.StatusMessage.from_json(status.to_json()) == status
+
+
+def test_GridSpecification_measured_busses():
+    spec = grid.GridSpecification()
+    spec.busses_to_measure = [{"name": "b2"}, {"name": "b1"}, {"name": "b2"}]
+    assert spec.measured_busses == ["b2", "b1"]
@@ -0,0 +1,39 @@
+"""Tests for the grid federate."""
+import json
+import uuid
+from types import SimpleNamespace
+
+import helics
+import pytest
+from ssim.codec import MessageCodec
+from ssim.federates.opendss import GeneratorInterface
+from ssim.grid import GeneratorStatus
+
+
+@pytest.mark.parametrize("reliability", [False, True])
+def test_GeneratorInterface_publish(reliability):
+    broker_name = f"broker-{uuid.uuid4().hex}"
+    broker = helics.helicsCreateBroker("inproc", broker_name, "-f 1")
+    federate = helics.helicsCreateCombinationFederateFromConfig(json.dumps(
+        {"name": "grid", "core_type": "inproc",
+         "core_name": f"core-{broker_name}", "broker": broker_name}
+    ))
+    try:
+        federate.register_endpoint("reliability")
+        ems = federate.register_global_endpoint("ems/control")
+        reliability_federate = federate.register_global_endpoint(
+            "reliability/reliability")
+        status = GeneratorStatus("gen1", 10.0, 1.0, 2.0, True)
+        generator = GeneratorInterface(
+            federate, SimpleNamespace(name="gen1", status=status)
+        )
+        federate.enter_executing_mode()
+        federate.request_time(1.0)
+        generator.publish(reliability=reliability)
+        federate.request_time(2.0)
+        assert ems.has_message()
+        assert MessageCodec().decode(ems.get_message().raw_data) == status
+        assert reliability_federate.has_message() == reliability
+    finally:
+        federate.disconnect()
+        broker.wait_for_disconnect()
@@ -0,0 +1,99 @@
+"""Tests for ssim.loadshape"""
+import numpy as np
+import opendssdirect as dssdirect
+import pytest
+from ssim import dssutil
+from ssim.loadshape import LoadShapeCache, binary_npts, csv_to_binary
+from ssim.opendss import DSSModel
+
+
+@pytest.fixture
+def loadshape_cache(tmp_path):
+    return LoadShapeCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def hourly_profile(tmp_path):
+    path = tmp_path / "profile.csv"
+    path.write_text("0.0,0.1\n0.5,0.5\n1.5,0.9\n")
+    return path
+
+
+@pytest.mark.parametrize("suffix, dtype", [(".sng", np.float32),
+                                           (".dbl", np.float64)])
+def test_csv_to_binary(tmp_path, hourly_profile, suffix, dtype):
+    output = tmp_path / f"profile{suffix}"
+    csv_to_binary(hourly_profile, output, 0)
+    np.testing.assert_array_equal(
+        np.fromfile(output, dtype=dtype),
+        np.array([0.0, 0.1, 0.5, 0.5, 1.5, 0.9], dtype=dtype)
+    )
+    assert binary_npts(output, 0) == 3
+    csv_to_binary(hourly_profile, output, 1)
+    np.testing.assert_array_equal(
+        np.fromfile(output, dtype=dtype),
+        np.array([0.0, 0.5, 1.5], dtype=dtype)
+    )
+    assert binary_npts(output, 1) == 3
+
+
+def test_csv_to_binary_missing_multiplier(tmp_path, irradiance_path,
+                                          irradiance_data):
+    # OpenDSS treats a missing multiplier as 0
+    output = tmp_path / "irradiance.dbl"
+    csv_to_binary(irradiance_path, output, 0)
+    values = np.fromfile(output).reshape(-1, 2)
+    np.testing.assert_array_equal(values[:, 0], irradiance_data)
+    np.testing.assert_array_equal(values[:, 1], 0.0)
+
+
+def test_LoadShapeCache_binary(loadshape_cache, hourly_profile, tmp_path):
+    profile = loadshape_cache.binary(hourly_profile)
+    assert profile.npts == 3
+    assert profile.interval == 0
+    assert profile.file.parent == loadshape_cache.cache_dir
+    # a copy with the same content is found in the cache
+    copy = tmp_path / "copy.csv"
+    copy.write_text(hourly_profile.read_text())
+    assert loadshape_cache.binary(copy) == profile
+    assert loadshape_cache.binary(hourly_profile, 1).file != profile.file
+    copy.write_text("0.0,0.2\n")
+    assert loadshape_cache.binary(copy).npts == 1
+
+
+def test_LoadShapeCache_precision(tmp_path):
+    # one second steps at the end of the year are not distinct in single
+    # precision
+    hours = 8759.0 + np.arange(10) / 3600
+    profile = tmp_path / "seconds.csv"
+    profile.write_text("".join(f"{float(hour)!r},0.5\n" for hour in hours))
+    cache = LoadShapeCache(tmp_path / "cache", precision="sng")
+    binary = cache.binary(profile)
+    assert binary.file.suffix == ".dbl"
+    values = np.fromfile(binary.file).reshape(-1, 2)
+    np.testing.assert_array_equal(values[:, 0], hours)
+    assert cache.binary(profile, 1 / 3600).file.suffix == ".sng"
+    assert LoadShapeCache(tmp_path).precision == "dbl"
+
+
+def test_LoadShapeCache_invalid_precision(tmp_path):
+    with pytest.raises(ValueError):
+        LoadShapeCache(tmp_path, precision="float")
+
+
+def test_add_binary_loadshape(loadshape_cache, hourly_profile,
+                              grid_model_path):
+    dssutil.load_model(grid_model_path)
+    profile = loadshape_cache.binary(hourly_profile)
+    DSSModel.add_loadshape("binary", profile.file,
+                           profile.interval, profile.npts)
+    DSSModel.add_loadshape("text", hourly_profile, 0, 3)
+    dssdirect.LoadShape.Name("binary")
+    binary_mult = dssdirect.LoadShape.PMult()
+    binary_hours = dssdirect.LoadShape.TimeArray()
+    dssdirect.LoadShape.Name("text")
+    np.testing.assert_allclose(binary_mult, dssdirect.LoadShape.PMult(),
+                               rtol=1e-6)
+    np.testing.assert_allclose(binary_hours,
+                               dssdirect.LoadShape.TimeArray(), rtol=1e-6)
+    dssutil.run_command("clear")
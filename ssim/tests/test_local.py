@@ -0,0 +1,241 @@
+"""Tests for ssim.federates.local"""
+import json
+import os
+import uuid
+
+import helics
+import pytest
+from ssim.federates.local import MAX_TIME, FederationError, LocalFederation
+from ssim.ui.core import Configuration
+
+
+@pytest.fixture
+def federation():
+    return LocalFederation()
+
+
+def _producer(federate, times, log):
+    federate.enter_executing_mode()
+    publication = federate.publications["producer/value"]
+    endpoint = federate.get_endpoint_by_name("out")
+    for time in times:
+        granted = federate.request_time(time)
+        log.append(("producer", granted))
+        publication.publish(granted * 10)
+        endpoint.send_data(f"message at {granted}", "consumer/in")
+        endpoint.send_data("dropped", "nobody/in")
+    federate.disconnect()
+
+
+def _consumer(federate, log):
+    federate.enter_executing_mode()
+    subscription = federate.subscriptions["producer/value"]
+    endpoint = federate.get_endpoint_by_name("consumer/in")
+    granted = 0.0
+    while granted < MAX_TIME:
+        granted = federate.request_time(MAX_TIME)
+        messages = []
+        while endpoint.has_message():
+            messages.append(endpoint.get_message().data)
+        log.append(("consumer", granted, subscription.is_updated(),
+                    subscription.double, messages))
+    federate.disconnect()
+
+
+def _add_producer(federation, log, times=(1.0, 2.0, 5.0), **config):
+    producer = federation.create_federate(
+        {"name": "producer",
+         "publications": [{"key": "value", "type": "double"}],
+         "endpoints": [{"name": "out"}],
+         **config}
+    )
+    federation.add(producer, lambda: _producer(producer, times, log))
+    return producer
+
+
+def _add_consumer(federation, log, **config):
+    consumer = federation.create_federate(
+        {"name": "consumer",
+         "subscriptions": [{"key": "producer/value", "default": -1.0}],
+         "endpoints": [{"name": "in"}],
+         **config}
+    )
+    federation.add(consumer, lambda: _consumer(consumer, log))
+    return consumer
+
+
+def test_LocalFederation(federation):
+    log = []
+    _add_consumer(federation, log)
+    _add_producer(federation, log)
+    federation.run()
+    assert log == [
+        ("producer", 1.0),
+        ("consumer", 1.0, True, 10.0, ["message at 1.0"]),
+        ("producer", 2.0),
+        ("consumer", 2.0, True, 20.0, ["message at 2.0"]),
+        ("producer", 5.0),
+        ("consumer", 5.0, True, 50.0, ["message at 5.0"]),
+        ("consumer", MAX_TIME, False, 50.0, [])
+    ]
+
+
+def _run_helics(config, main):
+    """Run a single federate on a real HELICS federation with an inproc
+    core."""
+    broker_name = f"broker-{uuid.uuid4().hex}"
+    broker = helics.helicsCreateBroker("inproc", broker_name, "-f 1")
+    federate = helics.helicsCreateCombinationFederateFromConfig(json.dumps(
+        {**config, "core_type": "inproc", "core_name": f"core-{broker_name}",
+         "broker": broker_name}
+    ))
+    try:
+        main(federate)
+    finally:
+        broker.wait_for_disconnect()
+
+
+def _loopback(federate, log):
+    federate.enter_executing_mode()
+    publication = federate.publications["loopback/value"]
+    subscription = federate.subscriptions["loopback/value"]
+    out = federate.get_endpoint_by_name("out")
+    inbox = federate.get_endpoint_by_name("loopback/in")
+    for time in (1.0, 2.0, 10.0, 20.0):
+        granted = federate.request_time(time)
+        messages = []
+        while inbox.has_message():
+            message = inbox.get_message()
+            messages.append((message.raw_data, message.source, message.time))
+        updated = subscription.is_updated()
+        log.append((granted, updated, subscription.double if updated else None,
+                    messages))
+        publication.publish(time)
+        out.send_data(f"sent at {granted}".encode(), "loopback/in")
+    federate.disconnect()
+
+
+def test_LocalFederation_matches_helics(federation):
+    # Values and messages a federate sends to itself interrupt its next
+    # time request one time delta later, on HELICS and in a local
+    # federation.
+    config = {"name": "loopback",
+              "publications": [{"key": "value", "type": "double"}],
+              "subscriptions": [{"key": "loopback/value"}],
+              "endpoints": [{"name": "out"}, {"name": "in"}],
+              "time_delta": 0.5}
+    helics_log = []
+    _run_helics(config, lambda federate: _loopback(federate, helics_log))
+    local_log = []
+    federate = federation.create_federate(config)
+    federation.add(federate, lambda: _loopback(federate, local_log))
+    federation.run()
+    assert helics_log[1] == (1.5, True, 1.0,
+                             [(b"sent at 1.0", "loopback/out", 1.0)])
+    assert local_log == helics_log
+
+
+def test_LocalFederation_time_delta(federation):
+    log = []
+    _add_consumer(federation, log, time_delta=3.0)
+    _add_producer(federation, log)
+    federation.run()
+    consumer_log = [entry for entry in log if entry[0] == "consumer"]
+    assert consumer_log == [
+        ("consumer", 3.0, True, 20.0, ["message at 1.0", "message at 2.0"]),
+        ("consumer", 6.0, True, 50.0, ["message at 5.0"]),
+        ("consumer", MAX_TIME, False, 50.0, [])
+    ]
+
+
+def test_LocalFederation_uninterruptible(federation):
+    log = []
+    _add_consumer(federation, log, uninterruptible=True)
+    _add_producer(federation, log)
+    federation.run()
+    assert log[-1] == ("consumer", MAX_TIME, True, 50.0,
+                       ["message at 1.0", "message at 2.0", "message at 5.0"])
+    assert len(log) == 4
+
+
+def test_LocalFederation_same_time(federation):
+    # Federates granted the same time do not see each other's output
+    # from that time.
+    log = []
+    consumer = federation.create_federate(
+        {"name": "consumer",
+         "subscriptions": [{"key": "producer/value", "default": -1.0}],
+         "endpoints": [{"name": "in"}]}
+    )
+
+    def consumer_main():
+        consumer.enter_executing_mode()
+        subscription = consumer.subscriptions["producer/value"]
+        for time in (1.0, 2.0):
+            granted = consumer.request_time(time)
+            log.append(("consumer", granted, subscription.double))
+        consumer.disconnect()
+
+    federation.add(consumer, consumer_main)
+    _add_producer(federation, log, times=(1.0, 2.0))
+    federation.run()
+    consumer_log = [entry for entry in log if entry[0] == "consumer"]
+    assert consumer_log[0] == ("consumer", 1.0, -1.0)
+    # the update interrupts the next request one time delta later
+    assert 1.0 < consumer_log[1][1] < 1.001
+    assert consumer_log[1][2] == 10.0
+
+
+def test_LocalFederation_config(federation, tmp_path):
+    config = {"name": "a",
+              "endpoints": [{"name": "local"},
+                            {"name": "global", "global": True}]}
+    path = tmp_path / "a.json"
+    path.write_text(json.dumps(config))
+    from_file = federation.create_federate(path)
+    assert set(from_file.endpoints) == {"a/local", "global"}
+    assert from_file.get_endpoint_by_name("local") is \
+        from_file.endpoints["a/local"]
+    config["name"] = "b"
+    config["endpoints"] = [{"name": "local"}]
+    from_string = federation.create_federate(json.dumps(config))
+    assert set(from_string.endpoints) == {"b/local"}
+    with pytest.raises(ValueError):
+        from_string.register_global_endpoint("global")
+
+
+def test_LocalFederation_error(federation):
+    log = []
+    _add_consumer(federation, log)
+    failing = federation.create_federate({"name": "failing"})
+
+    def fail():
+        failing.enter_executing_mode()
+        failing.request_time(1.0)
+        raise RuntimeError("failed")
+
+    federation.add(failing, fail)
+    with pytest.raises(FederationError) as e:
+        federation.run()
+    assert isinstance(e.value.__cause__, RuntimeError)
+
+
+def test_run_local_workdir(grid_model_path, tmp_path, monkeypatch):
+    cwd = tmp_path / "cwd"
+    cwd.mkdir()
+    monkeypatch.chdir(cwd)
+
+    def chdir(path):
+        raise AssertionError("the working directory is shared by all threads")
+
+    monkeypatch.setattr(os, "chdir", chdir)
+    config = Configuration(str(grid_model_path), {}, [], [], [],
+                           reliability={}, sim_duration=1)
+    config.evaluate(tmp_path / "project", local=True)
+    workdir = tmp_path / "project" / config.id
+    for output in ("metric_log.csv", "total_power.csv", "grid_state.csv",
+                   "event_log.csv", "bus_voltage.csv"):
+        assert (workdir / output).exists()
+    # the federates do not write to (or change) the working directory
+    assert os.getcwd() == str(cwd)
+    assert list(cwd.iterdir()) == []
@@ -1,6 +1,9 @@
 """Tests for metrics."""
+import numpy as np
+import pytest
 
 from ssim.metrics import (
+    MetricBank,
     MetricManager,
     MetricTimeAccumulator,
     Metric,
@@ -20,3 +23,73 @@ def test_manager_to_dicts():
         mgr.add_accumulator(name, MetricTimeAccumulator(metric))
     dicts = mgr.to_dicts()
     assert sorted(dicts, key=lambda d: d["name"]) == expected
+
+
+@pytest.fixture
+def bank_metrics():
+    return [Metric(None, 1.05, 1.0, ImprovementType.Minimize),
+            Metric(0.95, None, 1.0, ImprovementType.Maximize),
+            Metric(0.95, 1.05, 1.0, ImprovementType.SeekValue),
+            Metric(-3.0, 10.0, 2.0, ImprovementType.SeekValue,
+                   a=3.0, b=2.0, c=0.1, g=0.5)]
+
+
+@pytest.fixture
+def bank_values():
+    values = np.random.default_rng(1234).uniform(-5.0, 15.0, (200, 4))
+    # exactly at the objective and at the limits
+    values[0] = [1.0, 1.0, 1.0, 2.0]
+    values[1] = [1.05, 0.95, 0.95, -3.0]
+    values[2] = [1.05, 0.95, 1.05, 10.0]
+    return values
+
+
+def test_bank_normalize(bank_metrics, bank_values):
+    bank = MetricBank(bank_metrics)
+    expected = np.array([[metric.normalize(value)
+                          for metric, value in zip(bank_metrics, row)]
+                         for row in bank_values])
+    np.testing.assert_array_equal(bank.normalize(bank_values), expected)
+    np.testing.assert_array_equal(bank.normalize(bank_values[5]),
+                                  expected[5])
+
+
+def test_bank_accumulate(bank_metrics, bank_values):
+    bank = MetricBank(bank_metrics)
+    accumulators = [MetricTimeAccumulator(m) for m in bank_metrics]
+    times = [0.0, 1.0, 1.0, 3.0, 7.5]
+    for time, row in zip(times, bank_values):
+        expected = [accumulator.accumulate(value, time)
+                    for accumulator, value in zip(accumulators, row)]
+        np.testing.assert_array_equal(bank.accumulate(row, time), expected)
+    np.testing.assert_array_equal(
+        bank.accumulated_values,
+        [accumulator.accumulated_value for accumulator in accumulators]
+    )
+    np.testing.assert_array_equal(bank.total_times, 7.5)
+    # accumulate a subset of the metrics
+    met_val = bank.accumulate([1.0], 10.0, indices=[2])
+    assert met_val[0] == accumulators[2].accumulate(1.0, 10.0)
+    np.testing.assert_array_equal(bank.total_times, [7.5, 7.5, 10.0, 7.5])
+    with pytest.raises(AssertionError):
+        bank.accumulate(bank_values[0], 9.0)
+
+
+def test_bank_accumulate_series(bank_metrics, bank_values):
+    bank = MetricBank(bank_metrics)
+    accumulators = [MetricTimeAccumulator(m) for m in bank_metrics]
+    times = np.arange(len(bank_values), dtype=float)
+    times[3] = times[2]
+    expected = np.array([[accumulator.accumulate(value, time)
+                          for accumulator, value in zip(accumulators, row)]
+                         for time, row in zip(times, bank_values)])
+    np.testing.assert_array_equal(
+        bank.accumulate_series(bank_values, times), expected
+    )
+    np.testing.assert_allclose(
+        bank.accumulated_values,
+        [accumulator.accumulated_value for accumulator in accumulators]
+    )
+    assert bank.total_accumulation == pytest.approx(
+        sum(accumulator.accumulated_value for accumulator in accumulators)
+    )
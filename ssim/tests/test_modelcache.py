@@ -0,0 +1,64 @@
+"""Tests for ssim.modelcache"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from ssim import dssutil
+from ssim.modelcache import ModelCache, ModelInventory
+
+
+@pytest.fixture
+def model_cache(tmp_path):
+    return ModelCache(tmp_path / "cache")
+
+
+def test_ModelInventory_from_opendss(grid_model_path):
+    dssutil.load_model(grid_model_path)
+    inventory = ModelInventory.from_opendss()
+    assert set(inventory.lines) == {"line1", "line2", "line3"}
+    assert inventory.lines["line2"] == ("loadbus1", "loadbus2")
+    assert set(inventory.transformers) == {"sub", "reg1"}
+    assert inventory.switches == {}
+    assert inventory.generators == ["gen1"]
+    assert inventory.elements["load.load2"] == "loadbus2"
+    dssutil.run_command("clear")
+
+
+def test_ModelCache_inventory(model_cache, grid_model_path):
+    inventory = model_cache.inventory(grid_model_path)
+    dssutil.run_command("clear")
+    key = model_cache.key(grid_model_path)
+    assert (model_cache.cache_dir / f"{key}.json").exists()
+    # read from the cache without loading the model
+    assert model_cache.inventory(grid_model_path) == inventory
+
+
+def test_ModelCache_inventory_concurrent(model_cache, grid_model_path,
+                                         monkeypatch):
+    load_model = dssutil.load_model
+    compiled = []
+
+    def counting_load_model(dss_file):
+        compiled.append(dss_file)
+        load_model(dss_file)
+
+    monkeypatch.setattr(dssutil, "load_model", counting_load_model)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        inventories = list(executor.map(
+            model_cache.inventory, [grid_model_path] * 8
+        ))
+    dssutil.run_command("clear")
+    assert len(compiled) == 1
+    assert all(inventory == inventories[0] for inventory in inventories)
+    assert list(model_cache.cache_dir.glob("*.tmp")) == []
+
+
+def test_ModelCache_key(model_cache, tmp_path):
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+    model_file = model_dir / "circuit.dss"
+    model_file.write_text("clear\nnew circuit.foo\n")
+    key = model_cache.key(model_file)
+    assert key == model_cache.key(model_file)
+    assert key != model_cache.key(model_dir / "other.dss")
+    model_file.write_text("clear\nnew circuit.bar\n")
+    assert key != model_cache.key(model_file)
@@ -3,6 +3,7 @@ import csv
 import math
 import os.path
 from pathlib import Path
+import numpy as np
 import pytest
 import opendssdirect as dssdirect
 from ssim import opendss, dssutil, grid
@@ -59,6 +60,51 @@ def test_DSSModel_complex_voltage(test_circuit):
     assert voltage != pytest.approx(test_circuit.complex_voltage('loadbus1'))
 
 
+def test_DSSModel_load_snapshot(test_circuit):
+    test_circuit.solve(0)
+    snapshot = test_circuit.load_snapshot()
+    assert set(snapshot.names) == {'load1', 'load2'}
+    for name, kw, kvar in zip(*snapshot):
+        load = opendss.Load(name)
+        assert kw == pytest.approx(load.kw)
+        assert kvar == pytest.approx(load.kvar)
+
+
+def test_DSSModel_load_snapshot_disabled_load(test_circuit):
+    dssutil.run_command("edit load.load1 enabled=no")
+    test_circuit.solve(0)
+    snapshot = test_circuit.load_snapshot()
+    powers = {name: (kw, kvar) for name, kw, kvar in zip(*snapshot)}
+    assert powers['load1'] == (0.0, 0.0)
+    load2 = opendss.Load('load2')
+    assert powers['load2'] == (pytest.approx(load2.kw),
+                               pytest.approx(load2.kvar))
+    assert load2.kw > 0
+
+
+def test_DSSModel_solution_powers(test_circuit, monkeypatch):
+    calls = []
+    load_powers = opendss._load_powers
+
+    def counted_load_powers(position=None):
+        calls.append(position)
+        return load_powers(position)
+
+    monkeypatch.setattr(opendss, "_load_powers", counted_load_powers)
+    test_circuit.solve(0)
+    test_circuit.record_state()
+    snapshot = test_circuit.load_snapshot()
+    # the powers are read once per solution
+    assert len(calls) == 1
+    (kw, kvar), _ = test_circuit.solution_powers()
+    assert list(snapshot.kw) == list(kw)
+    test_circuit.solve(900)
+    test_circuit.record_state()
+    assert len(calls) == 2
+    # the element positions are only read once
+    assert calls[0] is calls[1]
+
+
 def test_DSSModel_storage(test_circuit):
     test_circuit.add_storage(
         "TestStorage",
@@ -114,6 +160,91 @@ def test_DSSModel_add_pvsystem(test_circuit, triangle_path):
     assert dssdirect.PVsystems.kW() == pytest.approx(12)
 
 
+def test_BusRecorder_sample(test_circuit, triangle_path):
+    test_circuit.add_loadshape(
+        "TestProfile", triangle_path, 1.0, 24)
+    test_circuit.add_pvsystem(
+        "TestPV", "loadbus1", 3, 12.0, 12.0,
+        {"kV": 12.47, "daily": "TestProfile", "irrad": 1000.0}
+    )
+    recorder = opendss.BusRecorder("test", ["loadbus1", "loadbus2"])
+    test_circuit.solve(12 * 3600)
+    recorder.sample(12 * 3600)
+    data = recorder.data()
+    voltages = dict(zip(dssdirect.Circuit.AllNodeNames(),
+                        dssdirect.Circuit.AllBusMagPu()))
+    voltages = {node: voltages[node] for node in recorder.nodes}
+    assert data["time"][0] == 12 * 3600
+    assert data["vmin_node"][0] == min(voltages, key=voltages.get)
+    assert data["vmax_node"][0] == max(voltages, key=voltages.get)
+    assert data["vmin"][0] == min(voltages.values())
+    assert data["vmax"][0] == max(voltages.values())
+    loads = [opendss.Load(name) for name in recorder.loads]
+    assert data["load_kw"][0] == pytest.approx(
+        sum(load.kw for load in loads))
+    assert data["load_kvar"][0] == pytest.approx(
+        sum(load.kvar for load in loads))
+    dssdirect.PVsystems.Name("TestPV")
+    assert data["pv_kw"][0] == pytest.approx(dssdirect.PVsystems.kW())
+    assert data["pv_kw"][0] > 0
+
+
+def test_BusRecorder_sample_disabled_elements(test_circuit, triangle_path):
+    test_circuit.add_loadshape(
+        "TestProfile", triangle_path, 1.0, 24)
+    test_circuit.add_pvsystem(
+        "DisabledPV", "loadbus1", 3, 12.0, 12.0,
+        {"kV": 12.47, "daily": "TestProfile", "irrad": 1000.0}
+    )
+    test_circuit.add_pvsystem(
+        "TestPV", "loadbus2", 3, 12.0, 12.0,
+        {"kV": 12.47, "daily": "TestProfile", "irrad": 1000.0}
+    )
+    dssutil.run_command("edit load.load1 enabled=no")
+    dssutil.run_command("edit pvsystem.disabledpv enabled=no")
+    recorder = opendss.BusRecorder("test", ["loadbus2"])
+    test_circuit.solve(12 * 3600)
+    recorder.sample(12 * 3600)
+    data = recorder.data()
+    load2 = opendss.Load("load2")
+    assert data["load_kw"][0] == pytest.approx(load2.kw)
+    assert data["load_kvar"][0] == pytest.approx(load2.kvar)
+    dssdirect.PVsystems.Name("TestPV")
+    assert data["pv_kw"][0] == pytest.approx(dssdirect.PVsystems.kW())
+    assert data["pv_kw"][0] > 0
+
+
+def test_DSSModel_save_record(grid_model_path, tmp_path):
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+    test_circuit = opendss.DSSModel(grid_model_path, spill_dir=spill_dir)
+    test_circuit.add_voltage_recorder(["loadbus1", "loadbus2"])
+    test_circuit.add_loading_recorder()
+    for time in (0, 900, 1800):
+        test_circuit.solve(time)
+        test_circuit.record_state()
+    test_circuit.save_record(tmp_path)
+    for name in ("grid_state", "bus_voltage", "pde_loading"):
+        assert (tmp_path / f"{name}.csv").exists()
+        assert (tmp_path / f"{name}.npz").exists()
+    with np.load(tmp_path / "bus_voltage.npz") as voltage:
+        assert voltage["time"].tolist() == [0, 900, 1800]
+        assert voltage["busses"].tolist() == ["loadbus1", "loadbus2"]
+        assert voltage["voltage"].shape == (3, 2)
+    with np.load(tmp_path / "pde_loading.npz") as loading:
+        assert loading["loading"].shape == (3, len(loading["names"]))
+    with np.load(tmp_path / "grid_state.npz") as state:
+        assert state["time"].tolist() == [0, 900, 1800]
+        assert all(state["vmin"] <= state["vmax"])
+        assert all(node.startswith("loadbus") or node.startswith("sub")
+                   or node.startswith("reg") or node.startswith("source")
+                   for node in state["vmin_node"])
+    assert len(list(spill_dir.iterdir())) > 0
+    test_circuit.close_record()
+    dssutil.run_command("clear")
+    assert len(list(spill_dir.iterdir())) == 0
+
+
 def test_DSSModel_add_xycurve(test_circuit):
     with pytest.raises(
             ValueError,
@@ -379,6 +510,17 @@ def test_Storage_next_state_change(test_circuit_with_storage):
     assert storage.soc == pytest.approx(1.0)
 
 
+def test_Storage_cached_state(test_circuit_with_storage):
+    storage = test_circuit_with_storage.storage_devices["TestStorage"]
+    test_circuit_with_storage.update_storage("TestStorage", 500.0, 0)
+    test_circuit_with_storage.solve(0.0)
+    for prop in opendss._STORAGE_CACHED_PROPERTIES:
+        assert storage._get(prop) == dssutil.get_property(
+            f"storage.TestStorage.{prop}")
+    test_circuit_with_storage.update_storage("TestStorage", 250.0, 0)
+    assert storage.kw == 250.0
+
+
 def test_export_model(test_circuit, model_dir, tmp_path_factory, wind_data):
     export_dir = tmp_path_factory.mktemp("export_dir")
     test_circuit.export_model(export_dir)
@@ -415,3 +557,33 @@ def test_export_model_datafile_abspath(tmp_path_factory,
         reader = csv.reader(f)
         data = tuple(map(float, (row[0] for row in reader)))
     assert data == wind_data
+
+
+@pytest.mark.parametrize("record, event", [
+    ("Hour=0, Sec=900, ControlIter=1, Element=RegControl.sub, "
+     "Action= CHANGED 1 TAPS TO 1.00625.",
+     opendss.ControlEvent(900.0, "RegControl.sub",
+                          " CHANGED 1 TAPS TO 1.00625.")),
+    ("Hour=2, Sec=30.5, ControlIter=3, Element=Capacitor.c1, "
+     "Phase, Action=**OPENED**",
+     opendss.ControlEvent(7230.5, "Capacitor.c1", "**OPENED**")),
+    ("Hour=1, Sec=0, ControlIter=1, Element=Capacitor.c1", None),
+    ("Hour=x, Sec=0, ControlIter=1, Element=Capacitor.c1, Action=", None)
+])
+def test_parse_control_event(record, event):
+    assert opendss._parse_control_event(record) == event
+
+
+def test_DSSModel_mean_bus_voltages(test_circuit):
+    test_circuit.solve(0)
+    busses = ["loadbus2", "SubBus", "loadbus1"]
+    np.testing.assert_allclose(
+        test_circuit.mean_bus_voltages(busses),
+        [test_circuit.mean_node_voltage(bus) for bus in busses]
+    )
+    test_circuit.fail_line("line2", terminal=1)
+    test_circuit.solve(1)
+    np.testing.assert_allclose(
+        test_circuit.mean_bus_voltages(busses),
+        [test_circuit.mean_node_voltage(bus) for bus in busses]
+    )
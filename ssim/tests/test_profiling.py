@@ -0,0 +1,74 @@
+"""Tests for ssim.profiling"""
+import csv
+import time
+
+import pytest
+from ssim.profiling import NullProfiler, StepProfiler, timed_grants
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = StepProfiler(["a", "b"], counters=["iterations"],
+                            spill_path=tmp_path / "timing.sink")
+    yield profiler
+    profiler.close()
+
+
+def test_StepProfiler(profiler):
+    for t in timed_grants([0.0, 1.0, 2.0], profiler):
+        profiler.begin_step(t)
+        with profiler.phase("a"):
+            time.sleep(0.001)
+        with profiler.phase("b"):
+            pass
+        with profiler.phase("b"):
+            pass
+        profiler.count("iterations", int(t) + 1)
+        profiler.end_step()
+    data = profiler.data()
+    assert profiler.columns == ["time", "request_latency", "a", "b",
+                                "iterations"]
+    assert data.shape == (3, 5)
+    assert list(data[:, 0]) == [0.0, 1.0, 2.0]
+    assert all(data[:, 2] >= 0.001)
+    assert all(data[:, 2] > data[:, 3])
+    assert all(data[:, 1] >= 0.0)
+    assert list(data[:, 4]) == [1, 2, 3]
+
+
+def test_StepProfiler_phase_exception(profiler):
+    profiler.begin_step(0.0)
+    with pytest.raises(ValueError):
+        with profiler.phase("a"):
+            raise ValueError()
+    profiler.end_step()
+    assert profiler.data()[0, 2] > 0
+
+
+def test_StepProfiler_output(profiler, tmp_path):
+    assert profiler.summary() == "0 steps"
+    for t in range(10):
+        profiler.begin_step(t)
+        with profiler.phase("a"):
+            time.sleep(0.0001 * t)
+        profiler.end_step()
+    profiler.to_csv(tmp_path / "timing.csv")
+    with open(tmp_path / "timing.csv") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == profiler.columns
+    assert len(rows) == 11
+    summary = profiler.summary(bins=4)
+    assert summary.startswith("10 steps")
+    assert "a: total" in summary
+    assert "iterations: mean 0.00, max 0" in summary
+
+
+def test_NullProfiler():
+    profiler = NullProfiler()
+    assert not profiler.enabled
+    assert list(timed_grants([1.0, 2.0], profiler)) == [1.0, 2.0]
+    profiler.begin_step(1.0)
+    with profiler.phase("a"):
+        pass
+    profiler.count("a", 1)
+    profiler.end_step()
@@ -1,4 +1,10 @@
 """Tests for :py:mod:`ssim.reliability`."""
+import json
+import random
+
+import numpy as np
+import pytest
+
 from ssim import reliability
 
 
@@ -12,3 +18,212 @@ def test_Event_to_json_from_json():
                               "device-bar",
                               data={"foo": 1})
     assert event == reliability.Event.from_json(event.to_json())
+
+
+@pytest.fixture
+def reliability_config(tmp_path, grid_model_path):
+    config = tmp_path / "grid.json"
+    config.write_text(json.dumps({
+        "dss_file": str(grid_model_path),
+        "reliability": {
+            "seed": 1234,
+            "line": {"mtbf": 10, "min_repair": 1, "max_repair": 20}
+        }
+    }))
+    return config
+
+
+def _scan_peek(model):
+    return min(m.next_update() for m in model.all_models())
+
+
+def _scan_step(model, time):
+    for _, m in model._all_components():
+        m.update(time)
+    events = []
+    for component, m in model._all_components():
+        event = m.next_event()
+        if event is not None:
+            events.append(reliability._make_event(event, component))
+    return events
+
+
+def test_GridReliabilityModel_matches_scan(reliability_config):
+    model = reliability.GridReliabilityModel(reliability_config)
+    assert model._num_models > 0
+    expected = []
+    time = 0.0
+    for _ in range(200):
+        model.update(time, [])
+        expected.append((time, list(model.events())))
+        time = model.peek()
+    # an identically seeded model stepped by checking every component
+    # produces the same sequence of events at the same times
+    model = reliability.GridReliabilityModel(reliability_config)
+    actual = []
+    time = 0.0
+    for _ in range(200):
+        actual.append((time, _scan_step(model, time)))
+        time = _scan_peek(model)
+    assert actual == expected
+    assert any(events for _, events in expected)
+
+
+def test_GridReliabilityModel_peek_updates_lazily(reliability_config):
+    model = reliability.GridReliabilityModel(reliability_config)
+    first = model.peek()
+    model.update(first / 2, [])
+    assert list(model.events()) == []
+    assert model.peek() == first
+    model.update(first, [])
+    events = list(model.events())
+    assert len(events) >= 1
+    assert all(event.type == reliability.EventType.FAIL for event in events)
+    assert model.peek() > first
+
+
+def _timeline(components, block_size=8, **kwargs):
+    return reliability.ReliabilityTimeline(
+        components,
+        [reliability.component_seed(42, c) for c in components],
+        mtbf=10 * 3600, min_repair=3600, max_repair=5 * 3600,
+        block_size=block_size, **kwargs
+    )
+
+
+def _read_timeline(timeline, until):
+    events = []
+    time = timeline.peek()
+    while time <= until:
+        events.extend((time, event) for event in timeline.events(time))
+        time = timeline.peek()
+    return events
+
+
+def test_ReliabilityTimeline_events_alternate():
+    components = [f"line.l{i}" for i in range(20)]
+    events = _read_timeline(_timeline(components), 500 * 3600)
+    assert [t for t, _ in events] == sorted(t for t, _ in events)
+    for component in components:
+        types = [event.type for _, event in events
+                 if event.element == component]
+        assert len(types) > 1
+        assert types[::2] == [reliability.EventType.FAIL] * len(types[::2])
+        assert types[1::2] == \
+            [reliability.EventType.RESTORE] * len(types[1::2])
+    fail_modes = {event.mode for _, event in events
+                  if event.type == reliability.EventType.FAIL}
+    assert fail_modes == {reliability.Mode.OPEN}
+
+
+def test_ReliabilityTimeline_independent_streams():
+    components = [f"line.l{i}" for i in range(5)]
+    expected = _read_timeline(_timeline(components), 200 * 3600)
+    # independent of block size and of the other components
+    assert _read_timeline(_timeline(components, block_size=1),
+                          200 * 3600) == expected
+    events = _read_timeline(_timeline(components[:1] + ["line.extra"]),
+                            200 * 3600)
+    assert [e for e in events if e[1].element == "line.l0"] == \
+        [e for e in expected if e[1].element == "line.l0"]
+
+
+def test_ReliabilityTimeline_switch_modes():
+    timeline = _timeline(["line.sw"], p_open=0.5, p_closed=0.5,
+                         repair_state=[reliability.Mode.OPEN])
+    events = _read_timeline(timeline, 2000 * 3600)
+    modes = {(event.type, event.mode) for _, event in events}
+    assert modes == {
+        (reliability.EventType.FAIL, reliability.Mode.OPEN),
+        (reliability.EventType.FAIL, reliability.Mode.CLOSED),
+        (reliability.EventType.RESTORE, reliability.Mode.OPEN)
+    }
+
+
+def test_GridReliabilityModel_timeline_backend(tmp_path, grid_model_path):
+    config = tmp_path / "grid.json"
+    config.write_text(json.dumps({
+        "dss_file": str(grid_model_path),
+        "reliability": {
+            "seed": 1234,
+            "backend": "timeline",
+            "line": {"mtbf": 10, "min_repair": 1, "max_repair": 20}
+        }
+    }))
+    model = reliability.GridReliabilityModel(config)
+    assert model._num_models > 0
+    assert list(model.all_models()) == []
+    events = []
+    time = 0.0
+    for _ in range(50):
+        model.update(time, [])
+        events.extend(model.events())
+        time = model.peek()
+    assert {event.type for event in events} == \
+        {reliability.EventType.FAIL, reliability.EventType.RESTORE}
+    assert all(event.element.startswith("line.") for event in events)
+
+
+def test_EventTimeline_save_load(reliability_config, tmp_path):
+    model = reliability.GridReliabilityModel(reliability_config)
+    timeline = reliability.EventTimeline.from_model(model, 100)
+    assert len(timeline) > 0
+    assert timeline.times[-1] <= 100 * 3600
+    timeline.save(tmp_path / "events.npz")
+    loaded = reliability.EventTimeline.load(tmp_path / "events.npz")
+    assert list(loaded.times) == list(timeline.times)
+    first = loaded.peek()
+    assert first == timeline.times[0]
+    assert list(loaded.events(first - 1)) == []
+    replayed = list(loaded.events(100 * 3600))
+    assert replayed == list(timeline.events(100 * 3600))
+    assert loaded.peek() == np.inf
+
+
+def test_precompute_enabled():
+    assert not reliability.precompute_enabled(None)
+    assert reliability.precompute_enabled({"line": {}})
+    assert not reliability.precompute_enabled(
+        {"line": {}, "precompute": False})
+    assert not reliability.precompute_enabled({"generator": {}})
+    assert reliability.precompute_enabled({"generator": {"enabled": False}})
+
+
+def _run_model(config_file, steps=50):
+    model = reliability.GridReliabilityModel(config_file)
+    events = []
+    time = 0.0
+    for _ in range(steps):
+        model.update(time, [])
+        events.extend((time, event) for event in model.events())
+        time = model.peek()
+    return events
+
+
+def test_GridReliabilityModel_common_random_numbers(tmp_path,
+                                                   reliability_config):
+    expected = _run_model(reliability_config)
+    with open(reliability_config) as f:
+        config = json.load(f)
+    # consuming random numbers elsewhere does not change the failures
+    random.seed(0)
+    random.random()
+    assert _run_model(reliability_config) == expected
+    config["reliability"]["replicate"] = 1
+    replicate = tmp_path / "replicate.json"
+    replicate.write_text(json.dumps(config))
+    assert _run_model(replicate) != expected
+
+
+def test_component_streams_independent():
+    first = reliability.component_seed(1, "line.l1")
+    assert first.generate_state(2).tolist() == \
+        reliability.component_seed(1, "line.l1").generate_state(2).tolist()
+    for other in (reliability.component_seed(1, "line.l2"),
+                  reliability.component_seed(2, "line.l1"),
+                  reliability.component_seed(1, "line.l1", replicate=1)):
+        assert first.generate_state(2).tolist() != \
+            other.generate_state(2).tolist()
+    # "plumless" and "buckeroo" have the same CRC-32
+    assert reliability.component_seed(1, "line.plumless").spawn_key != \
+        reliability.component_seed(1, "line.buckeroo").spawn_key
@@ -0,0 +1,126 @@
+"""Tests for ssim.resultcache"""
+import shutil
+
+import pytest
+
+from ssim.grid import StorageSpecification
+from ssim.resultcache import ResultCache
+from ssim.ui import core
+from ssim.ui.core import Configuration, ProjectResults
+
+
+@pytest.fixture
+def result_cache(tmp_path):
+    return ResultCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def result_dir(tmp_path):
+    result_dir = tmp_path / "results"
+    result_dir.mkdir()
+    (result_dir / "grid.json").write_text("{}")
+    (result_dir / "bus_voltage.csv").write_text("time,bus1\n0.0,1.0\n")
+    (result_dir / "logs").mkdir()
+    (result_dir / "logs" / "grid.log").write_text("log")
+    return result_dir
+
+
+def test_ResultCache_store_restore(result_cache, result_dir, tmp_path):
+    assert not result_cache.contains("abc")
+    assert not result_cache.restore("abc", tmp_path / "restored")
+    result_cache.store("abc", result_dir, exclude={"grid.json"})
+    assert result_cache.contains("abc")
+    # storing again does not change the cache
+    (result_dir / "bus_voltage.csv").unlink()
+    result_cache.store("abc", result_dir, exclude={"grid.json"})
+    restored = tmp_path / "restored"
+    assert result_cache.restore("abc", restored)
+    assert (restored / "bus_voltage.csv").read_text() == \
+        "time,bus1\n0.0,1.0\n"
+    assert (restored / "logs" / "grid.log").read_text() == "log"
+    assert not (restored / "grid.json").exists()
+    # restoring replaces existing results
+    (restored / "bus_voltage.csv").unlink()
+    (restored / "bus_voltage.csv").write_text("stale")
+    assert result_cache.restore("abc", restored)
+    assert (restored / "bus_voltage.csv").read_text() == \
+        "time,bus1\n0.0,1.0\n"
+
+
+def _configuration(grid, kwh=100.0, sim_duration=24):
+    storage = StorageSpecification("s1", "loadbus1", kwh, 50.0, "droop")
+    return Configuration(str(grid), {}, [], [storage], [],
+                         reliability={}, sim_duration=sim_duration)
+
+
+def test_Configuration_cache_key(grid_model_path, tmp_path):
+    key = _configuration(grid_model_path).cache_key()
+    assert key == _configuration(grid_model_path).cache_key()
+    assert key != _configuration(grid_model_path, kwh=200.0).cache_key()
+    assert key != _configuration(grid_model_path,
+                                 sim_duration=12).cache_key()
+    # the key depends on the content of the model, not its location
+    copy_dir = tmp_path / "copy"
+    shutil.copytree(grid_model_path.parent, copy_dir)
+    copy = copy_dir / grid_model_path.name
+    assert _configuration(copy).cache_key() == key
+    with open(copy, "a") as f:
+        f.write("\n! a comment\n")
+    assert _configuration(copy).cache_key() != key
+
+
+def test_Configuration_cache_key_source(grid_model_path, monkeypatch):
+    key = _configuration(grid_model_path).cache_key()
+    # results from a different version of the simulation code are not
+    # reused
+    monkeypatch.setattr(core, "_ssim_source_hash", lambda: "changed")
+    assert _configuration(grid_model_path).cache_key() != key
+
+
+def test_Configuration_evaluate_cached(grid_model_path, result_cache,
+                                       result_dir, tmp_path):
+    config = _configuration(grid_model_path)
+    result_cache.store(config.cache_key(), result_dir,
+                       exclude={"grid.json"})
+    config.evaluate(tmp_path / "project", local=True, cache=result_cache)
+    workdir = tmp_path / "project" / config.id
+    assert (workdir / "evaluated").exists()
+    assert (workdir / "bus_voltage.csv").exists()
+    assert config.wait() == 0
+    summary = ProjectResults(tmp_path / "project").summary()
+    assert summary["configuration"].tolist() == [config.id]
+    assert summary["s1_kwh"].tolist() == [100.0]
+
+
+def _write_results(self):
+    # like the federates, rewrite the output files in place
+    with open(self._workdir / "bus_voltage.csv", "w") as f:
+        f.write(f"time,bus1\n{self.sim_duration},1.0\n")
+
+
+def test_Configuration_evaluate_reuses_workdir(grid_model_path, result_cache,
+                                               tmp_path, monkeypatch):
+    monkeypatch.setattr(Configuration, "_run_local", _write_results)
+    config = _configuration(grid_model_path)
+    config.evaluate(tmp_path / "project", local=True, cache=result_cache)
+    key = config.cache_key()
+    config.sim_duration = 12
+    config.evaluate(tmp_path / "project", local=True, cache=result_cache)
+    assert config.cache_key() != key
+    # evaluating in the same directory does not change the cached results
+    # of the first evaluation
+    assert (result_cache.cache_dir / key / "bus_voltage.csv").read_text() \
+        == "time,bus1\n24,1.0\n"
+    assert (result_cache.cache_dir / config.cache_key()
+            / "bus_voltage.csv").read_text() == "time,bus1\n12,1.0\n"
+
+
+def test_Configuration_evaluate_no_key(grid_model_path, result_cache,
+                                       tmp_path, monkeypatch):
+    monkeypatch.setattr(Configuration, "_run_local", _write_results)
+    monkeypatch.setattr(core.ModelCache, "key", lambda self, dss_file: None)
+    config = _configuration(grid_model_path)
+    assert config.cache_key() is None
+    config.evaluate(tmp_path / "project", local=True, cache=result_cache)
+    assert (tmp_path / "project" / config.id / "bus_voltage.csv").exists()
+    assert not result_cache.cache_dir.exists()
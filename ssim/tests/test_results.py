@@ -0,0 +1,162 @@
+"""Tests for Results and ProjectResults in ssim.ui.core."""
+import json
+
+import numpy as np
+import pytest
+
+from ssim.metrics import (
+    ImprovementType,
+    Metric,
+    MetricManager,
+    MetricTimeAccumulator
+)
+from ssim.ui.core import ProjectResults, Results
+
+
+@pytest.fixture
+def voltage_series():
+    times = np.array([0.0, 300.0, 300.0, 900.0, 1800.0, 3600.0])
+    voltage = np.array([[1.00, 0.99, 1.07],
+                        [1.01, 0.94, 1.03],
+                        [1.02, 0.93, 1.02],
+                        [1.06, 0.97, 1.00],
+                        [0.98, 1.00, 0.96],
+                        [1.00, 1.04, 1.05]])
+    return times, ["bus1", "bus2", "bus3"], voltage
+
+
+def _write_configuration(config_dir, voltage_series, npz=False):
+    times, busses, voltage = voltage_series
+    config_dir.mkdir()
+    (config_dir / "grid.json").write_text("{}")
+    (config_dir / "federation.json").write_text("{}")
+    (config_dir / "evaluated").touch()
+    if npz:
+        np.savez(config_dir / "bus_voltage.npz", time=times,
+                 busses=np.array(busses), voltage=voltage)
+    else:
+        np.savetxt(config_dir / "bus_voltage.csv",
+                   np.column_stack([times, voltage]), delimiter=",",
+                   header=",".join(["time"] + busses), comments="")
+
+
+def _voltage_metrics():
+    manager = MetricManager()
+    manager.add_accumulator("bus3", MetricTimeAccumulator(
+        Metric(0.95, 1.05, 1.0, ImprovementType.SeekValue)))
+    manager.add_accumulator("bus1", MetricTimeAccumulator(
+        Metric(None, 1.05, 1.0, ImprovementType.Minimize)))
+    return {"Bus Voltage": manager}
+
+
+@pytest.mark.parametrize("npz", [False, True])
+def test_Results_rescore(tmp_path, voltage_series, npz):
+    _write_configuration(tmp_path / "config", voltage_series, npz)
+    metrics = _voltage_metrics()
+    output_file = tmp_path / "metric_log.csv"
+    col_names, accumulated, data = Results(tmp_path / "config").rescore(
+        metrics, output_file
+    )
+    assert col_names == ["time", "bus3", "bus1"]
+    times, _, voltage = voltage_series
+    expected = {name: [] for name in ("bus3", "bus1")}
+    for time, row in zip(times, voltage):
+        expected["bus3"].append(
+            metrics["Bus Voltage"].get_accumulator("bus3").accumulate(
+                row[2], time))
+        expected["bus1"].append(
+            metrics["Bus Voltage"].get_accumulator("bus1").accumulate(
+                row[0], time))
+    np.testing.assert_array_equal(data["time"], times)
+    np.testing.assert_array_equal(data["bus3"], expected["bus3"])
+    np.testing.assert_array_equal(data["bus1"], expected["bus1"])
+    assert accumulated == pytest.approx(
+        metrics["Bus Voltage"].get_total_accumulation)
+    # the output file can be read like a metric log from a simulation
+    _, logged, logged_data = Results(tmp_path).metrics_log()
+    assert logged == pytest.approx(accumulated)
+    np.testing.assert_allclose(logged_data["bus1"], expected["bus1"])
+
+
+def test_Results_rescore_missing_bus(tmp_path, voltage_series):
+    _write_configuration(tmp_path / "config", voltage_series)
+    manager = MetricManager()
+    manager.add_accumulator("bus4", MetricTimeAccumulator(
+        Metric(0.95, 1.05, 1.0, ImprovementType.SeekValue)))
+    with pytest.raises(ValueError):
+        Results(tmp_path / "config").rescore({"Bus Voltage": manager})
+
+
+def test_ProjectResults_rescore(tmp_path, voltage_series):
+    _write_configuration(tmp_path / "a", voltage_series)
+    _write_configuration(tmp_path / "b", voltage_series, npz=True)
+    (tmp_path / "c").mkdir()
+    scores = ProjectResults(tmp_path).rescore(_voltage_metrics(),
+                                              max_workers=2)
+    assert set(scores) == {"a", "b"}
+    assert scores["a"][1] == scores["b"][1]
+    np.testing.assert_array_equal(scores["a"][2], scores["b"][2])
+
+
+def _write_results(config_dir, kw):
+    config_dir.mkdir()
+    (config_dir / "federation.json").write_text("{}")
+    (config_dir / "grid.json").write_text(json.dumps({"storage": [
+        {"name": "s1", "bus": "bus1", "kwrated": kw, "kwhrated": 4 * kw,
+         "controller": "droop"}
+    ]}))
+    (config_dir / "evaluated").touch()
+    (config_dir / "metric_log.csv").write_text(
+        "time,bus1\n0.0,0.0\n3600.0,0.5\n" + f"{kw / 100}\n")
+    (config_dir / "grid_state.csv").write_text(
+        "time,vmin,vmax,vmin_node,vmax_node\n"
+        "0.0,0.97,1.02,bus1.1,bus2.1\n"
+        "1800.0,10.0,0.0,,\n"
+        "3600.0,0.95,1.04,bus1.2,bus2.2\n")
+    (config_dir / "pde_loading.csv").write_text(
+        "time,line.l1,line.l2\n0.0,0.5,0.25\n3600.0,0.75,1.5\n")
+    (config_dir / "storage_power.csv").write_text(
+        "time,s1_discharge_kw,s1_charge_kw,s1_kvar,s1_soc\n"
+        f"0.0,{kw},0.0,0.0,1.0\n"
+        f"1800.0,0.0,{kw},0.0,0.5\n"
+        "3600.0,0.0,0.0,0.0,1.0\n")
+
+
+def test_Results_summary(tmp_path):
+    _write_results(tmp_path / "config", 100.0)
+    assert Results(tmp_path / "config").summary() == {
+        "configuration": "config",
+        "s1_bus": "bus1",
+        "s1_kw": 100.0,
+        "s1_kwh": 400.0,
+        "s1_controller": "droop",
+        "accumulated_metric": 1.0,
+        "min_voltage": 0.95,
+        "max_voltage": 1.04,
+        "max_loading": 1.5,
+        "storage_throughput_kwh": 100.0
+    }
+
+
+def test_Results_summary_missing_files(tmp_path):
+    (tmp_path / "config").mkdir()
+    summary = Results(tmp_path / "config").summary()
+    assert summary["configuration"] == "config"
+    assert summary["min_voltage"] is None
+    assert summary["storage_throughput_kwh"] is None
+
+
+def test_ProjectResults_summary(tmp_path):
+    project_results = ProjectResults(tmp_path)
+    assert len(project_results.summary()) == 0
+    for kw in (100.0, 200.0, 50.0):
+        _write_results(tmp_path / f"config{int(kw)}", kw)
+    project_results.add_summary(tmp_path / "config100")
+    project_results.add_summary(tmp_path / "config100")
+    summary = project_results.summary()
+    assert summary["configuration"].tolist() == ["config100"]
+    project_results.update_summary()
+    summary = project_results.summary().sort_values("accumulated_metric")
+    assert summary["configuration"].tolist() == \
+        ["config50", "config100", "config200"]
+    assert summary["s1_kwh"].tolist() == [200.0, 400.0, 800.0]
@@ -0,0 +1,63 @@
+"""Tests for ssim.resultstore"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ssim.resultstore import ColumnStore
+from ssim.ui.core import Results
+
+
+@pytest.fixture
+def state_csv(tmp_path):
+    path = tmp_path / "grid_state.csv"
+    path.write_text(
+        "time,min_voltage,min_node,steps\n"
+        "0.0,0.98,bus1.1,1\n"
+        "1.0,0.97,,2\n"
+        "2.0,0.99,bus2.3,3\n"
+    )
+    return path
+
+
+def test_ColumnStore_table(tmp_path, state_csv):
+    store = ColumnStore(tmp_path / "store")
+    table = store.table(state_csv)
+    assert table.columns == ["time", "min_voltage", "min_node", "steps"]
+    assert len(table) == 3
+    expected = pd.read_csv(state_csv)
+    pd.testing.assert_frame_equal(table.read(), expected,
+                                  check_dtype=False)
+    np.testing.assert_array_equal(table.column("steps"), [1, 2, 3])
+    assert isinstance(table.column("time"), np.memmap)
+    subset = table.read(["min_voltage", "time"])
+    assert list(subset.columns) == ["min_voltage", "time"]
+    # the converted table is reused
+    assert store.table(state_csv).read().equals(table.read())
+
+
+def test_ColumnStore_reconvert(tmp_path, state_csv):
+    store = ColumnStore(tmp_path / "store")
+    store.table(state_csv)
+    state_csv.write_text("time,min_voltage\n0.0,1.01\n")
+    stat = state_csv.stat()
+    os.utime(state_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    table = store.table(state_csv)
+    assert table.columns == ["time", "min_voltage"]
+    np.testing.assert_array_equal(table.column("min_voltage"), [1.01])
+    # the previous conversion is removed
+    assert len([p for p in (tmp_path / "store").iterdir()
+                if p.is_dir()]) == 1
+
+
+def test_Results_columns(tmp_path, state_csv):
+    results = Results(tmp_path)
+    names, data = results.grid_state()
+    assert names == ["time", "min_voltage", "min_node", "steps"]
+    # the last row is not included, as before
+    assert len(data) == 2
+    names, data = results.grid_state(["time", "min_node"])
+    assert names == ["time", "min_voltage", "min_node", "steps"]
+    assert list(data.columns) == ["time", "min_node"]
+    assert data["min_node"].isna().tolist() == [False, True]
@@ -0,0 +1,206 @@
+"""Tests for concurrent configuration evaluation in ssim.ui.core."""
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from ssim import reliability
+from ssim.ui.core import Configuration, ConfigurationScheduler
+
+
+class FakeConfiguration:
+    """Stands in for a Configuration whose federation runs in the
+    background until `finish` is set."""
+
+    def __init__(self, name, returncode=0):
+        self.id = name
+        self.returncode = returncode
+        self.broker_port = None
+        self.started = threading.Event()
+        self.finish = threading.Event()
+        self.canceled = False
+
+    def evaluate(self, basepath, local=False, broker_port=None, cache=None):
+        self.broker_port = broker_port
+        self.started.set()
+
+    def wait(self):
+        self.finish.wait(timeout=10)
+        return 1 if self.canceled else self.returncode
+
+    def cancel(self):
+        self.canceled = True
+        self.finish.set()
+
+
+def test_scheduler_runs_concurrently(tmp_path):
+    configs = [FakeConfiguration(f"config{i}") for i in range(4)]
+    progress = []
+    scheduler = ConfigurationScheduler(
+        tmp_path, max_workers=4, base_port=25000,
+        progress=lambda config, completed, total:
+            progress.append((config.id, completed, total))
+    )
+    runner = threading.Thread(target=lambda: progress.append(
+        scheduler.run(configs)))
+    runner.start()
+    # all configurations start before any of them finishes
+    for config in configs:
+        assert config.started.wait(timeout=10)
+    assert len({config.broker_port for config in configs}) == 4
+    configs[1].returncode = 1
+    for config in configs:
+        config.finish.set()
+    runner.join(timeout=10)
+    evaluated = progress.pop()
+    assert [config.id for config in evaluated] == \
+        ["config0", "config2", "config3"]
+    assert sorted(completed for _, completed, _ in progress) == [1, 2, 3, 4]
+    assert all(total == 4 for _, _, total in progress)
+
+
+def test_scheduler_cancel(tmp_path):
+    configs = [FakeConfiguration(f"config{i}") for i in range(3)]
+    scheduler = ConfigurationScheduler(tmp_path, max_workers=1,
+                                       base_port=25000)
+    result = []
+    runner = threading.Thread(target=lambda: result.append(
+        scheduler.run(configs)))
+    runner.start()
+    assert configs[0].started.wait(timeout=10)
+    scheduler.cancel()
+    runner.join(timeout=10)
+    assert scheduler.canceled
+    assert configs[0].canceled
+    assert not configs[1].started.is_set()
+    assert result == [[]]
+
+
+def test_scheduler_local_runs_one_at_a_time(tmp_path):
+    active = []
+    overlaps = []
+
+    class LocalConfiguration(FakeConfiguration):
+        def evaluate(self, basepath, local=False, broker_port=None,
+                     cache=None):
+            assert local
+            overlaps.append(len(active))
+            active.append(self)
+            self.started.wait(timeout=0.05)
+            active.remove(self)
+
+    configs = [LocalConfiguration(f"config{i}") for i in range(4)]
+    scheduler = ConfigurationScheduler(tmp_path, max_workers=4, local=True)
+    assert scheduler.max_workers == 1
+    assert scheduler.run(configs) == configs
+    assert overlaps == [0, 0, 0, 0]
+
+
+def test_configuration_broker_port(tmp_path):
+    config = Configuration("grid.dss", {}, [], [], [])
+    config._workdir = tmp_path
+    config._grid_path = tmp_path / "grid.json"
+    config._broker_port = 25000
+    federation = config._federation_config()
+    assert federation["broker"] is False
+    broker = federation["federates"][0]
+    assert broker["name"] == "broker"
+    assert "--port=25000" in broker["exec"]
+    assert f"-f {len(federation['federates']) - 1}" in broker["exec"]
+    with open(tmp_path / "grid_federate.json") as f:
+        assert json.load(f)["broker_port"] == 25000
+    grid = next(federate for federate in federation["federates"]
+                if federate["name"] == "grid")
+    assert str(tmp_path / "grid_federate.json") in grid["exec"]
+
+
+def _running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg"),
+                    reason="requires POSIX process groups")
+def test_configuration_cancel_stops_federates(tmp_path, monkeypatch):
+    # stand-in for `helics run` that starts a federate and waits for it
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    helics = bin_dir / "helics"
+    helics.write_text(
+        "#!/bin/sh\nsleep 60 &\necho $! > federate.pid\nwait\n"
+    )
+    helics.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    config = Configuration("grid.dss", {}, [], [], [])
+    config._workdir = tmp_path
+    config._federation_path = tmp_path / "federation.json"
+    config._run()
+    pid_file = tmp_path / "federate.pid"
+    deadline = time.monotonic() + 10
+    while not pid_file.exists() or not pid_file.read_text().strip():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    federate = int(pid_file.read_text())
+    config.cancel()
+    assert config._proc.wait(timeout=10) != 0
+    while _running(federate):
+        assert time.monotonic() < deadline, "federate was not stopped"
+        time.sleep(0.01)
+
+
+def test_configuration_default_broker(tmp_path):
+    config = Configuration("grid.dss", {}, [], [], [])
+    config._workdir = tmp_path
+    config._grid_path = tmp_path / "grid.json"
+    federation = config._federation_config()
+    assert federation["broker"] is True
+    assert all(federate["name"] != "broker"
+               for federate in federation["federates"])
+    assert not (tmp_path / "grid_federate.json").exists()
+
+
+def test_configuration_precomputed_reliability(monkeypatch, tmp_path,
+                                               grid_model_path):
+    monkeypatch.setattr(Configuration, "_run_local", lambda self: None)
+    config = Configuration(
+        str(grid_model_path), {}, [], [], [],
+        reliability={"seed": 1,
+                     "line": {"mtbf": 10, "min_repair": 1, "max_repair": 2}}
+    )
+    config.evaluate(tmp_path, local=True)
+    workdir = tmp_path / config.id
+    with open(workdir / "grid.json") as f:
+        events = json.load(f)["reliability_events"]
+    assert events == str(workdir / "reliability_events.npz")
+    assert (workdir / "reliability_events.npz").exists()
+    with open(workdir / "federation.json") as f:
+        federation = json.load(f)
+    assert all(federate["name"] != "reliability"
+               for federate in federation["federates"])
+    # generator wear-out needs the reliability federate
+    config.reliability["generator"] = {}
+    assert "reliability" in [federate["name"] for federate
+                             in config._federation_config()["federates"]]
+
+
+def test_configuration_no_network_reliability(monkeypatch, tmp_path,
+                                              grid_model_path):
+    # without line or switch models there are no events, and the grid
+    # model is not compiled to find out
+    def no_model(*args, **kwargs):
+        raise AssertionError("reliability model built")
+
+    monkeypatch.setattr(Configuration, "_run_local", lambda self: None)
+    monkeypatch.setattr(reliability, "GridReliabilityModel", no_model)
+    config = Configuration(str(grid_model_path), {}, [], [], [],
+                           reliability={"seed": 1})
+    config.evaluate(tmp_path, local=True)
+    timeline = reliability.EventTimeline.load(
+        tmp_path / config.id / "reliability_events.npz"
+    )
+    assert len(timeline) == 0
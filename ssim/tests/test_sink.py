@@ -0,0 +1,60 @@
+"""Tests for ssim.sink"""
+import gc
+
+import numpy as np
+from ssim import sink
+
+
+def test_RowSink_flush(tmp_path):
+    rows = sink.RowSink(tmp_path / "rows.sink", buffer_size=3)
+    for i in range(7):
+        rows.append((i, str(i)))
+    assert len(rows) == 7
+    assert len(list(rows.chunks())) == 3
+    assert list(rows.rows()) == [(i, str(i)) for i in range(7)]
+    rows.close()
+    assert not (tmp_path / "rows.sink").exists()
+
+
+def test_RowSink_flush_interval(tmp_path):
+    rows = sink.RowSink(tmp_path / "rows.sink", flush_interval=0.0)
+    rows.append(1)
+    rows.append(2)
+    assert (tmp_path / "rows.sink").stat().st_size > 0
+    assert list(rows.rows()) == [1, 2]
+
+
+def test_RowSink_temporary_file():
+    rows = sink.RowSink(buffer_size=2)
+    rows.append(1)
+    assert rows.path is None
+    assert list(rows.rows()) == [1]
+    rows.append(2)
+    path = rows.path
+    assert path.exists()
+    assert list(rows.rows()) == [1, 2]
+    del rows
+    gc.collect()
+    assert not path.exists()
+
+
+def test_ArraySink():
+    array = sink.ArraySink(2, buffer_size=3)
+    assert array.to_array().shape == (0, 2)
+    for i in range(7):
+        array.append((i, 2 * i))
+    assert len(array) == 7
+    assert array.to_array().tolist() == [[i, 2 * i] for i in range(7)]
+    array.close()
+
+
+def test_save_npz(tmp_path):
+    data = np.arange(20.0).reshape(10, 2)
+    sink.save_npz(
+        tmp_path / "data.npz",
+        {"names": np.array(["a", "b"]),
+         "data": (float, data.shape, (data[:4], data[4:]))}
+    )
+    with np.load(tmp_path / "data.npz") as archive:
+        assert archive["names"].tolist() == ["a", "b"]
+        np.testing.assert_array_equal(archive["data"], data)
@@ -1,7 +1,12 @@
 """Tests for storage controllers."""
+import json
+import uuid
+
+import helics
 import pytest
+from ssim.codec import MessageCodec
 from ssim.federates import storage
-from ssim.grid import StorageSpecification
+from ssim.grid import StorageSpecification, StorageStatus
 
 
 @pytest.fixture
@@ -51,3 +56,28 @@ def test_CycleController_step(cycle_spec):
     assert controller.step(1.0, 1.0, 0.5) == complex(10, 0)
     assert controller.step(8.0 * 3600, 1.0, 0.2) == complex(-10, 0)
     assert controller.step(9.0 * 3600, 1.0, 0.9) == complex(-10, 0)
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_send_soc_to_ems(binary):
+    broker_name = f"broker-{uuid.uuid4().hex}"
+    broker = helics.helicsCreateBroker("inproc", broker_name, "-f 1")
+    federate = helics.helicsCreateCombinationFederateFromConfig(json.dumps(
+        {"name": "foo", "core_type": "inproc",
+         "core_name": f"core-{broker_name}", "broker": broker_name}
+    ))
+    try:
+        federate.register_global_endpoint("storage.foo.control")
+        ems = federate.register_global_endpoint("ems/control")
+        codec = MessageCodec(["foo"], binary=binary)
+        federate.enter_executing_mode()
+        federate.request_time(1.0)
+        storage._send_soc_to_ems(0.25, 1.0, federate, codec)
+        federate.request_time(2.0)
+        assert ems.has_message()
+        message = ems.get_message()
+        assert message.source == "storage.foo.control"
+        assert codec.decode(message.raw_data) == StorageStatus("foo", 0.25)
+    finally:
+        federate.disconnect()
+        broker.wait_for_disconnect()
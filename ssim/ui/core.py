@@ -8,18 +8,28 @@ import json
 import logging
 import os
 import shutil
+import signal
+import socket
 import subprocess
+import threading
+import zlib
 from os import path, makedirs
 from pathlib import Path, PurePosixPath
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import pkg_resources
 import tomli
-from ssim import dssutil, grid
-from ssim.metrics import MetricManager, MetricTimeAccumulator
+from ssim import dssutil, grid, reliability
+from ssim.federates.local import run_local
+from ssim.metrics import MetricBank, MetricManager, MetricTimeAccumulator
+from ssim.modelcache import ModelCache
 from ssim.opendss import DSSModel
+from ssim.resultcache import ResultCache
+from ssim.resultstore import ColumnStore
 
 
 # To Do
@@ -468,7 +478,13 @@ class Project:
         # Return a toml string containing the reliability params
         top_level_table = ["reliability"]
         ret = [f"[{'.'.join(top_level_table)}]"]
+        # values such as the seed must come before the model tables
+        for key, value in self.reliability_params.items():
+            if not isinstance(value, dict):
+                ret.append(_to_toml(key, value))
         for model, params in self.reliability_params.items():
+            if not isinstance(params, dict):
+                continue
             ret.append(f"[{'.'.join(top_level_table + [model])}]")
             for param, value in params.items():
                 ret.append(_to_toml(param, value))
@@ -581,6 +597,20 @@ class Project:
     def add_storage_option(self, storage_options):
         self.storage_devices.append(storage_options)
 
+    @property
+    def reliability_seed(self) -> int:
+        """Seed of the reliability models.
+
+        Every configuration in the project uses the same seed, so all
+        configurations are evaluated under the same failures. If the
+        reliability parameters do not set a seed, one is derived from the
+        name of the project.
+        """
+        seed = self.reliability_params.get("seed")
+        if seed is None:
+            return zlib.crc32(self.name.encode())
+        return seed
+
     def configurations(self):
         """Return an iterator over all grid configurations to be evaluated."""
         for storage_configuration in self._storage_configurations():
@@ -594,7 +624,8 @@ class Project:
                 self.pvsystems,
                 storage_devices,
                 inv_controls,
-                reliability=self.reliability_params
+                reliability=dict(self.reliability_params,
+                                 seed=self.reliability_seed)
             )
 
     def _storage_configurations(self):
@@ -1381,6 +1412,11 @@ class MetricCongifuration:
         }
 
 
+#: Name of the file of precomputed reliability events in a configuration's
+#: output directory.
+RELIABILITY_EVENTS = "reliability_events.npz"
+
+
 class Configuration:
     """A specific grid configuration to be evaluated."""
 
@@ -1400,6 +1436,11 @@ class Configuration:
         self._federation_path = None
         self._proc = None
         self._workdir = Path(".")
+        self._broker_port = None
+        self._cache = None
+        self._cache_key = None
+        self._cached = False
+        self._replicate = None
 
     def __eq__(self, other):
         """Compares this instance of a Configuration to another for functional
@@ -1500,25 +1541,172 @@ class Configuration:
                         "utf-8"
                     )
                 )
+        if self._replicate is not None:
+            return f"{h.hexdigest()}-r{self._replicate}"
         return str(h.hexdigest())
 
-    def evaluate(self, basepath="."):
-        """Run the simulator for this configuration"""
+    def replicate(self, index, seed=None):
+        """Return a replicate of this configuration.
+
+        Replicates are used to evaluate a configuration under several
+        independent realizations of the reliability models. The random
+        stream of each grid component is derived from the seed, the
+        component name, and the replicate index, so replicate `index` of
+        every configuration with the same seed sees the same failures.
+        Each replicate has its own id, so replicates evaluated in the same
+        directory do not overwrite each other.
+
+        Parameters
+        ----------
+        index : int
+            Index of the replicate.
+        seed : int, optional
+            Seed for the reliability models. If not specified the seed in
+            this configuration's reliability parameters is used.
+
+        Returns
+        -------
+        Configuration
+        """
+        replicate = copy(self)
+        replicate.reliability = dict(self.reliability or {},
+                                     replicate=index)
+        if seed is not None:
+            replicate.reliability["seed"] = seed
+        replicate._replicate = index
+        replicate._proc = None
+        replicate._cached = False
+        replicate._cache_key = None
+        return replicate
+
+    def cache_key(self):
+        """Return a hash of everything that affects the simulation results.
+
+        The hash covers the grid configuration (storage, PV systems,
+        inverter controls, reliability parameters, and metrics), the
+        content of the grid model and irradiance profiles, the simulation
+        duration, the federate configurations, and the source code of
+        ssim.
+        It does not depend on where any of the files are stored, so
+        identical configurations in different project versions have the
+        same key.
+
+        Returns
+        -------
+        str or None
+            The hash, as a hexadecimal string, or None if the grid model
+            files could not be fingerprinted.
+        """
+        model_key = ModelCache().key(self.grid)
+        if model_key is None:
+            return None
+        h = hashlib.sha256()
+        config = self._grid_config()
+        config["dss_file"] = model_key
+        h.update(json.dumps(config, sort_keys=True, default=str).encode())
+        for pv in self.pvsystems:
+            profile = getattr(pv, "irradiance_profile", None)
+            if profile is not None and os.path.isfile(profile):
+                with open(profile, "rb") as f:
+                    h.update(hashlib.sha256(f.read()).digest())
+        h.update(repr(self.sim_duration).encode())
+        for federate in ("grid", "logger", "metrics", "reliability",
+                         "storage"):
+            with open(_get_federate_config(federate), "rb") as f:
+                h.update(f.read())
+        h.update(_ssim_source_hash().encode())
+        return h.hexdigest()
+
+    def evaluate(self, basepath=".", local=False, broker_port=None,
+                 cache: ResultCache = None):
+        """Run the simulator for this configuration
+
+        A HELICS federation runs in the background; call :py:meth:`wait`
+        for it to finish. A local federation has finished when this
+        method returns.
+
+        Parameters
+        ----------
+        basepath : PathLike, default "."
+            Directory where the output directory for the configuration is
+            created.
+        local : bool, default False
+            If True, run all federates in this process with a
+            :py:class:`ssim.federates.local.LocalFederation` instead of
+            starting a HELICS federation.
+        broker_port : int, optional
+            Port used by the HELICS broker. If not specified the broker
+            uses the default HELICS port, so only one federation can run at
+            a time.
+        cache : ResultCache, optional
+            Cache of results. If the results of an identical configuration
+            are in the cache they are restored instead of running the
+            simulation, otherwise the results are added to the cache when
+            the simulation finishes successfully. The cache is not used if
+            :py:meth:`cache_key` returns None.
+        """
         self._workdir = Path(basepath).absolute() / self.id
         makedirs(self._workdir, exist_ok=True)
         self._grid_path = PurePosixPath(self._workdir / "grid.json")
         self._federation_path = self._workdir / "federation.json"
+        self._broker_port = broker_port
         self._write_configuration()
-        self._run()
-        self._mark_done()
+        self._cache_key = None if cache is None else self.cache_key()
+        self._cache = None if self._cache_key is None else cache
+        self._cached = (self._cache is not None
+                        and cache.restore(self._cache_key, self._workdir))
+        if self._cached:
+            self._mark_done()
+        elif local:
+            self._write_reliability_events()
+            self._run_local()
+            self._mark_done()
+            self._cache_results()
+        else:
+            self._write_reliability_events()
+            self._run()
         return self._load_results()
 
     def wait(self):
+        """Wait for the HELICS federation to finish.
+
+        The configuration is marked as evaluated if the federation exits
+        successfully.
+
+        Returns
+        -------
+        int
+            Exit code of ``helics run``, or 0 if the results were restored
+            from the cache.
+        """
+        if self._cached:
+            return 0
         if self._proc is None:
             raise RuntimeError(
                 "Tried to wait on evaluation, but no evaluation running"
             )
-        return self._proc.wait()
+        returncode = self._proc.wait()
+        if returncode == 0:
+            self._mark_done()
+            self._cache_results()
+        return returncode
+
+    def cancel(self):
+        """Stop the HELICS federation if it is running.
+
+        ``helics run`` is started in a new session, so the federates it
+        started are stopped along with it.
+        """
+        if self._proc is None or self._proc.poll() is not None:
+            return
+        if not hasattr(os, "killpg"):
+            self._proc.terminate()
+            return
+        try:
+            os.killpg(self._proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            # every process in the group has already exited
+            pass
 
     def _write_configuration(self):
         with open(self._grid_path, 'w') as grid_file:
@@ -1526,14 +1714,63 @@ class Configuration:
         with open(self._federation_path, 'w') as federation_file:
             json.dump(self._federation_config(), federation_file)
 
+    def _precompute_reliability(self):
+        return reliability.precompute_enabled(self.reliability)
+
+    def _write_reliability_events(self):
+        """Compute the reliability events and add the event file to the grid
+        configuration, so no reliability federate is needed."""
+        if not self._precompute_reliability():
+            return
+        if reliability.network_reliability_enabled(self.reliability):
+            # building the model may compile the grid in the process's
+            # OpenDSS engine
+            with _reliability_model_lock:
+                model = reliability.GridReliabilityModel(self._grid_path)
+            timeline = reliability.EventTimeline.from_model(
+                model, self.sim_duration
+            )
+        else:
+            timeline = reliability.EventTimeline([], [])
+        events_path = self._workdir / RELIABILITY_EVENTS
+        timeline.save(events_path)
+        config = self._grid_config()
+        config["reliability_events"] = str(events_path)
+        with open(self._grid_path, 'w') as grid_file:
+            json.dump(config, grid_file)
+
     def _run(self):
         self._proc = subprocess.Popen(
             ["helics", "run", "--path", str(self._federation_path)],
-            cwd=self._workdir
+            cwd=self._workdir,
+            start_new_session=True
         )
 
+    def _run_local(self):
+        run_local(self._grid_path, self.sim_duration, self._workdir)
+
     def _mark_done(self):
         (self._workdir / "evaluated").touch()
+        try:
+            ProjectResults(self._workdir.parent).add_summary(self._workdir)
+        except (OSError, ValueError, KeyError):
+            logger.exception(
+                "could not add %s to the summary index", self._workdir
+            )
+
+    def _cache_results(self):
+        if self._cache is None:
+            return
+        # configuration files are written by evaluate() and the column
+        # store is rebuilt from the results when needed, so neither is
+        # cached
+        not_results = {"grid.json", "federation.json", "evaluated",
+                       ".columns", RELIABILITY_EVENTS}
+        not_results.update(
+            path.name for path in self._workdir.glob("*_federate.json")
+        )
+        self._cache.store(self._cache_key, self._workdir,
+                          exclude=not_results)
 
     def _load_results(self):
         # TODO load the output files/data into a results object (maybe
@@ -1589,16 +1826,43 @@ class Configuration:
 
     def _federation_config(self):
         config = {"name": str(self.id)}
-        self._configure_broker(config)
         self._configure_federates(config)
+        self._configure_broker(config)
         return config
 
     def _configure_broker(self, config):
-        # Simplest possible configuration: tell helics cli to
-        # automatically start the broker.
-        config["broker"] = True
+        if self._broker_port is None:
+            # Simplest possible configuration: tell helics cli to
+            # automatically start the broker.
+            config["broker"] = True
+            return config
+        # helics cli does not set the broker port, so the broker is
+        # started like any other federate.
+        config["broker"] = False
+        config["federates"].insert(0, _federate_spec(
+            "broker",
+            f"helics_broker -f {len(config['federates'])}"
+            f" --port={self._broker_port}"
+        ))
         return config
 
+    def _federate_config(self, federate):
+        """Return the path to the configuration file for the federate type.
+
+        If the broker port is set a copy of the configuration that connects
+        to the broker on that port is written to the working directory.
+        """
+        config_path = _get_federate_config(federate)
+        if self._broker_port is None:
+            return config_path
+        with open(config_path) as f:
+            config = json.load(f)
+        config["broker_port"] = self._broker_port
+        local_path = PurePosixPath(self._workdir / f"{federate}_federate.json")
+        with open(local_path, 'w') as f:
+            json.dump(config, f)
+        return local_path
+
     def _configure_federates(self, config):
         # specify the EMS federate ?
         # lookup and specify the path(s) the the federate config files
@@ -1608,37 +1872,199 @@ class Configuration:
                                       f"metrics-federate"
                                       f" --hours {self.sim_duration}"
                                       f" {self._grid_path}"
-                                      f" {_get_federate_config('metrics')}"
+                                      f" {self._federate_config('metrics')}"
                                   ),
                                   _federate_spec(
                                       "logger",
                                       f"logger-federate --hours {self.sim_duration}"
                                       f" {self._grid_path}"
-                                      f" {_get_federate_config('logger')}"
+                                      f" {self._federate_config('logger')}"
                                   ),
                                   _federate_spec(
                                       "grid",
                                       f"grid-federate --hours {self.sim_duration}"
                                       f" {self._grid_path}"
-                                      f" {_get_federate_config('grid')}"
+                                      f" {self._federate_config('grid')}"
                                   ),
-                                  _federate_spec(
-                                      "reliability",
-                                      f"reliability-federate --hours {self.sim_duration}"
-                                      f" {self._grid_path}"
-                                      f" {_get_federate_config('reliability')}"
-                                  )
                               ] + list(
             _storage_federate_spec(
-                ess.name, self._grid_path, self.sim_duration)
+                ess.name, self._grid_path, self.sim_duration,
+                self._federate_config('storage'))
             for ess in self.storage if ess is not None
         )
+        # precomputed reliability events are replayed by the grid federate
+        if not self._precompute_reliability():
+            config["federates"].append(_federate_spec(
+                "reliability",
+                f"reliability-federate --hours {self.sim_duration}"
+                f" {self._grid_path}"
+                f" {self._federate_config('reliability')}"
+            ))
         return config
 
     def is_evaluated(self):
         return self.results is not None
 
 
+#: First port assigned to a HELICS broker by a ConfigurationScheduler.
+DEFAULT_BASE_PORT = 24000
+
+#: Number of ports reserved for each federation run by a
+#: ConfigurationScheduler. The ZMQ broker assigns ports to the federates
+#: that connect to it starting just above its own port.
+PORTS_PER_FEDERATION = 50
+
+
+def _port_available(port):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        try:
+            s.bind(("localhost", port))
+        except OSError:
+            return False
+    return True
+
+
+class _PortPool:
+    """Broker ports for federations running at the same time."""
+
+    def __init__(self, base_port):
+        self._base_port = base_port
+        self._in_use = set()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            for port in range(self._base_port, 65536 - PORTS_PER_FEDERATION,
+                              PORTS_PER_FEDERATION):
+                if port in self._in_use:
+                    continue
+                if _port_available(port) and _port_available(port + 1):
+                    self._in_use.add(port)
+                    return port
+        raise RuntimeError("No free ports for a HELICS broker.")
+
+    def release(self, port):
+        with self._lock:
+            self._in_use.discard(port)
+
+
+class ConfigurationScheduler:
+    """Evaluate several configurations at the same time.
+
+    Each configuration is run in its own working directory (see
+    :py:meth:`Configuration.evaluate`). HELICS federations that run at the
+    same time are given different broker ports so they do not interfere
+    with each other.
+
+    Parameters
+    ----------
+    basepath : PathLike
+        Directory where the output directory for each configuration is
+        created.
+    max_workers : int, optional
+        Maximum number of configurations evaluated at the same time.
+        Defaults to the number of CPUs. Ignored if `local` is True.
+    local : bool, default False
+        If True, run each configuration with a local federation (see
+        :py:meth:`Configuration.evaluate`). Local federations share the
+        process's OpenDSS engine and working directory, so they are run
+        one at a time.
+    base_port : int, default DEFAULT_BASE_PORT
+        Lowest port assigned to a HELICS broker.
+    progress : Callable, optional
+        Called as ``progress(configuration, completed, total)`` each time
+        a configuration finishes. It is called from a worker thread.
+    cache : ResultCache, optional
+        Cache of results. Configurations with cached results are not
+        simulated again.
+    """
+
+    def __init__(self, basepath, max_workers=None, local=False,
+                 base_port=DEFAULT_BASE_PORT, progress=None,
+                 cache: ResultCache = None):
+        self.basepath = basepath
+        self.cache = cache
+        if local:
+            max_workers = 1
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.local = local
+        self._ports = _PortPool(base_port)
+        self._progress = progress
+        self._canceled = threading.Event()
+        # Configuration is not hashable, running configurations are keyed
+        # by id().
+        self._running = {}
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._total = 0
+
+    @property
+    def canceled(self):
+        """True if :py:meth:`cancel` has been called."""
+        return self._canceled.is_set()
+
+    def run(self, configurations):
+        """Evaluate `configurations`, returning when all have finished.
+
+        Parameters
+        ----------
+        configurations : Iterable[Configuration]
+            The configurations to evaluate.
+
+        Returns
+        -------
+        list of Configuration
+            The configurations that were successfully evaluated. If the run
+            is canceled this does not include configurations that were
+            stopped or never started.
+        """
+        configurations = list(configurations)
+        self._completed = 0
+        self._total = len(configurations)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            evaluated = list(executor.map(self._evaluate, configurations))
+        return [configuration
+                for configuration, done in zip(configurations, evaluated)
+                if done]
+
+    def cancel(self):
+        """Stop all running federations and skip configurations that have
+        not started."""
+        self._canceled.set()
+        with self._lock:
+            running = list(self._running.values())
+        for configuration in running:
+            configuration.cancel()
+
+    def _evaluate(self, configuration):
+        if self.canceled:
+            return False
+        port = None if self.local else self._ports.acquire()
+        try:
+            with self._lock:
+                self._running[id(configuration)] = configuration
+            # a run canceled while the configuration was being added is
+            # not stopped by cancel()
+            if self.canceled:
+                return False
+            configuration.evaluate(self.basepath, local=self.local,
+                                   broker_port=port, cache=self.cache)
+            done = self.local or configuration.wait() == 0
+        finally:
+            with self._lock:
+                self._running.pop(id(configuration), None)
+            if port is not None:
+                self._ports.release(port)
+        if self.canceled and not done:
+            return False
+        with self._lock:
+            self._completed += 1
+            completed = self._completed
+        if self._progress is not None:
+            self._progress(configuration, completed, self._total)
+        return done
+
+
 def _to_toml(key, value):
     # turn a key, value pair into a valid one-line toml string
     if isinstance(value, dict):
@@ -1656,11 +2082,44 @@ def _dict_to_toml(value):
     return "{" + table + "}"
 
 
-def _storage_federate_spec(name, grid_path, sim_duration):
+#: Directories in the ssim package that do not affect simulation results.
+_NON_SIMULATION_DIRS = {("tests",), ("ui", "kivy"), ("ui", "libs")}
+
+
+@functools.lru_cache(maxsize=None)
+def _ssim_source_hash():
+    """Return a hash of the ssim source code used by simulations.
+
+    The hash covers every Python and JSON file in the package except the
+    tests and the user interface, so it changes with any edit to the
+    simulation code, whether or not ssim is installed from a release.
+    """
+    package_dir = Path(__file__).resolve().parent.parent
+    h = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(package_dir):
+        relative = Path(dirpath).relative_to(package_dir)
+        dirnames[:] = sorted(
+            name for name in dirnames
+            if name != "__pycache__"
+            and (*relative.parts, name) not in _NON_SIMULATION_DIRS
+        )
+        for filename in sorted(filenames):
+            if Path(filename).suffix not in {".py", ".json"}:
+                continue
+            h.update((relative / filename).as_posix().encode())
+            with open(Path(dirpath) / filename, "rb") as f:
+                h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+def _storage_federate_spec(name, grid_path, sim_duration,
+                           federate_config=None):
+    if federate_config is None:
+        federate_config = _get_federate_config('storage')
     return _federate_spec(
         name,
         f"storage-federate {name} --hours {sim_duration}"
-        f" {grid_path} {_get_federate_config('storage')}"
+        f" {grid_path} {federate_config}"
     )
 
 
@@ -1697,9 +2156,26 @@ def _get_federate_config(federate):
     )
 
 
+# Serializes construction of reliability models by configurations that
+# are evaluated concurrently.
+_reliability_model_lock = threading.Lock()
+
+
+#: Name of the file in a project version directory that holds the summary
+#: of each evaluated configuration, one JSON object per line.
+SUMMARY_INDEX = "summary.jsonl"
+
+# Serializes appends to summary indexes from scheduler threads.
+_summary_lock = threading.Lock()
+
+
 class ProjectResults:
     """Container of all results for a project.
 
+    A summary of every configuration (see :py:meth:`Results.summary`) is
+    kept in an index that is updated as each configuration finishes, so
+    configurations can be compared without reading their result files.
+
     Parameters
     ----------
     project : Project
@@ -1707,7 +2183,54 @@ class ProjectResults:
     """
 
     def __init__(self, base_dir):
-        self.base_dir = base_dir
+        self.base_dir = Path(base_dir)
+
+    def add_summary(self, config_dir):
+        """Add the summary of the results in `config_dir` to the index.
+
+        If the configuration is already in the index its summary is
+        replaced.
+
+        Parameters
+        ----------
+        config_dir : PathLike
+            The output directory of the configuration.
+        """
+        line = json.dumps(Results(Path(config_dir)).summary()) + "\n"
+        with _summary_lock:
+            with open(self.base_dir / SUMMARY_INDEX, "a") as f:
+                f.write(line)
+
+    def update_summary(self):
+        """Add every evaluated configuration that is missing from the index.
+
+        This only needs to be called for results that were produced before
+        the index was introduced.
+        """
+        indexed = set(self.summary()["configuration"])
+        for item in self._resulted_configurations():
+            if item not in indexed:
+                self.add_summary(self.base_dir / item)
+
+    def summary(self) -> pd.DataFrame:
+        """Return the summary of every configuration in the index.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per configuration with the columns described in
+            :py:meth:`Results.summary`.
+        """
+        try:
+            with open(self.base_dir / SUMMARY_INDEX) as f:
+                rows = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            rows = []
+        if len(rows) == 0:
+            return pd.DataFrame(columns=["configuration"])
+        return pd.DataFrame(rows).drop_duplicates(
+            "configuration", keep="last"
+        ).reset_index(drop=True)
 
     def results(self):
         # Iterate over the resulted configurations and yield iterator of Results
@@ -1735,6 +2258,41 @@ class ProjectResults:
     def _is_evaluated(self, item):
         return os.path.exists(self.base_dir / item / "evaluated")
 
+    def rescore(self, metrics: dict, max_workers=None) -> dict:
+        """Recompute the metrics of every evaluated configuration.
+
+        The metrics are computed from the stored bus voltages of each
+        configuration (see :py:meth:`Results.rescore`), so changing the
+        limits or objective of a metric does not require the configurations
+        to be simulated again. Configurations are re-scored in parallel.
+
+        Parameters
+        ----------
+        metrics : dict
+            Map from metric category to the MetricManager with the new metric
+            definitions, as in :py:class:`Project`.
+        max_workers : int, optional
+            Maximum number of configurations re-scored at the same time. By
+            default the :py:class:`concurrent.futures.ThreadPoolExecutor`
+            default is used.
+
+        Returns
+        -------
+        dict
+            Map from the name of each configuration directory to the
+            re-scored metrics, in the format returned by
+            :py:meth:`Results.metrics_log`.
+        """
+        results = list(self.results())
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            scores = executor.map(
+                lambda result: result.rescore(metrics), results
+            )
+            return {
+                Path(result.config_dir).name: score
+                for result, score in zip(results, scores)
+            }
+
     # TO DO: Add methods for the plotting function
     def plot_metrics(self):
         for result in self.results():
@@ -1769,68 +2327,227 @@ def is_valid_opendss_name(name: str) -> bool:
 
 
 class Results:
-    """Results from simulating a specific configuration."""
+    """Results from simulating a specific configuration.
+
+    The CSV files written by the simulation are converted once to a
+    columnar store (see :py:class:`ssim.resultstore.ColumnStore`) in the
+    ".columns" subdirectory, so each method can load only the columns it
+    is asked for.
+    """
 
     def __init__(self, config_dir):
         self.config_dir = config_dir
+        self._store = ColumnStore(Path(config_dir) / ".columns")
 
-    def _extract_data(self, csv_file):
-        df_extracted_data = pd.read_csv(self.config_dir / csv_file)
+    def _extract_data(self, csv_file, columns=None):
+        table = self._store.table(Path(self.config_dir) / csv_file)
         # extract column names
-        col_names = list(df_extracted_data.columns)
+        col_names = table.columns
         # extract all datapoints as a pandas dataframe
-        num_rows = df_extracted_data.shape[0]
-        data = df_extracted_data.iloc[0:num_rows - 1]
+        data = table.read(columns)
+        num_rows = data.shape[0]
+        data = data.iloc[0:num_rows - 1]
         return col_names, data
 
-    def bus_voltages(self):
+    def bus_voltages(self, columns=None):
         """Returns name of columns (bus names) and the time-series bus
-        voltages as a pandas dataframe."""
-        bus_names, bus_voltages = self._extract_data("bus_voltage.csv")
+        voltages as a pandas dataframe. If `columns` is given only those
+        columns are loaded."""
+        bus_names, bus_voltages = self._extract_data("bus_voltage.csv",
+                                                     columns)
         return bus_names, bus_voltages
 
-    def grid_state(self):
+    def grid_state(self, columns=None):
         """Returns name of columns (grid states) and the time-series data
-        as a pandas dataframe."""
-        states, state_data = self._extract_data("grid_state.csv")
+        as a pandas dataframe. If `columns` is given only those columns are
+        loaded."""
+        states, state_data = self._extract_data("grid_state.csv", columns)
         return states, state_data
 
-    def pde_loading(self):
+    def pde_loading(self, columns=None):
         """Returns name of the columns (power delivery elements with
         the OpenDSS model) and the loading of the power delievery elements
-        as a pandas dataframe."""
-        pde_elements, pde_loading = self._extract_data("pde_loading.csv")
+        as a pandas dataframe. If `columns` is given only those columns are
+        loaded."""
+        pde_elements, pde_loading = self._extract_data("pde_loading.csv",
+                                                       columns)
         return pde_elements, pde_loading
 
-    def storage_state(self):
+    def storage_state(self, columns=None):
         """Returns name of the columns (states specific to storage devices
-        in OpendDSS model) and the time-series data as a pandas dataframe."""
+        in OpendDSS model) and the time-series data as a pandas dataframe.
+        If `columns` is given only those columns are loaded."""
         storage_state_file = Path(self.config_dir / "storage_power.csv")
         if storage_state_file.is_file():
-            storage_states, storage_state_data = self._extract_data("storage_power.csv")
+            storage_states, storage_state_data = self._extract_data(
+                "storage_power.csv", columns)
         else:
             storage_states, storage_state_data = [], []
         return storage_states, storage_state_data
 
-    def storage_voltages(self):
+    def storage_voltages(self, columns=None):
         """Returns name of the columns (buses) where storage is placed and
-        voltages at those buses as a pandas dataframe"""
+        voltages at those buses as a pandas dataframe. If `columns` is given
+        only those columns are loaded."""
         storage_voltages_file = Path(self.config_dir / "storage_voltage.csv")
         if storage_voltages_file.is_file():
-            storage_buses, storage_voltages = self._extract_data("storage_voltage.csv")
+            storage_buses, storage_voltages = self._extract_data(
+                "storage_voltage.csv", columns)
         else:
             storage_buses, storage_voltages = [], []
         return storage_buses, storage_voltages
 
-    def metrics_log(self):
+    def _optional_table(self, csv_file):
+        path = Path(self.config_dir) / csv_file
+        if not path.is_file():
+            return None
+        return self._store.table(path)
+
+    def summary(self) -> dict:
+        """Return a summary of the configuration and its results.
+
+        The summary contains the name of the configuration directory
+        ("configuration"), the bus, power, capacity, and controller of each
+        storage device ("<device>_bus", "<device>_kw", "<device>_kwh",
+        "<device>_controller"), the accumulated metric
+        ("accumulated_metric"), the lowest and highest voltage at any
+        energized node ("min_voltage", "max_voltage"), the highest loading
+        of any power delivery element ("max_loading"), and the total energy
+        charged and discharged by all storage devices
+        ("storage_throughput_kwh"). Values that cannot be computed because a
+        result file is missing are None.
+        """
+        config_dir = Path(self.config_dir)
+        summary = {"configuration": config_dir.name}
+        grid_config = config_dir / "grid.json"
+        if grid_config.is_file():
+            with open(grid_config) as f:
+                storage = json.load(f).get("storage", [])
+            for device in storage:
+                name = device["name"]
+                summary[f"{name}_bus"] = device["bus"]
+                summary[f"{name}_kw"] = device["kwrated"]
+                summary[f"{name}_kwh"] = device["kwhrated"]
+                summary[f"{name}_controller"] = device["controller"]
+        summary["accumulated_metric"] = None
+        metrics = self._optional_table("metric_log.csv")
+        if metrics is not None and len(metrics) > 0:
+            summary["accumulated_metric"] = float(metrics.column("time")[-1])
+        summary["min_voltage"] = None
+        summary["max_voltage"] = None
+        state = self._optional_table("grid_state.csv")
+        if state is not None:
+            vmin = state.column("vmin")
+            vmax = state.column("vmax")
+            # rows with no energized nodes have vmin > vmax
+            energized = vmin <= vmax
+            if energized.any():
+                summary["min_voltage"] = float(vmin[energized].min())
+                summary["max_voltage"] = float(vmax[energized].max())
+        summary["max_loading"] = None
+        loading = self._optional_table("pde_loading.csv")
+        if loading is not None and len(loading) > 0 \
+                and len(loading.columns) > 1:
+            summary["max_loading"] = float(max(
+                np.nanmax(loading.column(name))
+                for name in loading.columns[1:]
+            ))
+        summary["storage_throughput_kwh"] = None
+        storage_power = self._optional_table("storage_power.csv")
+        if storage_power is not None:
+            hours = np.diff(storage_power.column("time")) / 3600
+            throughput = 0.0
+            for name in storage_power.columns:
+                if name.endswith("_discharge_kw") or \
+                        name.endswith("_charge_kw"):
+                    throughput += float(
+                        np.dot(hours, storage_power.column(name)[:-1])
+                    )
+            summary["storage_throughput_kwh"] = throughput
+        return summary
+
+    def _bus_voltage_series(self):
+        """Return the times, bus names, and voltages from "bus_voltage.npz",
+        or from "bus_voltage.csv" if there is no archive."""
+        archive = Path(self.config_dir) / "bus_voltage.npz"
+        if archive.is_file():
+            with np.load(archive) as data:
+                return (data["time"], list(data["busses"]),
+                        data["voltage"])
+        df_voltage = pd.read_csv(Path(self.config_dir) / "bus_voltage.csv")
+        return (df_voltage["time"].to_numpy(),
+                list(df_voltage.columns[1:]),
+                df_voltage.iloc[:, 1:].to_numpy())
+
+    def rescore(self, metrics: dict, output_file=None):
+        """Recompute the bus voltage metrics from the stored bus voltages.
+
+        The voltages recorded during the simulation are normalized and
+        accumulated with the supplied metric definitions, producing the same
+        values the metrics federate would have logged in "metric_log.csv"
+        had the configuration been simulated with these metrics.
+
+        Parameters
+        ----------
+        metrics : dict
+            Map from metric category to the MetricManager with the new metric
+            definitions, as in :py:class:`Project`. Only the
+            "Bus Voltage" category is used.
+        output_file : PathLike, optional
+            If provided, the re-scored metrics are also written to this file
+            in the format of "metric_log.csv".
+
+        Returns
+        -------
+        tuple
+            Name of columns of the metrics, the accumulated value of all
+            metrics, and the time-series of normalized values as a pandas
+            dataframe (see :py:meth:`metrics_log`).
+
+        Raises
+        ------
+        ValueError
+            If a metric is defined for a bus whose voltage was not recorded.
+        """
+        voltage_metrics = metrics.get("Bus Voltage") or MetricManager()
+        names = list(voltage_metrics.all_metrics)
+        times, busses, voltage = self._bus_voltage_series()
+        columns = {bus: index for index, bus in enumerate(busses)}
+        missing = [name for name in names if name not in columns]
+        if len(missing) > 0:
+            raise ValueError(
+                f"No stored voltage for busses {missing}; the configuration "
+                "must be simulated again to compute their metrics."
+            )
+        bank = MetricBank(
+            accumulator.metric
+            for accumulator in voltage_metrics.all_metrics.values()
+        )
+        values = bank.accumulate_series(
+            voltage[:, [columns[name] for name in names]], times
+        )
+        col_names = ["time"] + names
+        data = pd.DataFrame(
+            np.column_stack([times, values]), columns=col_names
+        )
+        accumulated_metric = bank.total_accumulation
+        if output_file is not None:
+            with open(output_file, "w", newline="") as f:
+                data.to_csv(f, index=False)
+                f.write(f"{accumulated_metric}\n")
+        return col_names, accumulated_metric, data
+
+    def metrics_log(self, columns=None):
         """Returns name of columns of the logged metrics, the accumulated value
-        of the metric, and the time-series log as a pandas dataframe."""
-        df_metrics = pd.read_csv(self.config_dir / "metric_log.csv")
+        of the metric, and the time-series log as a pandas dataframe. If
+        `columns` is given only those columns are loaded."""
+        table = self._store.table(Path(self.config_dir) / "metric_log.csv")
         # extract column names
-        col_names = list(df_metrics.columns)
-        num_rows = df_metrics.shape[0]
+        col_names = table.columns
         # extract accumulated value of the metric from the last row
-        accumulated_metric = df_metrics.iloc[-1:].loc[num_rows - 1, 'time']
+        accumulated_metric = table.column("time")[-1]
         # extract all the datapoints as a pandas dataframe
+        df_metrics = table.read(columns)
+        num_rows = df_metrics.shape[0]
         data = df_metrics.iloc[0: num_rows - 1]
         return col_names, accumulated_metric, data
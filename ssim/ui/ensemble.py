@@ -0,0 +1,264 @@
+"""Monte Carlo evaluation of configurations under reliability events.
+
+A single simulation samples one realization of the line, switch, and
+generator failures, so metrics from one run say little about how a storage
+configuration performs on average. A :py:class:`ReliabilityEnsemble`
+evaluates replicates of a configuration that differ only in the replicate
+index used to seed the reliability models, collects a set of statistics
+from each replicate, and reports a confidence interval for the mean of
+each statistic. New
+replicates are started in batches until the interval of the target
+statistic is narrow enough or the maximum number of replicates is reached.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from os import PathLike
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from ssim.resultcache import ResultCache
+from ssim.ui.core import Configuration, ConfigurationScheduler, Results
+
+#: Statistics from :py:meth:`Results.summary` that are collected for each
+#: replicate.
+SUMMARY_STATISTICS = ("accumulated_metric", "min_voltage", "max_voltage",
+                      "max_loading", "storage_throughput_kwh")
+
+
+def confidence_interval(values, confidence=0.95):
+    """Return the mean of `values` and the half-width of its confidence
+    interval.
+
+    The interval is computed with Student's t-distribution. Missing values
+    are ignored.
+
+    Parameters
+    ----------
+    values : array_like
+        Samples.
+    confidence : float, default 0.95
+        Confidence level of the interval.
+
+    Returns
+    -------
+    mean : float
+        Sample mean, or NaN if there are no samples.
+    half_width : float
+        Half-width of the interval, or infinity if there are fewer than two
+        samples.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    n = len(values)
+    if n == 0:
+        return math.nan, math.inf
+    mean = float(values.mean())
+    if n < 2:
+        return mean, math.inf
+    sem = values.std(ddof=1) / math.sqrt(n)
+    return mean, float(stats.t.ppf((1 + confidence) / 2, n - 1) * sem)
+
+
+def outage_statistics(result_dir: PathLike, sim_duration: float) -> dict:
+    """Return the number of failures and the total outage time in the event
+    log of a simulation.
+
+    An outage lasts from a failure that opens an element until the element
+    is restored, or until the end of the simulation.
+
+    Parameters
+    ----------
+    result_dir : PathLike
+        Directory containing "event_log.csv".
+    sim_duration : float
+        Length of the simulation. [hours]
+
+    Returns
+    -------
+    dict
+        "failures", the number of failure events, and "outage_hours", the
+        sum of the outage durations of all elements. Both are None if there
+        is no event log.
+    """
+    try:
+        events = pd.read_csv(Path(result_dir) / "event_log.csv")
+    except FileNotFoundError:
+        return {"failures": None, "outage_hours": None}
+    end = sim_duration * 3600
+    failures = 0
+    outage = 0.0
+    for _, element_events in events.groupby("element", sort=False):
+        opened = None
+        for time, kind, connection in element_events[
+                ["time", "type", "connection"]].itertuples(index=False):
+            if kind == "fail":
+                failures += 1
+                if connection == "open" and opened is None:
+                    opened = time
+            elif opened is not None:
+                outage += time - opened
+                opened = None
+        if opened is not None:
+            outage += end - opened
+    return {"failures": failures, "outage_hours": outage / 3600}
+
+
+@dataclass
+class EnsembleResult:
+    """Statistics from the replicates of a :py:class:`ReliabilityEnsemble`.
+    """
+
+    #: One row of statistics per evaluated replicate.
+    replicates: pd.DataFrame
+
+    #: Mean, confidence interval, and number of samples of each statistic.
+    intervals: pd.DataFrame
+
+    #: True if the interval of the target statistic met the tolerance.
+    converged: bool
+
+
+class ReliabilityEnsemble:
+    """Evaluate replicates of a configuration until the mean of a statistic
+    is known with enough confidence.
+
+    Replicates are evaluated with a :py:class:`ConfigurationScheduler` in
+    the directory "replicates" inside the configuration's output directory.
+    They are evaluated in batches; after each batch the confidence interval
+    of `statistic` is computed and no more replicates are started once its
+    half-width is at most ``max(tolerance * abs(mean), abs_tolerance)``.
+
+    Parameters
+    ----------
+    configuration : Configuration
+        The configuration to evaluate.
+    basepath : PathLike
+        Directory where the output directory for the configuration is
+        created.
+    seed : int, optional
+        Seed of the reliability models. If not specified the seed in the
+        configuration's reliability parameters is used. Replicates differ
+        only in their replicate index, so ensembles of different
+        configurations with the same seed see the same failures in each
+        replicate, which reduces the variance of differences between them.
+    statistic : str, default "accumulated_metric"
+        Statistic that determines when to stop. One of
+        :py:data:`SUMMARY_STATISTICS`, "failures", or "outage_hours".
+    confidence : float, default 0.95
+        Confidence level of the intervals.
+    tolerance : float, default 0.05
+        Target half-width of the interval relative to the mean.
+    abs_tolerance : float, default 0.0
+        Target half-width of the interval.
+    min_replicates : int, default 10
+        Number of replicates evaluated before checking the interval.
+    max_replicates : int, default 200
+        Largest number of replicates evaluated.
+    batch_size : int, optional
+        Number of replicates started between checks of the interval.
+        Defaults to the number of workers.
+    max_workers : int, optional
+        Maximum number of replicates evaluated at the same time.
+    local : bool, default False
+        If True, run each replicate with a local federation.
+    cache : ResultCache, optional
+        Cache of results. Replicates with the same seed and index are only
+        simulated once.
+    """
+
+    def __init__(self, configuration: Configuration, basepath: PathLike,
+                 seed=None, statistic="accumulated_metric", confidence=0.95,
+                 tolerance=0.05, abs_tolerance=0.0, min_replicates=10,
+                 max_replicates=200, batch_size=None, max_workers=None,
+                 local=False, cache: Optional[ResultCache] = None):
+        self.configuration = configuration
+        self.seed = seed
+        self.statistic = statistic
+        self.confidence = confidence
+        self.tolerance = tolerance
+        self.abs_tolerance = abs_tolerance
+        self.min_replicates = min_replicates
+        self.max_replicates = max_replicates
+        self.replicate_dir = (Path(basepath).absolute() / configuration.id
+                              / "replicates")
+        self.scheduler = ConfigurationScheduler(
+            self.replicate_dir, max_workers=max_workers, local=local,
+            cache=cache
+        )
+        self.batch_size = batch_size or self.scheduler.max_workers
+
+    def cancel(self):
+        """Stop the running replicates and do not start any more."""
+        self.scheduler.cancel()
+
+    def replicates(self, start, stop) -> List[Configuration]:
+        """Return the replicates with indices from `start` to `stop`."""
+        return [self.configuration.replicate(index, self.seed)
+                for index in range(start, stop)]
+
+    def run(self) -> EnsembleResult:
+        """Evaluate replicates until the interval of the target statistic
+        meets the tolerance.
+
+        Returns
+        -------
+        EnsembleResult
+        """
+        rows = []
+        started = 0
+        converged = False
+        while started < self.max_replicates and not self.scheduler.canceled:
+            stop = min(max(self.min_replicates, started + self.batch_size),
+                       self.max_replicates)
+            batch = self.replicates(started, stop)
+            started = stop
+            for replicate in self.scheduler.run(batch):
+                rows.append(self._statistics(replicate))
+            if len(rows) >= self.min_replicates:
+                converged = self._converged(rows)
+                if converged:
+                    break
+        replicates = pd.DataFrame(
+            rows, columns=["replicate", "seed", *SUMMARY_STATISTICS,
+                           "failures", "outage_hours"]
+        ).sort_values("replicate", ignore_index=True)
+        return EnsembleResult(replicates, self._intervals(replicates),
+                              converged)
+
+    def _statistics(self, replicate: Configuration) -> dict:
+        result_dir = self.replicate_dir / replicate.id
+        summary = Results(result_dir).summary()
+        row = {"replicate": replicate._replicate,
+               "seed": replicate.reliability.get("seed")}
+        row.update({name: summary[name] for name in SUMMARY_STATISTICS})
+        row.update(outage_statistics(result_dir, replicate.sim_duration))
+        return row
+
+    def _converged(self, rows) -> bool:
+        mean, half_width = confidence_interval(
+            [np.nan if row[self.statistic] is None else row[self.statistic]
+             for row in rows],
+            self.confidence
+        )
+        return half_width <= max(self.tolerance * abs(mean),
+                                 self.abs_tolerance)
+
+    def _intervals(self, replicates: pd.DataFrame) -> pd.DataFrame:
+        intervals = {}
+        for name in (*SUMMARY_STATISTICS, "failures", "outage_hours"):
+            values = pd.to_numeric(replicates[name], errors="coerce")
+            mean, half_width = confidence_interval(values, self.confidence)
+            intervals[name] = {
+                "mean": mean,
+                "std": values.std(ddof=1),
+                "lower": mean - half_width,
+                "upper": mean + half_width,
+                "samples": int(values.notna().sum())
+            }
+        return pd.DataFrame.from_dict(intervals, orient="index")
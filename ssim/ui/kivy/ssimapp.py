@@ -6,9 +6,10 @@ from pickle import NONE
 import re
 from contextlib import ExitStack
 from math import cos, hypot
-from threading import Thread
+from threading import Event, Thread
 from typing import List
 from ssim.opendss import DSSModel
+from ssim.resultcache import ResultCache
 
 import kivy
 import matplotlib as mpl
@@ -61,6 +62,7 @@ from ssim.metrics import ImprovementType, Metric, MetricTimeAccumulator
 import ssim.ui
 from ssim.ui import (
     Configuration,
+    ConfigurationScheduler,
     Project,
     StorageControl,
     StorageOptions,
@@ -3037,7 +3039,7 @@ class RunProgressPopupContent(BoxLayout):
         """Tell the progress bar to advance its progress."""
         self.ids.progress.value += 1
         self.text = (
-            f"Running simulation {self.ids.progress.value + 1} out of {self.max}."
+            f"Completed {int(self.ids.progress.value)} of {self.max} simulations."
         )
 
 
@@ -3048,7 +3050,8 @@ class RunSimulationScreen(SSimBaseScreen):
         self.configurations: List[Configuration] = []
         self.storage_options: List[StorageOptions] = []
         self._run_thread = None
-        self._canceled = False
+        self._scheduler = None
+        self._cancel_requested = Event()
 
     def on_enter(self):
         # populate configurations list
@@ -3234,28 +3237,42 @@ class RunSimulationScreen(SSimBaseScreen):
         self._update_configurations_to_eval()
 
         # step 2: evaluate the selected configurations
-        for config in checkpoint.configurations():
-            if config.id not in self.configurations_to_eval:
-                continue
-            if self._canceled:
-                Logger.debug("evaluation canceled")
-                break
-            Logger.debug("Currently Running configuration:")
-            Logger.debug(self.config_id_to_name[config.id])
-            Logger.debug("==========================================")
-            config.evaluate(basepath=checkpoint.checkpoint_dir)
-            config.wait()
-            self._progress_popup.content.increment()
+        configs = [config for config in checkpoint.configurations()
+                   if config.id in self.configurations_to_eval]
+        # results are shared by all versions of the project
+        cache = ResultCache(
+            os.path.join(checkpoint.version_manager.basedir, "result-cache")
+        )
+        self._scheduler = ConfigurationScheduler(
+            checkpoint.checkpoint_dir, progress=self._on_config_evaluated,
+            cache=cache
+        )
+        # the run may have been canceled before the scheduler existed
+        if self._cancel_requested.is_set():
+            self._scheduler.cancel()
+        self._scheduler.run(configs)
+        if self._scheduler.canceled:
+            Logger.debug("evaluation canceled")
         Logger.debug("clearing progress popup")
-        self._canceled = False
-        self._progress_popup.dismiss()
+        Clock.schedule_once(lambda _dt: self._progress_popup.dismiss())
+
+    def _on_config_evaluated(self, config, completed, total):
+        """Called from the scheduler's worker threads when a configuration
+        has been evaluated."""
+        Logger.debug(f"Finished {self.config_id_to_name[config.id]}"
+                     f" ({completed} of {total})")
+        Clock.schedule_once(
+            lambda _dt: self._progress_popup.content.increment()
+        )
 
     def run_configurations(self):
+        self._scheduler = None
+        self._cancel_requested.clear()
         self._run_thread = Thread(target=self._evaluate)
         self._run_thread.start()
         self._progress = RunProgressPopupContent()
         self._progress.max = len(self.selected_configurations)
-        self._progress.text = f"Running simulation 1 out of {self._progress.max}"
+        self._progress.text = f"Completed 0 of {self._progress.max} simulations."
         self._progress.ids.dismissBtn.bind(on_press=self._cancel_run)
         self._progress_popup = Popup(title="simulation running...",
                                      content=self._progress)
@@ -3263,7 +3280,9 @@ class RunSimulationScreen(SSimBaseScreen):
 
     def _cancel_run(self, _dt):
         Logger.debug("Canceling simulation run.")
-        self._canceled = True
+        self._cancel_requested.set()
+        if self._scheduler is not None:
+            self._scheduler.cancel()
         self._progress.cancel()
 
     def open_visualize_results(self):
@@ -3320,17 +3339,23 @@ class ResultsVisualizeScreen(SSimBaseScreen):
         for result in self.project_results.results():
             config_dir = os.path.basename(os.path.normpath(result.config_dir))
 
-            # obtain accumulated metric values and times-series 
-            # data in a pandas dataframe for metrics
-            _, accumulated_metric, data_metrics = result.metrics_log()
             config_key = self.config_id_to_name[config_dir]
 
-            # obtain voltages
-            _, all_bus_voltages = result.bus_voltages()
-
             # columns to plot
             columns_to_plot = self.selected_metric_items[config_key]
 
+            # obtain accumulated metric values and times-series 
+            # data in a pandas dataframe for metrics, loading only the
+            # columns that are plotted
+            _, accumulated_metric, data_metrics = result.metrics_log(
+                ["time"] + columns_to_plot
+            )
+
+            # obtain voltages
+            _, all_bus_voltages = result.bus_voltages(
+                ["time"] + columns_to_plot
+            )
+
             # select the susbset of data based on 'columns_to_plot'
             selected_data = data_metrics[columns_to_plot]
             x_data = data_metrics.loc[:, 'time']